@@ -1,38 +1,286 @@
 import os
 import sys
-import subprocess
+import time
+
+# Reference time of the --profile-startup report
+STARTUP_TIME = time.perf_counter()
+
+# Headless mode: run scripts without a window, before tkinter is even imported (see launcher_headless.py)
+if __name__ == "__main__" and '--headless' in sys.argv[1:]:
+    from launcher_headless import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != '--headless']))
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
+import tkinter.font as tkfont
+from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
 from pathlib import Path
 import threading
-import json
 import string
-import shutil
+import re
+import bisect
+import queue
+from array import array
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+
+from launcher_core import (
+    ScriptLauncher, ScriptRun, OutputLog, first_error_line, format_bytes, directory_cache, ScriptIndex,
+    RunHistory, FolderWatcher, python_files_signature, check_script_syntax, signal_process_tree,
+    process_tree_alive, stop_process_trees, HISTORY_QUERY_LIMIT, OUTPUT_LOG_MAX_BYTES_PER_TICK,
+    RESOURCE_LIMIT_KEYS, PROFILE_MODES, utf8_size, split_utf8, load_profile_summary, format_profile_value,
+)
+
+
+# Console output pump settings (overridable in the configuration file)
+OUTPUT_PUMP_INTERVAL_MS = 40          # Delay between two console refreshes
+OUTPUT_MAX_BYTES_PER_TICK = 64 * 1024  # Max output applied to the console per refresh
+
+# Tasks posted to the Tk main loop by worker threads
+UI_CALLS_INTERVAL_MS = 20   # Delay between two runs of the queued tasks
+UI_CALLS_BUDGET = 0.02      # Max time spent running queued tasks per run (seconds)
+
+# Background folder tree loading
+TREE_SCAN_WORKERS = 4
+TREE_INSERT_CHUNK = 500     # Folders inserted into the tree per batch
+TREE_INSERT_INTERVAL_MS = 1 # Delay between two batches (the interface handles its events in between)
+TYPEAHEAD_RESET_S = 1.0     # Typed letters are forgotten after this pause (folder tree typeahead)
+
+# Delay after the window is first mapped before filling it (lets it paint first)
+STARTUP_DEFER_MS = 50
+# --profile-startup reports the steps reached so far if some never end (e.g. the last folder can't be shown)
+STARTUP_REPORT_TIMEOUT_MS = 30000
+
+# Profiling run modes (see launcher_core.PROFILE_BOOTSTRAP): menu labels and rows of the hot spots table
+PROFILE_MODE_LABELS = {'cpu': "CPU Profile", 'memory': "Memory Profile", 'sampling': "Sampling Profile"}
+PROFILE_TABLE_SIZES = (20, 50, 100, 500)
+PROFILE_TABLE_ROWS = 50
+
+# Live CPU/memory sampling of running scripts (Linux /proc only)
+RESOURCE_SAMPLE_INTERVAL_MS = 1000
+
+# Console search (see ConsoleSearch)
+SEARCH_DELAY_MS = 150                          # Pause in typing before the search runs
+SEARCH_SCAN_BYTES_PER_TICK = 2 * 1024 * 1024   # File-backed output searched per console refresh
+SEARCH_REFINE_MAX_LINES = 10000                # Above, a narrower query searches again instead
+
+
+class ConsoleSearch:
+    """Lines of a run's output matching a plain text or regex query, found as the output arrives"""
+    
+    def __init__(self, query, regex=False, match_case=False):
+        self.query = query
+        self.regex = regex
+        self.match_case = match_case
+        flags = re.MULTILINE | (0 if match_case else re.IGNORECASE)
+        self.pattern = re.compile(query if regex else re.escape(query), flags)  # Raises re.error
+        self.matches = array('q')  # Numbers of the matching lines, ascending
+        self.line = 0  # Number of the next line to scan
+        self.offset = 0  # Bytes of a file-backed output scanned so far
+        self.partial = ''  # Incomplete last line, scanned once complete
+    
+    def scan(self, text):
+        """Find the matching lines among the complete lines of new output"""
+        text = self.partial + text
+        end = text.rfind('\n') + 1
+        self.partial = text[end:]
+        
+        # One regex pass over the whole text, counting the lines between matches
+        line = self.line
+        position = 0  # Start of the line after the last match
+        for match in self.pattern.finditer(text, 0, end):
+            start = match.start()
+            if start < position:
+                continue  # Another match on the same line
+            if start >= end:
+                break
+            line += text.count('\n', position, start)
+            self.matches.append(line)
+            position = text.index('\n', start) + 1
+            line += 1
+        self.line += text.count('\n', 0, end)
+    
+    def is_refined_by(self, other):
+        """True if other only matches lines this search matches (typing more of a plain query)"""
+        if self.regex or other.regex or self.match_case != other.match_case:
+            return False
+        if len(self.matches) > SEARCH_REFINE_MAX_LINES:
+            return False  # Cheaper to search the output again
+        if self.match_case:
+            return self.query in other.query
+        return self.query.lower() in other.query.lower()
+    
+    def refine(self, previous, get_line):
+        """Take over a previous, broader search, only checking the lines it matched"""
+        self.line = previous.line
+        self.offset = previous.offset
+        self.partial = previous.partial
+        for line in previous.matches:
+            text = get_line(line)
+            if text is not None and self.pattern.search(text):
+                self.matches.append(line)
+
+
+class StartupProfile:
+    """Time taken by each startup step, printed with --profile-startup"""
+    
+    # Steps the report waits for
+    STEPS = ('first paint', 'folder tree', 'last folder', 'script index')
+    
+    def __init__(self, enabled=False, start=STARTUP_TIME):
+        self.enabled = enabled
+        self.start = start
+        self.marks = []  # [(step, time)]
+        self.reported = False
+    
+    def mark(self, step):
+        """Record the end of a step (only its first occurrence), report once all are done"""
+        if not self.enabled or self.reported or any(name == step for name, _ in self.marks):
+            return
+        self.marks.append((step, time.perf_counter()))
+        if all(any(name == expected for name, _ in self.marks) for expected in self.STEPS):
+            self.report()
+    
+    def expire(self):
+        """Report the steps done so far if the report is still waiting for some"""
+        if self.enabled and not self.reported:
+            self.report()
+    
+    def report(self):
+        """Print the steps with their end time and duration since the previous one"""
+        self.reported = True
+        print("Startup profile (ms since launch, ms for the step):")
+        previous = self.start
+        for step, at in self.marks:
+            print(f"{(at - self.start) * 1000:9.1f} {(at - previous) * 1000:+9.1f}  {step}")
+            previous = at
+        for step in self.STEPS:
+            if not any(name == step for name, _ in self.marks):
+                print(f"{'-':>9} {'':9}  {step} (not reached)")
+
+
+class FolderScan:
+    """A pending background listing of a tree node's subdirectories"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.cancelled = threading.Event()
+        self.callbacks = []  # Called in the Tk main loop once the node is filled
+        self.items = []  # [(name, path)] of the subdirectories, once listed
+        self.inserted = 0  # Number of items already in the tree
+        self.placeholder = None  # "Loading…" tree item
+
+
+class ScriptExit:
+    """End of a script, passed from the I/O engine to the Tk main loop through the output queue"""
+    
+    def __init__(self, return_code, usage, end_time):
+        self.return_code = return_code  # None if the script could not be started
+        self.usage = usage  # See reap_process
+        self.end_time = end_time
 
 
-class PythonScriptRunner:
-    def __init__(self, root):
+class ScriptBatch:
+    """Several scripts launched together (in parallel through the run queue, or one after the other)"""
+    
+    def __init__(self, script_paths, sequential=False, fail_fast=False):
+        self.script_paths = list(script_paths)
+        self.sequential = sequential
+        self.fail_fast = fail_fast
+        self.runs = {}  # Dictionary: {script_path: ScriptRun} once launched
+        self.skipped = {}  # Dictionary: {script_path: reason} for scripts never launched
+        self.next_index = 0  # Next script to launch
+        self.start_time = time.monotonic()
+        self.end_time = None
+        self.window = None
+        self.summary_tree = None
+        self.summary_label = None
+    
+    def pending_paths(self):
+        """Scripts not launched yet"""
+        return self.script_paths[self.next_index:]
+    
+    def is_done(self):
+        return (self.next_index >= len(self.script_paths)
+                and all(run.status == 'finished' for run in self.runs.values()))
+
+
+class PythonScriptRunner(ScriptLauncher):
+    def __init__(self, root, startup=None):
         self.root = root
+        self.startup = startup or StartupProfile()
         self.root.title("Easy Python Launcher")
         self.root.geometry("1000x600")
         self.root.resizable(0, 0)
         
-        # Configuration file
-        # Get the directory where the executable/script is located
-        if getattr(sys, 'frozen', False):
-            # Running as compiled executable
-            app_dir = os.path.dirname(sys.executable)
-        else:
-            # Running as script
-            app_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        self.config_file = os.path.join(app_dir, 'EasyPythonLauncher.config.json')
+        # Configuration, interpreters, run history and I/O engine (stored next to the executable/script)
+        super().__init__()
+        self.script_index = ScriptIndex(os.path.join(self.app_dir, 'EasyPythonLauncher.index.json'))
+        self.history_window = None
+        self.startup.mark("configuration")
         
         # Variables
         self.selected_file = None
-        self.running_processes = {}  # Dictionary: {script_path: process_object}
+        self.selected_files = []  # All the scripts selected in the list (multi-selection)
+        self.running_processes = {}  # Dictionary: {script_path: ScriptRun}
         self.dark_mode = self.load_theme_preference()
         
+        # Output pipeline: reader threads push (run, text) chunks into
+        # the queue, the Tk main loop drains it periodically (see _pump_output).
+        # A ScriptExit instead of a text means the script has finished.
+        self.output_queue = queue.SimpleQueue()  # Unbounded, with cheap puts/gets for many small chunks
+        self._output_backlog = deque()  # Chunks left over when a tick's budget is exhausted
+        self.load_output_settings()
+        
+        # Runs waiting for a free slot (at most max_concurrent_runs scripts run at once),
+        # by decreasing priority then launch order
+        self.run_queue = []
+        self.queue_window = None
+        self._interpreter_lookup = False  # Looking for an interpreter in the background, runs wait meanwhile
+        
+        # Tasks queued by worker threads for the Tk main loop (see call_in_ui)
+        self.ui_calls = queue.Queue()
+        
+        # Folder tree loading: {tree item: FolderScan} for nodes being filled in the background
+        self.tree_executor = ThreadPoolExecutor(max_workers=TREE_SCAN_WORKERS)
+        self._tree_scans = {}
+        
+        # Folder tree index, so that a path is found without walking the tree:
+        # {normalized path: tree item}, {tree item: path} and {tree item: [child items]}
+        self._tree_nodes = {}
+        self._tree_paths = {}
+        self._tree_children = {}
+        # Nodes whose subdirectories are in the tree (the others only hold an expansion placeholder)
+        self._tree_loaded = set()
+        
+        # Script list: folder whose scripts are being listed in the background (None once shown),
+        # and the tasks waiting for them
+        self._files_pending = None
+        self._files_listed_callbacks = []
+        
+        # Folder tree typeahead: letters typed so far, time of the last one, node whose
+        # children are still being inserted and may hold the match
+        self._typeahead = ''
+        self._typeahead_time = 0
+        self._typeahead_pending = None
+        
+        # Expanded folders and the selected one are watched, their changes applied to the tree and
+        # the script list
+        self.folder_watcher = FolderWatcher(lambda folders: self.call_in_ui(self._on_folders_changed, folders))
+        self._watch_update_scheduled = False
+        
+        # Watch and rerun: {script path: signature of its file (or folder) at the last start},
+        # scripts stopped to be restarted
+        self.watched_scripts = {}
+        self._pending_reruns = set()
+        self.rerun_watcher = FolderWatcher(lambda folders: self.call_in_ui(self._on_watched_scripts_changed, folders),
+                                           contents=True)
+        
+        # Console tabs: one per script (last run), plus the launcher's own messages (key None)
+        self.console_tabs = {}  # Dictionary: {script_path: ScriptRun}
+        self._console_tab_keys = {}  # Dictionary: {tab widget name: script_path}
+        self.active_console = None
+        
         # Menu bar
         menubar = tk.Menu(root)
         root.config(menu=menubar)
@@ -43,11 +291,60 @@ class PythonScriptRunner:
         self.theme_var = tk.BooleanVar(value=self.dark_mode)
         view_menu.add_checkbutton(label="Dark Mode", variable=self.theme_var, 
                                    command=self.toggle_theme)
+        view_menu.add_command(label="Close Finished Console Tabs", command=self.close_finished_tabs)
+        view_menu.add_command(label="Run Queue...", command=self.show_run_queue)
+        view_menu.add_command(label="Run History...", command=self.show_run_history)
+        view_menu.add_command(label="Go to Console Line...", command=self.go_to_console_line)
+        view_menu.add_command(label="Reveal Selected Script in Folder Tree",
+                              command=lambda: self.selected_file and self.reveal_path(self.selected_file))
+        
+        # Run Menu
+        run_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Run", menu=run_menu)
+        run_menu.add_command(label="Run Selected Scripts", command=lambda: self.run_batch(self.selected_files))
+        run_menu.add_command(label="Run All Scripts in Folder", command=self.run_folder)
+        run_menu.add_command(label="Stop All Scripts", command=self.stop_all_scripts)
+        run_menu.add_separator()
+        self._add_profile_commands(run_menu)
+        run_menu.add_separator()
+        self.batch_sequential_var = tk.BooleanVar(value=self.config.get('batch_sequential', False))
+        run_menu.add_checkbutton(label="Batch: One After the Other (Listed Order)", variable=self.batch_sequential_var,
+                                 command=lambda: self.config.set('batch_sequential', self.batch_sequential_var.get()))
+        self.batch_fail_fast_var = tk.BooleanVar(value=self.config.get('batch_fail_fast', False))
+        run_menu.add_checkbutton(label="Batch: Stop at First Failure", variable=self.batch_fail_fast_var,
+                                 command=lambda: self.config.set('batch_fail_fast', self.batch_fail_fast_var.get()))
+        run_menu.add_separator()
+        self.watch_var = tk.BooleanVar(value=False)
+        run_menu.add_checkbutton(label="Watch and Rerun Selected Script", variable=self.watch_var,
+                                 command=self.toggle_watch_script)
+        self.watch_folder_var = tk.BooleanVar(value=self.config.get('watch_folder', False))
+        run_menu.add_checkbutton(label="Watch: Rerun When Any Script of the Folder Changes",
+                                 variable=self.watch_folder_var,
+                                 command=lambda: self.config.set('watch_folder', self.watch_folder_var.get()))
+        self.watch_check_syntax_var = tk.BooleanVar(value=self.config.get('watch_check_syntax', True))
+        run_menu.add_checkbutton(label="Watch: Check Syntax Before Restarting", variable=self.watch_check_syntax_var,
+                                 command=lambda: self.config.set('watch_check_syntax',
+                                                                 self.watch_check_syntax_var.get()))
         
         # Settings Menu
         settings_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Settings", menu=settings_menu)
         settings_menu.add_command(label="Select Python Interpreter...", command=self.select_python_interpreter)
+        settings_menu.add_command(label="Max Concurrent Scripts...", command=self.edit_max_concurrent_runs)
+        settings_menu.add_command(label="Run Options for Selected Script...", command=self.edit_script_settings)
+        settings_menu.add_command(label="Default Resource Limits...", command=self.edit_default_limits)
+        settings_menu.add_command(label="Add Folder to Script Index...", command=self.add_index_root)
+        settings_menu.add_command(label="Clear Script Index Folders", command=self.clear_index_roots)
+        self.unbuffered_var = tk.BooleanVar(value=self.unbuffered_output)
+        settings_menu.add_checkbutton(label="Unbuffered Script Output", variable=self.unbuffered_var,
+                                      command=self.toggle_unbuffered_output)
+        self.warm_pool_var = tk.BooleanVar(value=self.warm_pool_enabled)
+        settings_menu.add_checkbutton(label="Pre-start Interpreters (Warm Pool)", variable=self.warm_pool_var,
+                                      command=self.toggle_warm_pool)
+        settings_menu.add_command(label="Warm Pool Preload Modules...", command=self.edit_warm_pool_preload)
+        self.console_file_mode_var = tk.BooleanVar(value=self.console_file_mode)
+        settings_menu.add_checkbutton(label="Large Output Mode (File-backed Console)",
+                                      variable=self.console_file_mode_var, command=self.toggle_console_file_mode)
         
         # Main display grid configuration
         self.root.grid_rowconfigure(0, weight=1)
@@ -80,6 +377,9 @@ class PythonScriptRunner:
         tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
         
         self.tree_folders.bind('<<TreeviewSelect>>', self.on_folder_select)
+        self.tree_folders.bind('<<TreeviewOpen>>', self.on_folder_open)
+        self.tree_folders.bind('<<TreeviewClose>>', self.on_folder_close)
+        self.tree_folders.bind('<KeyPress>', self.on_tree_typeahead)
         
         # Right Frame - List of .py files and console
         right_frame = ttk.Frame(paned, padding="5")
@@ -91,13 +391,25 @@ class PythonScriptRunner:
         
         ttk.Label(files_frame, text="Python Script Files (.py):", font=('Arial', 10, 'bold')).pack(anchor=tk.W)
         
+        # Search box over the script index
+        search_frame = ttk.Frame(files_frame)
+        search_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(search_frame, text="Search:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.on_search_changed())
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.index_label = ttk.Label(search_frame, text="", foreground='gray', font=('Arial', 9))
+        self.index_label.pack(side=tk.RIGHT)
+        self.search_results = []
+        
         # Listbox for .py files
         list_frame = ttk.Frame(files_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
         
         list_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
         self.files_listbox = tk.Listbox(list_frame, yscrollcommand=list_scroll.set, 
-                                        font=('Courier', 10), selectmode=tk.SINGLE)
+                                        font=('Courier', 10), selectmode=tk.EXTENDED)
         list_scroll.config(command=self.files_listbox.yview)
         
         self.files_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -120,6 +432,13 @@ class PythonScriptRunner:
                                      state=tk.DISABLED, width=12)
         self.run_button.pack(side=tk.RIGHT, padx=5)
         
+        # Profiling run modes, next to Run
+        self.profile_button = ttk.Menubutton(control_frame, text="⏱ Profile", state=tk.DISABLED, width=10)
+        profile_menu = tk.Menu(self.profile_button, tearoff=0)
+        self._add_profile_commands(profile_menu)
+        self.profile_button.config(menu=profile_menu)
+        self.profile_button.pack(side=tk.RIGHT, padx=5)
+        
         # Button Stop
         self.stop_button = ttk.Button(control_frame, text="⬛ Stop", command=self.stop_script, 
                                       state=tk.DISABLED, width=12)
@@ -129,93 +448,147 @@ class PythonScriptRunner:
         console_frame = ttk.LabelFrame(right_frame, text="Console", padding="5")
         console_frame.pack(fill=tk.BOTH, expand=False, pady=(10, 0))
         
+        # Tab strip to switch between the output of each script
+        self.console_notebook = ttk.Notebook(console_frame)
+        self.console_notebook.pack(fill=tk.X)
+        self.console_notebook.bind('<<NotebookTabChanged>>', self.on_console_tab_changed)
+        
+        # Search bar: highlight or filter the lines of the shown output matching a query
+        search_bar = ttk.Frame(console_frame)
+        search_bar.pack(fill=tk.X, pady=(3, 3))
+        ttk.Label(search_bar, text="Find:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.console_search_var = tk.StringVar()
+        self.console_search_var.trace_add('write', lambda *args: self.on_console_search_changed())
+        console_search_entry = ttk.Entry(search_bar, textvariable=self.console_search_var)
+        console_search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        console_search_entry.bind('<Return>', lambda e: self.find_console_match(1))
+        console_search_entry.bind('<Shift-Return>', lambda e: self.find_console_match(-1))
+        self.console_regex_var = tk.BooleanVar(value=False)
+        self.console_case_var = tk.BooleanVar(value=False)
+        self.console_filter_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_bar, text="Regex", variable=self.console_regex_var,
+                        command=self.on_console_search_changed).pack(side=tk.LEFT)
+        ttk.Checkbutton(search_bar, text="Match Case", variable=self.console_case_var,
+                        command=self.on_console_search_changed).pack(side=tk.LEFT)
+        ttk.Checkbutton(search_bar, text="Only Matching Lines", variable=self.console_filter_var,
+                        command=self._redraw_console_search).pack(side=tk.LEFT)
+        ttk.Button(search_bar, text="▲", width=3, command=lambda: self.find_console_match(-1)).pack(side=tk.LEFT)
+        ttk.Button(search_bar, text="▼", width=3, command=lambda: self.find_console_match(1)).pack(side=tk.LEFT)
+        self.console_search_label = ttk.Label(search_bar, text="", foreground='gray', font=('Arial', 9), width=18)
+        self.console_search_label.pack(side=tk.LEFT, padx=5)
+        self._console_search_job = None
+        self._search_position = None  # Index of the match last jumped to
+        self._search_shown = 0  # Matches already highlighted (or listed when filtering)
+        self._filtered_lines = None  # Line numbers listed by a filtered console, None when not filtering
+        
         self.console = scrolledtext.ScrolledText(console_frame, height=5, 
                                                  font=('Courier', 9), wrap=tk.WORD)
         self.console.pack(fill=tk.BOTH, expand=False)
+        self.console.tag_configure('search_match', background='#ffd54f', foreground='#000000')
+        self.console.tag_configure('search_current', background='#ff9800', foreground='#000000')
+        self._add_console_tab(None, "Launcher")
+        
+        # File-backed consoles only draw the lines in view: first line shown (None to follow
+        # the end) and the log size when last drawn
+        self._view_first_line = None
+        self._view_drawn = None
+        self._console_linespace = None
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>', '<Prior>', '<Next>',
+                         '<Control-Home>', '<Control-End>'):
+            self.console.bind(sequence, self._on_log_view_event)
         
         # Apply initial theme
         self.apply_theme()
+        self.startup.mark("widgets and theme")
+        
+        # The folder tree, interpreters and script index are loaded once the window is shown
+        self.root.bind('<Map>', self._on_first_map)
+        
+        # Start the console output pump and the worker threads' task queue
+        self.root.after(self.output_pump_interval, self._pump_output)
+        self.root.after(UI_CALLS_INTERVAL_MS, self._pump_ui_calls)
+        if os.path.exists('/proc/self/stat'):
+            self.root.after(RESOURCE_SAMPLE_INTERVAL_MS, self._sample_resources)
+    
+    def _on_first_map(self, event):
+        """Schedule the rest of the startup once the window is on screen"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Map>')
+        self.startup.mark("window mapped")
+        if self.startup.enabled:
+            self.root.after(STARTUP_REPORT_TIMEOUT_MS, self.startup.expire)
+        self.root.after(STARTUP_DEFER_MS, self._deferred_startup)
+    
+    def _deferred_startup(self):
+        """Fill the window in once it has been painted"""
+        self.root.update_idletasks()
+        self.startup.mark("first paint")
         
         # Initialize folder tree and drives
         self.populate_tree()
-    
-    def get_python_executable(self):
-        """Get the correct Python executable path, even when frozen with PyInstaller"""
-        # First, check if we have a saved Python path in config
-        saved_python = self.load_python_path()
-        if saved_python and os.path.exists(saved_python):
-            return saved_python
         
-        # Check if running as a PyInstaller bundle
+        # Start the warm interpreters (if enabled)
+        self.refill_warm_pool()
+        
+        # Revalidate (or discover) the Python interpreters in the background
         if getattr(sys, 'frozen', False):
-            # Running as compiled executable - find Python in PATH
-            # Try pythonw first (no console window), fallback to python
-            python_exec = shutil.which('pythonw')
-            if not python_exec:
-                python_exec = shutil.which('python')
-            if not python_exec:
-                # Try python3 on Linux/Mac
-                python_exec = shutil.which('python3')
-            if not python_exec:
-                # Try common Windows locations (pythonw.exe preferred)
-                common_paths = [
-                    r'C:\Python313\pythonw.exe',
-                    r'C:\Python312\pythonw.exe',
-                    r'C:\Python311\pythonw.exe',
-                    r'C:\Python310\pythonw.exe',
-                    r'C:\Python39\pythonw.exe',
-                    r'C:\Program Files\Python313\pythonw.exe',
-                    r'C:\Program Files\Python312\pythonw.exe',
-                    r'C:\Program Files\Python311\pythonw.exe',
-                    r'C:\Program Files\Python310\pythonw.exe',
-                    r'C:\Program Files\Python39\pythonw.exe',
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python313\pythonw.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python312\pythonw.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python311\pythonw.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python310\pythonw.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python39\pythonw.exe'),
-                    # Fallback to python.exe if pythonw.exe not found
-                    r'C:\Python313\python.exe',
-                    r'C:\Python312\python.exe',
-                    r'C:\Python311\python.exe',
-                    r'C:\Python310\python.exe',
-                    r'C:\Python39\python.exe',
-                    r'C:\Program Files\Python313\python.exe',
-                    r'C:\Program Files\Python312\python.exe',
-                    r'C:\Program Files\Python311\python.exe',
-                    r'C:\Program Files\Python310\python.exe',
-                    r'C:\Program Files\Python39\python.exe',
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python313\python.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python312\python.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python311\python.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python310\python.exe'),
-                    os.path.expandvars(r'%LOCALAPPDATA%\Programs\Python\Python39\python.exe'),
-                ]
-                for path in common_paths:
-                    if os.path.exists(path):
-                        python_exec = path
-                        break
-            
-            if not python_exec:
-                # Python not found - ask user to select it
-                python_exec = self.ask_for_python_path()
-                if not python_exec:
-                    raise FileNotFoundError(
-                        "Python interpreter not found!\n\n"
-                        "Please install Python or select its location via Settings > Select Python Interpreter."
-                    )
-            
-            # Save the found Python path for future use
-            self.save_python_path(python_exec)
+            threading.Thread(target=self.interpreters.refresh, daemon=True).start()
+        
+        # Load and refresh the script index in the background
+        threading.Thread(target=self._update_script_index, args=(True,), daemon=True).start()
+    
+    def close(self):
+        """Stop watching folders and the scripts still running (with their children), then close the
+        launcher core"""
+        self.folder_watcher.close()
+        self.rerun_watcher.close()
+        stop_process_trees([run.process for run in self.running_processes.values()
+                            if run.status == 'running' and run.process is not None], self.stop_grace_period)
+        super().close()
+    
+    def _resolve_python_executable(self):
+        """Return the interpreter to run scripts with, or None while one is looked for in the background
+        (the queued runs start once it is found)"""
+        python_exec = self.find_python_executable(discover=False)
+        if python_exec or self._interpreter_lookup:
             return python_exec
+        
+        # Nothing known yet (first run of the frozen launcher): probe the candidate locations
+        self._interpreter_lookup = True
+        self._write_console("Looking for a Python interpreter...\n")
+        
+        def discover():
+            self.interpreters.discover()
+            self.call_in_ui(self._on_interpreter_lookup_done)
+        threading.Thread(target=discover, daemon=True).start()
+        return None
+    
+    def _on_interpreter_lookup_done(self):
+        """Start the queued runs with the interpreter found, or ask the user for one"""
+        if self.find_python_executable(discover=False):
+            self._interpreter_lookup = False
+            self._dispatch_runs()
         else:
-            # Running as a normal Python script
-            python_exec = sys.executable
-            self.save_python_path(python_exec)
-            return python_exec
+            self.ask_for_python_path()
+    
+    def _fail_queued_runs(self, message):
+        """End the queued runs with an error (no interpreter to run them)"""
+        self._interpreter_lookup = False
+        for run in list(self.run_queue):
+            self.run_queue.remove(run)
+            self._write_console(f"\n❌ Error: {message}\n", run)
+            self._on_process_exit(run, None)
+        self._refresh_run_queue()
+    
+    def _probe_interpreter(self, filename, callback):
+        """Check an executable in the background, then call callback with its InterpreterInfo (None if it
+        isn't a Python interpreter) in the Tk main loop"""
+        future = self.interpreters.get_async(filename)
+        future.add_done_callback(lambda f: self.call_in_ui(callback, f.result()))
     
     def ask_for_python_path(self):
-        """Ask user to manually select the Python executable"""
+        """Ask user to manually select the Python executable, then start the queued runs with it"""
         result = messagebox.askyesno(
             "Python Not Found",
             "Python interpreter was not found automatically.\n\n"
@@ -223,6 +596,7 @@ class PythonScriptRunner:
             "Note: pythonw.exe is recommended (no console window)."
         )
         
+        filename = None
         if result:
             if sys.platform == 'win32':
                 filetypes = [("Python Executable", "python*.exe"), 
@@ -236,24 +610,28 @@ class PythonScriptRunner:
                 title="Select Python Interpreter",
                 filetypes=filetypes
             )
-            
-            if filename and os.path.exists(filename):
-                # Verify it's actually a Python executable
-                try:
-                    result = subprocess.run([filename, "--version"], 
-                                          capture_output=True, 
-                                          text=True, 
-                                          timeout=5)
-                    if "Python" in result.stdout or "Python" in result.stderr:
-                        return filename
-                    else:
-                        messagebox.showerror("Invalid File", 
-                                           "The selected file doesn't appear to be a valid Python interpreter.")
-                except Exception:
-                    messagebox.showerror("Invalid File", 
-                                       "The selected file doesn't appear to be a valid Python interpreter.")
         
-        return None
+        if not filename or not os.path.exists(filename):
+            self._fail_queued_runs("Python interpreter not found!\n\n"
+                                   "Please install Python or select its location via Settings > Select Python Interpreter.")
+            return
+        
+        # Verify it's actually a Python executable
+        self._probe_interpreter(filename, lambda info: self._on_python_path_checked(filename, info))
+    
+    def _on_python_path_checked(self, filename, info):
+        """Start the queued runs with the interpreter selected by the user, if it is one"""
+        if not info:
+            messagebox.showerror("Invalid File", 
+                               "The selected file doesn't appear to be a valid Python interpreter.")
+            self._fail_queued_runs("Python interpreter not found!\n\n"
+                                   "Please install Python or select its location via Settings > Select Python Interpreter.")
+            return
+        
+        # Save the found Python path for future use
+        self._interpreter_lookup = False
+        self.save_python_path(filename)
+        self._dispatch_runs()
     
     def select_python_interpreter(self):
         """Menu option to manually select Python interpreter"""
@@ -271,160 +649,453 @@ class PythonScriptRunner:
         )
         
         if filename and os.path.exists(filename):
-            # Verify it's actually a Python executable
-            try:
-                result = subprocess.run([filename, "--version"], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=5)
-                if "Python" in result.stdout or "Python" in result.stderr:
-                    self.save_python_path(filename)
-                    version_info = result.stdout.strip() or result.stderr.strip()
-                    exe_type = "pythonw.exe (no console)" if "pythonw" in filename.lower() else "python.exe (with console)"
-                    messagebox.showinfo("Success", 
-                                      f"Python interpreter set successfully!\n\n{version_info}\nType: {exe_type}\n\nLocation: {filename}")
-                else:
-                    messagebox.showerror("Invalid File", 
-                                       "The selected file doesn't appear to be a valid Python interpreter.")
-            except Exception as e:
-                messagebox.showerror("Error", 
-                                   f"Could not verify Python executable:\n{str(e)}")
-    
-    def save_python_path(self, python_path):
-        """Save the Python executable path to config"""
-        try:
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            
-            config['python_path'] = python_path
-            
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error while saving Python path: {e}")
+            # Verify it's actually a Python executable (in the background)
+            self._probe_interpreter(filename, lambda info: self._on_interpreter_selected(filename, info))
+    
+    def _on_interpreter_selected(self, filename, info):
+        """Save the interpreter selected in the settings once it is checked"""
+        if info:
+            self.save_python_path(filename)
+            exe_type = "pythonw.exe (no console)" if "pythonw" in filename.lower() else "python.exe (with console)"
+            messagebox.showinfo("Success", 
+                              f"Python interpreter set successfully!\n\n{info.description}\nType: {exe_type}\n\nLocation: {filename}")
+        else:
+            messagebox.showerror("Invalid File", 
+                               "The selected file doesn't appear to be a valid Python interpreter.")
     
-    def load_python_path(self):
-        """Load the saved Python executable path from config"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config.get('python_path', None)
-        except Exception:
-            pass
-        return None
-        
     def populate_tree(self):
-        """Generate tree content with folders and all drives"""
+        """Generate tree content with folders and all drives, then restore the last opened folder"""
+        last_folder = self.load_last_folder()
         if sys.platform == 'win32':
-            # Windows : show all drives (C:, D:, etc.)
-            drives = self.get_available_drives()
-            for drive in drives:
-                root_node = self.tree_folders.insert('', 'end', text=drive, 
-                                                    values=[drive], open=False)
-                # Add dummy for expansion
-                self.tree_folders.insert(root_node, 'end')
+            # Windows : show all drives (C:, D:, etc.) as they are found
+            self._probe_drives(last_folder)
         else:
             # Linux/Mac : start from root
             root_path = '/'
-            root_node = self.tree_folders.insert('', 'end', text=root_path, 
-                                                values=[root_path], open=True)
+            root_node = self._insert_folder_node('', 'end', root_path, root_path, open=True)
             self.load_subdirectories(root_node, root_path)
+            self.startup.mark("folder tree")
+            self._restore_last_folder(last_folder)
+    
+    def _probe_drives(self, last_folder):
+        """Add the available Windows drives to the tree as they answer (all probed at once, as a
+        disconnected network drive can block for seconds)"""
+        letters = string.ascii_uppercase
+        self._drives_pending = len(letters)
+        executor = ThreadPoolExecutor(max_workers=len(letters))
+        for letter in letters:
+            drive = f"{letter}:\\"
+            future = executor.submit(os.path.exists, drive)
+            future.add_done_callback(
+                lambda f, drive=drive: self.call_in_ui(self._add_drive, drive, f.result(), last_folder))
+        executor.shutdown(wait=False)
+    
+    def _add_drive(self, drive, exists, last_folder):
+        """Insert a probed drive in the tree (in alphabetical order)"""
+        self._drives_pending -= 1
+        if exists:
+            index = sum(1 for item in self.tree_folders.get_children()
+                        if self.tree_folders.item(item, 'text') < drive)
+            self._insert_folder_node('', index, drive, drive)
+            if last_folder and os.path.normcase(last_folder).startswith(os.path.normcase(drive)):
+                self._restore_last_folder(last_folder)
+        if self._drives_pending == 0:
+            self.startup.mark("folder tree")
+            if not last_folder:
+                self._restore_last_folder(None)
+    
+    def _restore_last_folder(self, last_folder):
+        """Expand the tree to the last opened folder, if it still exists (checked in the background)"""
+        if not last_folder:
+            self.startup.mark("last folder")
+            return
         
-        # Restore last opened folder
-        last_folder = self.load_last_folder()
-        if last_folder and os.path.exists(last_folder):
-            self.expand_to_folder(last_folder)
+        def restore(future):
+            if future.result():
+                done = lambda: self.startup.mark("last folder")
+                self.call_in_ui(self.reveal_path, last_folder, done, done)
+            else:
+                self.call_in_ui(self.startup.mark, "last folder")
+        
+        self.tree_executor.submit(os.path.exists, last_folder).add_done_callback(restore)
     
-    def get_available_drives(self):
-        """Returns the list of all available drives for Windows"""
-        if sys.platform != 'win32':
-            return ['/']
+    def reveal_path(self, path, on_shown=None, on_failed=None):
+        """Expand the tree down to a folder and select it, or to a script's folder and select the script
+        (levels are loaded in the background), then call on_shown, or on_failed if it isn't in the tree"""
+        script_name = None
+        if os.path.isfile(path):
+            path, script_name = os.path.split(path)
         
-        drives = []
-        for letter in string.ascii_uppercase:
-            drive = f"{letter}:\\"
-            if os.path.exists(drive):
-                drives.append(drive)
-        return drives
-    
-    def expand_to_folder(self, folder_path):
-        """Expand the tree and select a specific folder"""
-        # Normalize path
-        folder_path = os.path.normpath(folder_path)
-        
-        # Find the root node that contains this path
-        for root_item in self.tree_folders.get_children():
-            root_path = self.tree_folders.item(root_item)['values'][0]
-            root_path = os.path.normpath(root_path)
-            
-            # Check if folder_path is under this root
-            if folder_path.startswith(root_path):
-                # Expand this root
-                self._expand_node(root_item, root_path)
-                
-                # Build the path segments
-                relative_path = folder_path[len(root_path):].strip(os.sep)
-                if relative_path:
-                    path_parts = relative_path.split(os.sep)
-                    current_item = root_item
-                    current_path = root_path
-                    
-                    # Navigate through each part of the path
-                    for part in path_parts:
-                        current_path = os.path.join(current_path, part)
-                        found = False
-                        
-                        # Search for this part in the children
-                        for child in self.tree_folders.get_children(current_item):
-                            child_path = self.tree_folders.item(child)['values'][0]
-                            if os.path.normpath(child_path) == os.path.normpath(current_path):
-                                self._expand_node(child, child_path)
-                                current_item = child
-                                found = True
-                                break
-                        
-                        if not found:
-                            break
-                    
-                    # Select and show the final folder
-                    if os.path.normpath(self.tree_folders.item(current_item)['values'][0]) == folder_path:
-                        self.tree_folders.selection_set(current_item)
-                        self.tree_folders.see(current_item)
-                        self.display_python_files(folder_path)
-                break
+        # Walk up to the deepest folder already in the tree
+        key = self._tree_key(path)
+        path_parts = []
+        while key not in self._tree_nodes:
+            parent_key = os.path.dirname(key)
+            if parent_key == key:
+                # Not under any root of the tree (e.g. drive not listed yet)
+                if on_failed:
+                    on_failed()
+                return
+            path_parts.append(os.path.basename(key))
+            key = parent_key
+        path_parts.reverse()
+        
+        self._reveal_parts(self._tree_nodes[key], key, path_parts, script_name, on_shown, on_failed)
+    
+    def _reveal_parts(self, item, key, path_parts, script_name, on_shown, on_failed):
+        """Continue reveal_path from a node: expand it and go down one level once it is loaded"""
+        if not path_parts:
+            # Select and show the final folder
+            if self.search_var.get():
+                self.search_var.set('')  # Leave search mode to list the folder's scripts
+            self.tree_folders.selection_set(item)
+            self.tree_folders.see(item)
+            self.display_python_files(self._tree_paths[item])
+            if script_name:
+                # After the folder selection event, which lists the folder again, and once it is listed
+                self.root.after_idle(self._when_files_listed, lambda: self._select_script(script_name))
+            if on_shown:
+                on_shown()
+            return
+        
+        def next_level():
+            child_key = os.path.join(key, path_parts[0])
+            child = self._tree_nodes.get(child_key)
+            if child is not None:
+                self._reveal_parts(child, child_key, path_parts[1:], script_name, on_shown, on_failed)
+            elif on_failed:
+                on_failed()  # Removed, or hidden from the tree
+        
+        self._expand_node(item, self._tree_paths[item], next_level)
     
-    def _expand_node(self, item, path):
-        """Expand a tree node and load its subdirectories"""
-        children = self.tree_folders.get_children(item)
-        # Check if node has a dummy child (not yet expanded)
-        if len(children) == 1 and not self.tree_folders.item(children[0])['values']:
-            self.tree_folders.delete(children[0])
-            self.load_subdirectories(item, path)
+    def _select_script(self, script_name):
+        """Select a script in the listed folder"""
+        names = self.files_listbox.get(0, tk.END)
+        if script_name not in names:
+            return
+        index = names.index(script_name)
+        self.files_listbox.selection_clear(0, tk.END)
+        self.files_listbox.selection_set(index)
+        self.files_listbox.see(index)
+        self.on_file_select(None)
+    
+    def selected_folder(self):
+        """Path of the folder selected in the tree, or None"""
+        selection = self.tree_folders.selection()
+        return self._tree_paths.get(selection[0]) if selection else None
+    
+    @staticmethod
+    def _tree_key(path):
+        """Key of a folder in the tree index"""
+        return os.path.normcase(os.path.normpath(path))
+    
+    def _insert_folder_node(self, parent, index, text, path, open=False):
+        """Insert a folder node in the tree, with its expansion placeholder, and index it"""
+        node = self.tree_folders.insert(parent, index, text=text, values=[path], open=open)
+        # Treeview only shows the expansion arrow of nodes with children
+        self.tree_folders.insert(node, 'end')
+        self._tree_nodes[self._tree_key(path)] = node
+        self._tree_paths[node] = path
+        children = self._tree_children.setdefault(parent, [])
+        if index == 'end':
+            children.append(node)
+        else:
+            children.insert(index, node)
+        return node
+    
+    def _clear_folder_node(self, item):
+        """Delete all the children of a node, from the tree and from its index"""
+        stack = self._tree_children.pop(item, [])
+        while stack:
+            child = stack.pop()
+            path = self._tree_paths.pop(child)
+            self._tree_nodes.pop(self._tree_key(path), None)
+            self._tree_loaded.discard(child)
+            scan = self._tree_scans.pop(child, None)
+            if scan is not None:
+                scan.cancelled.set()
+            stack.extend(self._tree_children.pop(child, ()))
+        self._tree_loaded.discard(item)
+        self.tree_folders.delete(*self.tree_folders.get_children(item))
+    
+    def _remove_folder_node(self, parent, item):
+        """Delete a folder node and its children, from the tree and from its index"""
+        self._clear_folder_node(item)
+        path = self._tree_paths.pop(item)
+        self._tree_nodes.pop(self._tree_key(path), None)
+        scan = self._tree_scans.pop(item, None)
+        if scan is not None:
+            scan.cancelled.set()
+        self._tree_children[parent].remove(item)
+        self.tree_folders.delete(item)
+    
+    def _is_unloaded(self, item):
+        """Check if a node's subdirectories are neither in the tree nor being loaded"""
+        return item not in self._tree_loaded and item not in self._tree_scans
+    
+    def _expand_node(self, item, path, on_loaded=None):
+        """Expand a tree node, load its subdirectories and call on_loaded once they are in the tree"""
+        scan = self._tree_scans.get(item)
+        if scan is None and self._is_unloaded(item):
+            scan = self.load_subdirectories(item, path)
         self.tree_folders.item(item, open=True)
         
+        if on_loaded:
+            if scan:
+                scan.callbacks.append(on_loaded)
+            else:
+                on_loaded()
+        
     def load_subdirectories(self, parent, path):
-        """Load all subdirectories of a folder"""
+        """Load all subdirectories of a folder in the background, showing a placeholder meanwhile"""
+        self._clear_folder_node(parent)
+        
+        scan = FolderScan(path)
+        scan.placeholder = self.tree_folders.insert(parent, 'end', text="Loading…", tags=('loading',))
+        self._tree_scans[parent] = scan
+        self.tree_executor.submit(self._scan_folder, parent, scan)
+        return scan
+    
+    def _scan_folder(self, parent, scan):
+        """List a folder's subdirectories (called in a worker thread) and post them to the tree"""
         try:
+            listing = directory_cache.get(scan.path, scan.cancelled)
+            if listing is None:
+                return
+            items = listing.subdirs
+        except OSError as e:
+            # PermissionError, folder removed or unreachable...
+            listing = e
             items = []
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path) and not item.startswith('.'):
-                    items.append((item, item_path))
-            
-            # Sort by name
-            items.sort(key=lambda x: x[0].lower())
-            
-            for item_name, item_path in items:
-                node = self.tree_folders.insert(parent, 'end', text=item_name, 
-                                               values=[item_path])
-                # Add dummy for expansion
-                self.tree_folders.insert(node, 'end')
-                
-        except PermissionError:
-            pass
+        
+        scan.items = items
+        # The same listing fills the script list if this folder is selected
+        self.call_in_ui(self._on_python_files_listed, scan.path, listing)
+        self.call_in_ui(self._insert_subdirectories, parent, scan)
+    
+    def _insert_subdirectories(self, parent, scan):
+        """Insert the next batch of scanned subdirectories into the tree (the next ones in a later tick,
+        so that the interface stays responsive while a big folder fills in)"""
+        if self._tree_scans.get(parent) is not scan:
+            return  # Stale scan
+        
+        batch = scan.items[scan.inserted:scan.inserted + TREE_INSERT_CHUNK]
+        for item_name, item_path in batch:
+            # Before the "Loading…" placeholder
+            self._insert_folder_node(parent, scan.inserted, item_name, item_path)
+            scan.inserted += 1
+        
+        if self._typeahead_pending == parent:
+            self._select_typeahead_match(parent)
+        
+        if scan.inserted < len(scan.items):
+            self.root.after(TREE_INSERT_INTERVAL_MS, self._insert_subdirectories, parent, scan)
+        else:
+            self._finish_folder_scan(parent, scan)
+    
+    def _finish_folder_scan(self, parent, scan):
+        """Remove the placeholder of a filled node and run the pending callbacks"""
+        if self._tree_scans.get(parent) is not scan:
+            return  # Stale scan
+        del self._tree_scans[parent]
+        self._tree_loaded.add(parent)
+        self.tree_folders.delete(scan.placeholder)
+        self._schedule_watch_update()
+        if self._typeahead_pending == parent:
+            self._typeahead_pending = None
+        
+        for callback in scan.callbacks:
+            callback()
+    
+    def _cancel_folder_scan(self, item):
+        """Abandon the loading of a node, it will be scanned again on next expansion"""
+        scan = self._tree_scans.pop(item, None)
+        if scan is None:
+            return
+        scan.cancelled.set()
+        if scan.path == self._files_pending:
+            self.tree_executor.submit(self._list_python_files, scan.path)  # Still waited for by the script list
+        
+        if self.tree_folders.exists(item):
+            self._clear_folder_node(item)
+            # Expansion placeholder
+            self.tree_folders.insert(item, 'end')
+    
+    def call_in_ui(self, func, *args):
+        """Run a function in the Tk main loop (safe to call from any thread)"""
+        self.ui_calls.put((func, args))
+    
+    def _pump_ui_calls(self):
+        """Run the tasks queued by worker threads, within a time budget (runs periodically in the Tk main loop)"""
+        try:
+            deadline = time.perf_counter() + UI_CALLS_BUDGET
+            while time.perf_counter() < deadline:
+                try:
+                    func, args = self.ui_calls.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.root.after(UI_CALLS_INTERVAL_MS, self._pump_ui_calls)
+    
+    def on_folder_open(self, event):
+        """Called when a folder is expanded"""
+        item = self.tree_folders.focus()
+        if item and self._is_unloaded(item):
+            self.load_subdirectories(item, self._tree_paths[item])
+        elif item in self._tree_loaded:
+            # Not watched while collapsed
+            self._on_folders_changed([self._tree_paths[item]])
+        self._schedule_watch_update()
+    
+    def on_folder_close(self, event):
+        """Called when a folder is collapsed"""
+        item = self.tree_folders.focus()
+        if item:
+            self._cancel_folder_scan(item)
+        self._schedule_watch_update()
+    
+    def _schedule_watch_update(self):
+        """Update the watched folders once the current events are handled (the open state of a node
+        changes after its <<TreeviewOpen>> event)"""
+        if not self._watch_update_scheduled:
+            self._watch_update_scheduled = True
+            self.root.after_idle(self._update_watched_folders)
+    
+    def _update_watched_folders(self):
+        """Watch the expanded folders and the selected one"""
+        self._watch_update_scheduled = False
+        folders = {self._tree_paths[item] for item in self._tree_loaded
+                   if self.tree_folders.item(item, 'open')}
+        selected = self.selected_folder()
+        if selected:
+            folders.add(selected)
+        self.folder_watcher.watch(folders)
+    
+    def _on_folders_changed(self, folders):
+        """Relist the changed folders in the background, then apply the differences"""
+        for folder in folders:
+            self.tree_executor.submit(self._rescan_folder, folder)
+    
+    def _rescan_folder(self, folder):
+        """List a changed folder again (called in a worker thread)"""
+        # The mtime may not have changed on file systems with a coarse resolution
+        directory_cache.invalidate(folder)
+        try:
+            listing = directory_cache.get(folder)
+        except OSError:
+            return  # Removed: its parent's change removes it from the tree
+        self.call_in_ui(self._apply_folder_changes, folder, listing)
+    
+    def _apply_folder_changes(self, folder, listing):
+        """Insert and remove only the folders and scripts that changed, keeping selection and scroll position"""
+        key = self._tree_key(folder)
+        item = self._tree_nodes.get(key)
+        if item is not None and item in self._tree_loaded:
+            self._update_tree_children(item, listing.subdirs)
+        
+        selected = self.selected_folder()
+        if selected and self._tree_key(selected) == key and not self.search_var.get():
+            self._update_file_list(listing.py_files)
+    
+    def _update_tree_children(self, item, subdirs):
+        """Make a loaded node's children match a new listing of its subdirectories"""
+        paths = {path for name, path in subdirs}
+        for child in list(self._tree_children.get(item, [])):
+            if self._tree_paths[child] not in paths:
+                self._remove_folder_node(item, child)
+        
+        children = self._tree_children.get(item, [])
+        listed = {self._tree_paths[child] for child in children}
+        names = [os.path.basename(self._tree_paths[child]).lower() for child in children]
+        for name, path in subdirs:
+            if path not in listed:
+                index = bisect.bisect(names, name.lower())
+                self._insert_folder_node(item, index, name, path)
+                names.insert(index, name.lower())
+    
+    def _update_file_list(self, py_files):
+        """Make the listed scripts of the selected folder match a new listing"""
+        listed = self.files_listbox.get(0, tk.END)
+        information = not listed or listed[0].startswith('(')  # e.g. "(No .py file in this folder)"
+        if information and not py_files:
+            return
+        if information or not py_files:
+            self.display_python_files(self.selected_folder())
+            return
+        
+        top = listed[self.files_listbox.nearest(0)]
+        names = set(py_files)
+        for index in range(len(listed) - 1, -1, -1):
+            if listed[index] not in names:
+                self.files_listbox.delete(index)
+        remaining = [name for name in listed if name in names]
+        keys = [name.lower() for name in remaining]
+        remaining = set(remaining)
+        for name in py_files:
+            if name not in remaining:
+                index = bisect.bisect(keys, name.lower())
+                self.files_listbox.insert(index, name)
+                keys.insert(index, name.lower())
+        if top in names:
+            self.files_listbox.yview(bisect.bisect_left(keys, top.lower()))
+        
+        # Forget removed scripts that were selected
+        if any(os.path.basename(path) not in names for path in self.selected_files):
+            if self.files_listbox.curselection():
+                self.on_file_select(None)
+            else:
+                self.selected_file = None
+                self.selected_files = []
+                self.run_button.config(state=tk.DISABLED)
+                self.profile_button.config(state=tk.DISABLED)
+                self.selected_label.config(text="No file selected", foreground='gray')
+    
+    def on_tree_typeahead(self, event):
+        """Select the folder whose name starts with the letters typed (among the children of the focused
+        folder if it is open, else among its siblings), even while the folders are still being inserted"""
+        if not event.char or not event.char.isprintable() or event.state & 0x4:  # Control
+            return None
+        now = time.monotonic()
+        if now - self._typeahead_time > TYPEAHEAD_RESET_S:
+            self._typeahead = ''
+            self._typeahead_pending = None
+        if not self._typeahead and event.char == ' ':
+            return None  # Treeview's own binding
+        self._typeahead_time = now
+        self._typeahead += event.char.lower()
+        
+        focus = self.tree_folders.focus()
+        if focus and self.tree_folders.item(focus, 'open') and not self._is_unloaded(focus):
+            parent = focus
+        else:
+            parent = self.tree_folders.parent(focus) if focus else ''
+        if not self._select_typeahead_match(parent) and parent in self._tree_scans:
+            self._typeahead_pending = parent  # Retried as more folders are inserted
+        return 'break'
+    
+    def _select_typeahead_match(self, parent):
+        """Select the first child of parent matching the typed letters (the next one when the same
+        letter is typed again), return whether one was found"""
+        prefix = self._typeahead
+        repeated = len(prefix) > 1 and prefix == prefix[0] * len(prefix)
+        if repeated:
+            prefix = prefix[0]
+        children = self._tree_children.get(parent, [])
+        matches = [child for child in children
+                   if (os.path.basename(self._tree_paths[child]) or self._tree_paths[child]).lower().startswith(prefix)]
+        if not matches:
+            return False
+        
+        match = matches[0]
+        focus = self.tree_folders.focus()
+        if repeated and focus in matches:
+            match = matches[(matches.index(focus) + 1) % len(matches)]
+        self._typeahead_pending = None
+        self.tree_folders.selection_set(match)
+        self.tree_folders.focus(match)
+        self.tree_folders.see(match)
+        return True
     
     def on_folder_select(self, event):
         """Called when a folder is selected"""
@@ -433,193 +1104,1503 @@ class PythonScriptRunner:
             return
         
         item = selection[0]
+        if item not in self._tree_paths:
+            return  # "Loading..." or expansion placeholder
         
-        # Load subdirectories if needed
-        children = self.tree_folders.get_children(item)
-        if len(children) == 1 and not self.tree_folders.item(children[0])['values']:
-            self.tree_folders.delete(children[0])
-            folder_path = self.tree_folders.item(item)['values'][0]
+        # The user navigated away: drop the scans of collapsed folders that are no longer selected
+        for scanned_item in list(self._tree_scans):
+            if scanned_item != item and not self.tree_folders.item(scanned_item, 'open'):
+                self._cancel_folder_scan(scanned_item)
+        
+        # Load subdirectories if needed: the scan's listing also fills the script list
+        folder_path = self._tree_paths[item]
+        if self._is_unloaded(item):
             self.load_subdirectories(item, folder_path)
         
         # List all .py files in the selected folder
-        folder_path = self.tree_folders.item(item)['values'][0]
-        self.display_python_files(folder_path)
+        if self.search_var.get():
+            self.search_var.set('')  # Leaving search mode lists the folder's scripts
+        else:
+            self.display_python_files(folder_path)
+        
         self.save_last_folder(folder_path)
+        self._schedule_watch_update()
     
     def display_python_files(self, folder_path):
-        """Display all .py files in the selected folder"""
+        """Display all .py files in the selected folder (listed in the background unless its cached
+        listing is still valid)"""
         self.files_listbox.delete(0, tk.END)
         self.selected_file = None
+        self.selected_files = []
         self.run_button.config(state=tk.DISABLED)
+        self.profile_button.config(state=tk.DISABLED)
         self.selected_label.config(text="No file selected", foreground='gray')
         
+        listing = directory_cache.get_cached(folder_path)
+        if listing is not None:
+            self._files_pending = folder_path
+            self._on_python_files_listed(folder_path, listing)
+            return
+        
+        self.files_listbox.insert(tk.END, "(Loading…)")
+        self.files_listbox.config(foreground='gray')
+        self._files_pending = folder_path
+        # A pending scan of the folder's tree node lists it anyway
+        item = self._tree_nodes.get(self._tree_key(folder_path))
+        if item not in self._tree_scans:
+            self.tree_executor.submit(self._list_python_files, folder_path)
+    
+    def _list_python_files(self, folder_path):
+        """List a folder for the script list (called in a worker thread)"""
         try:
-            py_files = [f for f in os.listdir(folder_path) 
-                       if f.endswith('.py') and os.path.isfile(os.path.join(folder_path, f))]
-            py_files.sort(key=lambda x: x.lower())
-            
-            for py_file in py_files:
-                self.files_listbox.insert(tk.END, py_file)
-                
-            if not py_files:
-                self.files_listbox.insert(tk.END, "(No .py file in this folder)")
-                self.files_listbox.config(foreground='gray')
-            else:
-                self.files_listbox.config(foreground='black')
-                
-        except PermissionError:
+            listing = directory_cache.get(folder_path)
+        except OSError as e:
+            listing = e
+        self.call_in_ui(self._on_python_files_listed, folder_path, listing)
+    
+    def _on_python_files_listed(self, folder_path, listing):
+        """Fill the script list with a folder's listing (or the OSError raised listing it), if it is
+        still the one waited for"""
+        if folder_path != self._files_pending:
+            return
+        self._files_pending = None
+        self.files_listbox.delete(0, tk.END)
+        
+        if isinstance(listing, PermissionError):
             self.files_listbox.insert(tk.END, "(Access denied)")
             self.files_listbox.config(foreground='red')
+        elif isinstance(listing, OSError):
+            self.files_listbox.insert(tk.END, "(Folder unavailable)")
+            self.files_listbox.config(foreground='red')
+        elif not listing.py_files:
+            self.files_listbox.insert(tk.END, "(No .py file in this folder)")
+            self.files_listbox.config(foreground='gray')
+        else:
+            for py_file in listing.py_files:
+                self.files_listbox.insert(tk.END, py_file)
+            self.files_listbox.config(foreground='black')
+        
+        callbacks, self._files_listed_callbacks = self._files_listed_callbacks, []
+        for callback in callbacks:
+            callback()
+    
+    def _when_files_listed(self, callback):
+        """Call a function once the script list shows the selected folder's scripts"""
+        if self._files_pending is None:
+            callback()
+        else:
+            self._files_listed_callbacks.append(callback)
     
     def on_file_select(self, event):
-        """Called when a .py file is selected"""
+        """Called when .py files are selected"""
         selection = self.files_listbox.curselection()
         if not selection:
             return
         
-        filename = self.files_listbox.get(selection[0])
-        if filename.startswith('('):  # information
+        selected_files = []
+        if self.search_var.get().strip():
+            # Search results hold full paths
+            selected_files = [self.search_results[index] for index in selection
+                              if index < len(self.search_results)]
+        else:
+            # Get full path
+            folder_path = self.selected_folder()
+            if not folder_path:
+                return
+            for index in selection:
+                filename = self.files_listbox.get(index)
+                if not filename.startswith('('):  # information
+                    selected_files.append(os.path.join(folder_path, filename))
+        
+        if not selected_files:
             return
+        self.selected_files = selected_files
+        self.selected_file = selected_files[0]
         
-        # Get full path
-        folder_selection = self.tree_folders.selection()
-        if folder_selection:
-            folder_path = self.tree_folders.item(folder_selection[0])['values'][0]
-            self.selected_file = os.path.join(folder_path, filename)
-            self.run_button.config(state=tk.NORMAL)
-            
-            # Update Stop button state based on whether this script is running
-            if self.selected_file in self.running_processes:
-                self.stop_button.config(state=tk.NORMAL)
-                self.selected_label.config(text=f"Selected: {filename} (Running ▶)", foreground='green')
+        self.run_button.config(state=tk.NORMAL)
+        self.profile_button.config(state=tk.NORMAL)
+        self._update_selected_label()
+    
+    def on_search_changed(self):
+        """Called when the search box is edited: list matching scripts from the index"""
+        query = self.search_var.get()
+        if not query.strip():
+            # Back to the selected folder's scripts
+            self.search_results = []
+            folder_path = self.selected_folder()
+            if folder_path:
+                self.display_python_files(folder_path)
             else:
-                self.stop_button.config(state=tk.DISABLED)
-                self.selected_label.config(text=f"Selected: {filename}", foreground='yellow')
+                self.files_listbox.delete(0, tk.END)
+            return
+        
+        self._files_pending = None  # The folder listing no longer goes to the list
+        self.search_results = self.script_index.search(query)
+        self.files_listbox.delete(0, tk.END)
+        self.selected_file = None
+        self.selected_files = []
+        self.run_button.config(state=tk.DISABLED)
+        self.profile_button.config(state=tk.DISABLED)
+        self.selected_label.config(text="No file selected", foreground='gray')
+        
+        for path in self.search_results:
+            self.files_listbox.insert(tk.END, f"{os.path.basename(path)}  ({os.path.dirname(path)})")
+        
+        if not self.search_results:
+            if self.load_index_roots():
+                self.files_listbox.insert(tk.END, "(No matching script)")
+            else:
+                self.files_listbox.insert(tk.END, "(No indexed folder: Settings > Add Folder to Script Index)")
+            self.files_listbox.config(foreground='gray')
+        else:
+            self.files_listbox.config(foreground='black')
+    
+    def _update_script_index(self, load_saved=False):
+        """Refresh the script index from the configured folders (called in a worker thread)"""
+        if load_saved:
+            self.script_index.load()
+            self.call_in_ui(self._on_script_index_updated)
+        self.script_index.update(self.load_index_roots())
+        self.script_index.save()
+        self.call_in_ui(self._on_script_index_updated)
+    
+    def _on_script_index_updated(self):
+        """Show the index size and refresh the search results"""
+        self.startup.mark("script index")
+        self.index_label.config(text=f"{len(self.script_index)} scripts indexed")
+        if self.search_var.get().strip():
+            self.on_search_changed()
+    
+    def add_index_root(self):
+        """Menu option to add a folder to the script index"""
+        folder = filedialog.askdirectory(title="Select a folder to index")
+        if folder:
+            roots = self.load_index_roots()
+            folder = os.path.normpath(folder)
+            if folder not in roots:
+                roots.append(folder)
+                self.save_index_roots(roots)
+            threading.Thread(target=self._update_script_index, daemon=True).start()
+    
+    def clear_index_roots(self):
+        """Menu option to remove all folders from the script index"""
+        self.save_index_roots([])
+        threading.Thread(target=self._update_script_index, daemon=True).start()
+    
+    def save_index_roots(self, roots):
+        """Save the folders of the script index to config"""
+        self.config.set('index_roots', list(roots))
+    
+    def load_index_roots(self):
+        """Load the folders of the script index from config"""
+        return list(self.config.get('index_roots', []))
     
     def run_script(self):
-        """Execute the selected script"""
+        """Execute the selected script (queued if the max number of concurrent scripts is reached)"""
         if not self.selected_file:
             return
         
+        # Several scripts selected: run them as a batch
+        if len(self.selected_files) > 1:
+            self.run_batch(self.selected_files)
+            return
+        
         # Check if script is already running
         if self.selected_file in self.running_processes:
             messagebox.showwarning("Already Running", 
                                   f"This script is already running!\n{os.path.basename(self.selected_file)}")
             return
         
-        self.console.delete(1.0, tk.END)
-        self.console.insert(tk.END, f"=== Executing {os.path.basename(self.selected_file)} ===\n\n")
-        
-        # Enable the Stop button (Run button stays enabled for other scripts)
-        self.stop_button.config(state=tk.NORMAL)
+        self.launch_script(self.selected_file)
+    
+    def _add_profile_commands(self, menu):
+        """Add the "Run with ... Profile" commands to a menu"""
+        for mode in PROFILE_MODES:
+            menu.add_command(label=f"Run with {PROFILE_MODE_LABELS[mode]}",
+                             command=lambda mode=mode: self.run_profiled(mode))
+    
+    def run_profiled(self, mode):
+        """Run the selected script under a profiler (see PROFILE_MODES), its hot spots are shown at the end"""
+        if not self.selected_file:
+            return
+        if self.selected_file in self.running_processes:
+            messagebox.showwarning("Already Running", 
+                                  f"This script is already running!\n{os.path.basename(self.selected_file)}")
+            return
+        self.launch_script(self.selected_file, profile_mode=mode)
+    
+    def launch_script(self, script_path, batch=None, profile_mode=None):
+        """Queue a script for execution and return its ScriptRun"""
+        # Register the run right away so a double launch can't slip through
+        run = self.new_run(script_path)
+        run.batch = batch
+        run.profile_mode = profile_mode
+        if self.console_file_mode:
+            run.output_log = OutputLog()
+        self.running_processes[script_path] = run
+        self._show_run_in_console(run)
         
-        # Update label to show running status
-        filename = os.path.basename(self.selected_file)
-        self.selected_label.config(text=f"Selected: {filename} (Running ▶)", foreground='green')
+        # Queue the run, higher priorities first, launch order among the same priority
+        position = len(self.run_queue)
+        while position > 0 and self.run_queue[position - 1].priority < run.priority:
+            position -= 1
+        self.run_queue.insert(position, run)
         
-        # Launch the script in a new thread
-        script_path = self.selected_file
-        thread = threading.Thread(target=self._execute_script, args=(script_path,), daemon=True)
-        thread.start()
+        self._dispatch_runs()
+        if run.status == 'queued':
+            self._write_console(f"=== Queued {os.path.basename(script_path)} "
+                                f"(position {self.run_queue.index(run) + 1}) ===\n", run)
+        self._update_selected_label()
+        self._refresh_run_queue()
+        return run
     
-    def _execute_script(self, script_path):
-        """Execute script (called in a new thread)"""
-        try:
-            # Get script path
-            script_dir = os.path.dirname(script_path)
+    def _dispatch_runs(self):
+        """Start queued runs while there are free slots"""
+        running = sum(1 for run in self.running_processes.values() if run.status == 'running')
+        python_exec = None
+        if self.run_queue and running < self.max_concurrent_runs:
+            python_exec = self._resolve_python_executable()
+            if not python_exec:
+                self._refresh_run_queue()
+                return  # The runs stay queued until an interpreter is found
+        while self.run_queue and running < self.max_concurrent_runs:
+            run = self.run_queue.pop(0)
+            run.status = 'running'
+            run.start_time = time.monotonic()
+            run.started_at = time.time()
+            running += 1
+            self.history.start(run)
+            self._set_console_tab_title(run.script_path, self._console_tab_title(run))
+            profiled = f" with {PROFILE_MODE_LABELS[run.profile_mode]}" if run.profile_mode else ""
+            self._write_console(f"=== Executing {os.path.basename(run.script_path)}{profiled} ===\n\n", run)
             
-            # Get the correct Python executable
-            python_exec = self.get_python_executable()
+            # Start the script, its output is followed by the shared I/O engine
+            self._execute_script(run, python_exec)
+        self._refresh_run_queue()
+    
+    def cancel_queued_run(self, run):
+        """Remove a run from the queue before it starts"""
+        if run not in self.run_queue:
+            return
+        self.run_queue.remove(run)
+        self._write_console("=== Cancelled before start ===\n", run)
+        self._on_process_exit(run, None)
+    
+    def move_queued_run(self, run, offset):
+        """Move a queued run up (negative offset) or down the queue"""
+        if run not in self.run_queue:
+            return
+        position = max(0, min(len(self.run_queue) - 1, self.run_queue.index(run) + offset))
+        self.run_queue.remove(run)
+        self.run_queue.insert(position, run)
+        self._refresh_run_queue()
+    
+    def _execute_script(self, run, python_exec):
+        """Start a script and hand its output over to the I/O engine"""
+        try:
+            # Start the script (warm or cold)
+            warning = self.start_process(run, python_exec)
+            if warning:
+                self._write_console(f"⚠ {warning}\n", run)
             
-            # Start the process
-            process = subprocess.Popen(
-                [python_exec, script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                cwd=script_dir,
-                universal_newlines=True
-            )
+            self.io_engine.watch(run.process,
+                                 lambda text: self.output_queue.put((run, text)),
+                                 lambda return_code, usage: self._on_process_exit(run, return_code, usage))
+            if run.timeout:
+                self.root.after(int(run.timeout * 1000), self._on_run_timeout, run)
             
-            # Store the process in the dictionary
-            self.running_processes[script_path] = process
+        except Exception as e:
+            self._write_console(f"\n❌ Error: {str(e)}\n", run)
+            self._on_process_exit(run, None)
+    
+    def _on_process_exit(self, run, return_code, usage=None):
+        """Report the end of a script to the main loop, after its remaining output (called from the I/O
+        engine, or in the main loop for runs that never started)"""
+        self.output_queue.put((run, ScriptExit(return_code, usage, time.monotonic())))
+    
+    def _on_run_timeout(self, run):
+        """Stop a run still going at the end of its wall-clock timeout"""
+        if run.status != 'running':
+            return
+        run.limit_exceeded = f"killed: exceeded the {run.timeout} s timeout"
+        self.stop_run(run, f"\n⚠ Timeout: still running after {run.timeout} s, stopping\n")
+    
+    def _write_console(self, text, run=None):
+        """Queue a message for a run's console, or the launcher tab (safe to call from any thread)"""
+        self.output_queue.put((run, text))
+    
+    def _pump_output(self):
+        """Apply pending output to the console (runs periodically in the Tk main loop)"""
+        try:
+            budget = self.output_max_bytes_per_tick
+            log_budget = OUTPUT_LOG_MAX_BYTES_PER_TICK
+            visible_run = self.console_tabs.get(self.active_console)
+            pending = {}  # Dictionary: {run: [text, ...]} (each run's output is applied at once)
+            finished = []
             
-            # Read the output line by line
-            for line in process.stdout:
-                self.console.insert(tk.END, line)
-                self.console.see(tk.END)
-                self.root.update_idletasks()
+            while budget > 0 and log_budget > 0:
+                # Leftovers from the previous tick come first to preserve ordering
+                if self._output_backlog:
+                    run, text = self._output_backlog.popleft()
+                else:
+                    try:
+                        run, text = self.output_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                
+                if run is None:
+                    run = self.console_tabs[None]
+                
+                if isinstance(text, ScriptExit):
+                    finished.append((run, text))
+                    continue
+                
+                # Split chunks that exceed the remaining budget (file-backed consoles only draw
+                # the lines in view, so they can take much more output per tick)
+                remaining = budget if run.output_log is None else log_budget
+                size = utf8_size(text)
+                if size > remaining:
+                    text, size, rest = split_utf8(text, remaining)
+                    self._output_backlog.appendleft((run, rest))
+                if run.output_log is None:
+                    budget -= size
+                else:
+                    log_budget -= size
+                pending.setdefault(run, []).append(text)
             
-            # Wait for the end of the process
-            return_code = process.wait()
+            for run, chunks in pending.items():
+                text = ''.join(chunks)
+                if run.output_log is not None:
+                    run.output_log.append(text)
+                
+                # Every run keeps its own bounded scrollback, only the visible one is drawn
+                run.output.append(text)
+                self.history.write(run, text)
+                if run.search is not None and run.output_log is None:
+                    run.search.scan(text)
+                
+                # One coalesced insert per tick
+                if run is visible_run and run.output_log is None:
+                    if self._filtered_lines is not None:
+                        self._append_filtered_lines(run)
+                    else:
+                        self.console.insert(tk.END, text)
+                        self._trim_console(visible_run)
+                        self._highlight_new_matches(run)
+                        self.console.see(tk.END)
+                    self._update_console_search_label(run)
             
-            self.console.insert(tk.END, f"\n=== Terminated (code: {return_code}) ===\n")
-            self.console.see(tk.END)
+            # Redraw a file-backed console once it has grown (when followed) or been searched further
+            if visible_run is not None and visible_run.output_log is not None:
+                searched = self._advance_log_search(visible_run)
+                if searched or (self._view_first_line is None and self._view_drawn != visible_run.output_log.size):
+                    self._render_log_view()
             
+            for run, script_exit in finished:
+                self._on_script_finished(run, script_exit)
         except Exception as e:
-            self.console.insert(tk.END, f"\n❌ Error: {str(e)}\n")
-            self.console.see(tk.END)
+            print(f"Error while applying script output: {e}")
         finally:
-            # Remove process from running processes
+            self.root.after(self.output_pump_interval, self._pump_output)
+    
+    def _trim_console(self, run):
+        """Drop the console's oldest lines so it holds no more than the run's retained output"""
+        console_lines = int(self.console.index('end-1c').split('.')[0])
+        excess = console_lines - max(len(run.output.lines), 1)
+        if excess > 0:
+            self.console.delete('1.0', f'{excess + 1}.0')
+    
+    def _on_script_finished(self, run, script_exit):
+        """Record the end of a script and its resource usage, update the UI and start the next queued ones
+        (called in the Tk main loop)"""
+        script_path = run.script_path
+        run.return_code = script_exit.return_code
+        run.status = 'finished'
+        run.end_time = script_exit.end_time
+        run.record_usage(script_exit.usage)
+        if self.running_processes.get(script_path) is run:
+            del self.running_processes[script_path]
+        
+        if run.return_code is not None:
+            footer = f"\n=== Terminated (code: {run.return_code}) - {run.usage_summary()} ===\n"
+            self.history.write(run, footer)
+            self._write_console(footer, run)
+        run.check_limits()
+        if run.limit_exceeded:
+            message = f"⚠ {run.limit_exceeded}\n"
+            self.history.write(run, message)
+            self._write_console(message, run)
+        self.history.finish(run)
+        
+        # Remove the running marker from the script's tab
+        if self.console_tabs.get(script_path) is run:
+            self._set_console_tab_title(script_path, self._console_tab_title(run))
+        
+        # Update UI if this is the currently selected script
+        if self.selected_file == script_path:
+            self._update_selected_label()
+        
+        if run.batch is not None:
+            self._on_batch_run_finished(run.batch, run)
+        
+        if run.profile_file:
+            self.tree_executor.submit(self._load_profile, run)
+        
+        # Stopped because the watched script changed
+        if script_path in self._pending_reruns:
+            self._pending_reruns.discard(script_path)
+            if script_path in self.watched_scripts and script_path not in self.running_processes:
+                self.launch_script(script_path)
+        
+        self._dispatch_runs()
+    
+    def _load_profile(self, run):
+        """Read the summary of a profiled run (called in a worker thread)"""
+        self.call_in_ui(self._show_profile, run, load_profile_summary(run.profile_file))
+    
+    def _show_profile(self, run, summary):
+        """Open the hot spots table of a profiled run: a sortable top-N of functions or allocation sites"""
+        if summary is None:
+            self._write_console("⚠ No profile was saved (the script was killed before the end)\n", run)
+            return
+        message = f"=== {PROFILE_MODE_LABELS[run.profile_mode]} saved to {run.profile_file} ===\n"
+        self.history.write(run, message)
+        self._write_console(message, run)
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"{PROFILE_MODE_LABELS[run.profile_mode]} - {os.path.basename(run.script_path)}")
+        window.geometry("900x450")
+        frame = ttk.Frame(window, padding="5")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        top_frame = ttk.Frame(frame)
+        top_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(top_frame, text=summary.get('info', ''), font=('Arial', 9, 'bold')).pack(side=tk.LEFT)
+        size_var = tk.StringVar(value=str(PROFILE_TABLE_ROWS))
+        size_box = ttk.Combobox(top_frame, textvariable=size_var, state='readonly', width=6,
+                                values=[str(size) for size in PROFILE_TABLE_SIZES])
+        size_box.pack(side=tk.RIGHT)
+        ttk.Label(top_frame, text="Show top:").pack(side=tk.RIGHT, padx=5)
+        
+        # Raw profile, for external tools (snakeviz, pstats, tracemalloc, flamegraph.pl...)
+        path_frame = ttk.Frame(frame)
+        path_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        ttk.Label(path_frame, text="Raw profile:").pack(side=tk.LEFT)
+        path_entry = ttk.Entry(path_frame)
+        path_entry.insert(0, run.profile_file)
+        path_entry.config(state='readonly')
+        path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        columns = [str(index) for index in range(len(summary['columns']))]
+        tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for column, heading in zip(columns, summary['columns']):
+            tree.heading(column, text=heading, command=lambda column=column: show(int(column)))
+            tree.column(column, width=520 if column == '0' else 110, stretch=(column == '0'),
+                        anchor=tk.W if column == '0' else tk.E)
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scroll.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        rows = summary['rows']
+        kinds = summary['kinds']
+        order = {'column': summary.get('sort_column', 1)}  # Numbers sorted from the largest, names alphabetically
+        
+        def show(column=None):
+            if column is not None:
+                order['column'] = column
+            column = order['column']
+            ordered = sorted(rows, key=lambda row: row[column], reverse=kinds[column] != 'text')
+            tree.delete(*tree.get_children())
+            for row in ordered[:int(size_var.get())]:
+                tree.insert('', 'end', values=[format_profile_value(value, kind) for value, kind in zip(row, kinds)])
+            for index, heading in enumerate(summary['columns']):
+                tree.heading(str(index), text=heading + (" ▼" if index == column else ""))
+        
+        size_box.bind('<<ComboboxSelected>>', lambda event: show())
+        show()
+    
+    def toggle_watch_script(self):
+        """Menu option: rerun the selected script whenever it changes (started now if not running)"""
+        script_path = self.selected_file
+        if not script_path:
+            self.watch_var.set(False)
+            return
+        
+        if self.watch_var.get():
+            self.watched_scripts[script_path] = self._watch_signature(script_path, self.watch_folder_var.get())
+            if script_path not in self.running_processes:
+                self.launch_script(script_path)
+        else:
+            self.watched_scripts.pop(script_path, None)
+            self._pending_reruns.discard(script_path)
+        self.rerun_watcher.watch({os.path.dirname(path) for path in self.watched_scripts})
+        self._update_selected_label()
+    
+    @staticmethod
+    def _watch_signature(script_path, whole_folder):
+        """Signature of a watched script's file, or of all its folder's scripts"""
+        folder, name = os.path.split(script_path)
+        try:
+            signature = python_files_signature(folder)
+        except OSError:
+            return None
+        return signature if whole_folder else [entry for entry in signature if entry[0] == name]
+    
+    def _on_watched_scripts_changed(self, folders):
+        """Check the watched scripts of changed folders in the background"""
+        python_exec = self.find_python_executable(discover=False) if self.watch_check_syntax_var.get() else None
+        for script_path, signature in self.watched_scripts.items():
+            if os.path.dirname(script_path) in folders:
+                self.tree_executor.submit(self._check_watched_script, script_path, signature,
+                                          self.watch_folder_var.get(), python_exec)
+    
+    def _check_watched_script(self, script_path, previous, whole_folder, python_exec):
+        """See if a watched script really changed and compiles (called in a worker thread)"""
+        signature = self._watch_signature(script_path, whole_folder)
+        if signature == previous or not signature:
+            return  # Another file of the folder changed, or the script was removed
+        error = check_script_syntax(python_exec, script_path) if python_exec else None
+        self.call_in_ui(self._rerun_watched_script, script_path, signature, error)
+    
+    def _rerun_watched_script(self, script_path, signature, error):
+        """Restart a watched script after a change (unless it doesn't compile)"""
+        if script_path not in self.watched_scripts:
+            return
+        self.watched_scripts[script_path] = signature
+        name = os.path.basename(script_path)
+        run = self.running_processes.get(script_path)
+        
+        if error:
+            # Keep the previous run going
+            self._write_console(f"\n⚠ {name} changed but doesn't compile, not restarted:\n{error}\n",
+                                run or self.console_tabs.get(script_path))
+        elif run is None:
+            self.launch_script(script_path)
+        elif run.status == 'running' and script_path not in self._pending_reruns:
+            # Restarted once it has exited (queued runs will start with the new code anyway)
+            self._pending_reruns.add(script_path)
+            self.stop_run(run, f"\n⟳ {name} changed, restarting...\n")
+    
+    def run_folder(self):
+        """Run all the scripts of the selected folder as a batch"""
+        folder_path = self.selected_folder()
+        if not folder_path:
+            messagebox.showinfo("Run All", "Select a folder first.")
+            return
+        try:
+            py_files = directory_cache.get(folder_path).py_files
+        except OSError as e:
+            messagebox.showerror("Run All", f"Could not list the folder:\n{e}")
+            return
+        self.run_batch([os.path.join(folder_path, name) for name in py_files])
+    
+    def run_batch(self, script_paths):
+        """Run several scripts and show a summary of their results"""
+        if not script_paths:
+            messagebox.showinfo("Run Batch", "No script to run.")
+            return
+        
+        batch = ScriptBatch(script_paths, sequential=self.batch_sequential_var.get(),
+                            fail_fast=self.batch_fail_fast_var.get())
+        self._show_batch_summary(batch)
+        self._launch_batch_scripts(batch)
+    
+    def _launch_batch_scripts(self, batch):
+        """Launch the next script of a sequential batch, or all the remaining ones of a parallel batch"""
+        while batch.next_index < len(batch.script_paths):
+            script_path = batch.script_paths[batch.next_index]
+            batch.next_index += 1
             if script_path in self.running_processes:
-                del self.running_processes[script_path]
-            
-            # Update UI if this is the currently selected script
-            if self.selected_file == script_path:
-                self.root.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
-                filename = os.path.basename(script_path)
-                self.root.after(0, lambda: self.selected_label.config(
-                    text=f"Selected: {filename}", foreground='yellow'))
+                batch.skipped[script_path] = "already running"
+                continue
+            batch.runs[script_path] = self.launch_script(script_path, batch)
+            if batch.sequential:
+                break
+        self._on_batch_progress(batch)
     
-    def stop_script(self):
-        """Stop the currently selected running script"""
+    def _on_batch_run_finished(self, batch, run):
+        """Continue a batch after one of its scripts ended"""
+        if batch.fail_fast and run.return_code not in (0, None):
+            # Skip everything not started yet
+            for script_path in batch.pending_paths():
+                batch.skipped[script_path] = "not run (fail-fast)"
+            batch.next_index = len(batch.script_paths)
+            for other in list(batch.runs.values()):
+                if other.status == 'queued':
+                    self.cancel_queued_run(other)
+        elif batch.sequential:
+            self._launch_batch_scripts(batch)
+        self._on_batch_progress(batch)
+    
+    def _on_batch_progress(self, batch):
+        """Record the end of a batch and refresh its summary"""
+        if batch.is_done() and batch.end_time is None:
+            batch.end_time = time.monotonic()
+        self._refresh_batch_summary(batch)
+    
+    def _show_batch_summary(self, batch):
+        """Open the summary window of a batch"""
+        batch.window = tk.Toplevel(self.root)
+        batch.window.title(f"Batch Run - {len(batch.script_paths)} scripts")
+        batch.window.geometry("900x320")
+        
+        frame = ttk.Frame(batch.window, padding="5")
+        frame.pack(fill=tk.BOTH, expand=True)
+        batch.summary_label = ttk.Label(frame, text="", font=('Arial', 9, 'bold'))
+        batch.summary_label.pack(anchor=tk.W, pady=(0, 5))
+        
+        columns = ('script', 'result', 'time', 'cpu', 'memory', 'error')
+        batch.summary_tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for column, heading, width in (('script', "Script", 180), ('result', "Exit Code", 110),
+                                       ('time', "Wall Time", 80), ('cpu', "CPU Time", 70),
+                                       ('memory', "Peak RSS", 70), ('error', "First Error Line", 360)):
+            batch.summary_tree.heading(column, text=heading)
+            batch.summary_tree.column(column, width=width, stretch=(column == 'error'))
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=batch.summary_tree.yview)
+        batch.summary_tree.configure(yscrollcommand=scroll.set)
+        batch.summary_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        for index, script_path in enumerate(batch.script_paths):
+            batch.summary_tree.insert('', 'end', iid=str(index), values=(os.path.basename(script_path), '', '', '', '', ''))
+    
+    def _refresh_batch_summary(self, batch):
+        """Update the rows and totals of a batch summary window"""
+        if batch.window is None or not batch.window.winfo_exists():
+            return
+        
+        succeeded = failed = not_run = 0
+        for index, script_path in enumerate(batch.script_paths):
+            run = batch.runs.get(script_path)
+            wall_time = cpu_time = memory = error = ''
+            if script_path in batch.skipped:
+                result = batch.skipped[script_path]
+                not_run += 1
+            elif run is None:
+                result = "pending"
+            elif run.status != 'finished':
+                result = run.status
+            else:
+                if run.wall_time is not None:
+                    wall_time = f"{run.wall_time:.2f} s"
+                if run.cpu_user is not None:
+                    cpu_time = f"{run.cpu_user + run.cpu_system:.2f} s"
+                if run.peak_rss:
+                    memory = format_bytes(run.peak_rss)
+                if run.return_code is None:
+                    result = "cancelled" if run.start_time is None else "error"
+                    error = first_error_line(run.output.get_text())
+                    not_run += 1
+                else:
+                    result = str(run.return_code)
+                    if run.return_code == 0:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                        error = run.limit_exceeded or first_error_line(run.output.get_text())
+            batch.summary_tree.item(str(index), values=(os.path.basename(script_path), result, wall_time,
+                                                             cpu_time, memory, error))
+        
+        state = "finished" if batch.is_done() else "running"
+        total_time = (batch.end_time or time.monotonic()) - batch.start_time
+        mode = " (one after the other)" if batch.sequential else ""
+        batch.summary_label.config(
+            text=f"Batch {state}{mode}: {succeeded} succeeded, {failed} failed, {not_run} not run - {total_time:.1f} s")
+    
+    def _update_selected_label(self):
+        """Show the state (queued, running, finished) of the selected script and update the Stop button"""
         if not self.selected_file:
             return
+        filename = os.path.basename(self.selected_file)
+        run = self.running_processes.get(self.selected_file)
+        self.watch_var.set(self.selected_file in self.watched_scripts)
         
-        if self.selected_file in self.running_processes:
+        if run is not None:
+            # Stop also cancels a queued run
+            self.stop_button.config(state=tk.NORMAL)
+            if run.status == 'queued':
+                self.selected_label.config(text=f"Selected: {filename} (Queued ⏳)", foreground='orange')
+            else:
+                self.selected_label.config(text=f"Selected: {filename} (Running ▶)", foreground='green')
+            return
+        
+        self.stop_button.config(state=tk.DISABLED)
+        last_run = self.console_tabs.get(self.selected_file)
+        if last_run is not None and last_run.return_code is not None:
+            self.selected_label.config(text=f"Selected: {filename} (Finished, code {last_run.return_code})",
+                                       foreground='yellow')
+        else:
+            self.selected_label.config(text=f"Selected: {filename}", foreground='yellow')
+    
+    @staticmethod
+    def _console_tab_title(run):
+        """Title of a run's console tab, with its state (and live CPU/memory while running)"""
+        marker = {'queued': '⏳ ', 'running': '▶ '}.get(run.status, '')
+        title = marker + os.path.basename(run.script_path)
+        if run.status == 'running' and run.live_rss is not None:
+            cpu = f"{run.live_cpu_percent:.0f}% " if run.live_cpu_percent is not None else ''
+            title += f" · {cpu}{format_bytes(run.live_rss)}"
+        return title
+    
+    def _sample_resources(self):
+        """Sample the CPU/memory of the running scripts and show it in their tabs (runs periodically)"""
+        try:
+            for run in list(self.running_processes.values()):
+                if run.status == 'running':
+                    run.sample_usage()
+                    if self.console_tabs.get(run.script_path) is run:
+                        self._set_console_tab_title(run.script_path, self._console_tab_title(run))
+        finally:
+            self.root.after(RESOURCE_SAMPLE_INTERVAL_MS, self._sample_resources)
+    
+    def _add_console_tab(self, script_path, title):
+        """Create a console tab for a script (or the launcher tab when script_path is None)"""
+        tab = ttk.Frame(self.console_notebook, height=1)
+        self.console_notebook.add(tab, text=title)
+        self._console_tab_keys[str(tab)] = script_path
+        self.console_tabs[script_path] = ScriptRun(script_path, self.console_max_lines, self.console_max_bytes)
+        return tab
+    
+    def _find_console_tab(self, script_path):
+        """Return the tab widget name of a script's console, or None"""
+        for tab, key in self._console_tab_keys.items():
+            if key == script_path:
+                return tab
+        return None
+    
+    def _set_console_tab_title(self, script_path, title):
+        """Rename the console tab of a script"""
+        tab = self._find_console_tab(script_path)
+        if tab:
+            self.console_notebook.tab(tab, text=title)
+    
+    def _show_run_in_console(self, run):
+        """Attach a new run to its script's tab (replacing the previous run) and show it"""
+        script_path = run.script_path
+        tab = self._find_console_tab(script_path)
+        if tab is None:
+            tab = self._add_console_tab(script_path, '')
+        previous = self.console_tabs[script_path]
+        if previous.output_log is not None:
+            previous.output_log.close()
+        self.console_tabs[script_path] = run
+        self._set_console_tab_title(script_path, self._console_tab_title(run))
+        
+        if self.active_console == script_path:
+            self._render_console(script_path)
+        else:
+            self.console_notebook.select(tab)
+    
+    def on_console_tab_changed(self, event):
+        """Called when another console tab is selected"""
+        selection = self.console_notebook.select()
+        if selection not in self._console_tab_keys:
+            return
+        self.active_console = self._console_tab_keys[selection]
+        self._render_console(self.active_console)
+    
+    def _render_console(self, script_path):
+        """Redraw the console with the retained output of a tab"""
+        run = self.console_tabs[script_path]
+        
+        # File-backed consoles drive the scrollbar themselves
+        if run.output_log is not None:
+            self.console.configure(yscrollcommand=lambda *args: None)
+            self.console.vbar.configure(command=self._on_log_view_scroll)
+            self._view_first_line = None
+            self._start_console_search()
+            return
+        self.console.configure(yscrollcommand=self.console.vbar.set)
+        self.console.vbar.configure(command=self.console.yview)
+        
+        self.console.delete(1.0, tk.END)
+        self.console.insert(tk.END, run.output.get_text())
+        self.console.see(tk.END)
+        self._filtered_lines = None
+        self._start_console_search()
+    
+    def _console_rows(self):
+        """Number of text lines the console can show"""
+        if self._console_linespace is None:
+            self._console_linespace = tkfont.Font(font=self.console.cget('font')).metrics('linespace')
+        return max(int(self.console.cget('height')), self.console.winfo_height() // self._console_linespace)
+    
+    def _render_log_view(self):
+        """Draw the lines in view of a file-backed console (only the matching ones when filtering)"""
+        run = self.console_tabs[self.active_console]
+        log, search = run.output_log, run.search
+        filtering = search is not None and self.console_filter_var.get()
+        rows = self._console_rows()
+        total = self._log_view_total(run)
+        if self._view_first_line is None:
+            first = max(0, total - rows)
+        else:
+            first = max(0, min(self._view_first_line, total - rows))
+        
+        self.console.delete('1.0', tk.END)
+        if filtering:
+            lines = search.matches[first:first + rows]
+            self.console.insert(tk.END, '\n'.join(log.get_lines(line, 1) for line in lines))
+        else:
+            lines = range(first, min(first + rows, total))
+            self.console.insert(tk.END, log.get_lines(first, rows))
+        if search is not None:
+            current = search.matches[self._search_position] if self._search_position is not None else None
+            for row, line in enumerate(lines, 1):
+                if filtering or self._is_search_match(search, line):
+                    self._highlight_console_line(row, search, line == current)
+        if self._view_first_line is None:
+            self.console.see(tk.END)
+        self.console.vbar.set(first / max(total, 1), min(1.0, (first + rows) / max(total, 1)))
+        self._view_drawn = log.size
+        self._update_console_search_label(run)
+    
+    def _log_view_total(self, run):
+        """Number of lines a file-backed console can scroll through"""
+        if run.search is not None and self.console_filter_var.get():
+            return len(run.search.matches)
+        return run.output_log.line_count
+    
+    def _scroll_log_view(self, first):
+        """Show a file-backed console from a line (0-based), following the end once reached"""
+        total = self._log_view_total(self.console_tabs[self.active_console])
+        self._view_first_line = max(0, first) if first < total - self._console_rows() else None
+        self._render_log_view()
+    
+    def _log_view_first_line(self):
+        """First line shown by a file-backed console"""
+        if self._view_first_line is not None:
+            return self._view_first_line
+        total = self._log_view_total(self.console_tabs[self.active_console])
+        return max(0, total - self._console_rows())
+    
+    def _on_log_view_scroll(self, action, amount, unit=None):
+        """Scrollbar command of a file-backed console"""
+        if action == 'moveto':
+            total = self._log_view_total(self.console_tabs[self.active_console])
+            self._scroll_log_view(int(float(amount) * total))
+        else:
+            step = int(amount) * (self._console_rows() if unit == 'pages' else 1)
+            self._scroll_log_view(self._log_view_first_line() + step)
+    
+    def _on_log_view_event(self, event):
+        """Mouse wheel and paging keys over a file-backed console"""
+        run = self.console_tabs.get(self.active_console)
+        if run is None or run.output_log is None:
+            return None
+        first = self._log_view_first_line()
+        if event.keysym == 'Home':
+            first = 0
+        elif event.keysym == 'End':
+            first = self._log_view_total(run)
+        elif event.keysym in ('Prior', 'Next'):
+            first += self._console_rows() * (-1 if event.keysym == 'Prior' else 1)
+        elif event.num in (4, 5) or event.delta:
+            first += -3 if event.num == 4 or event.delta > 0 else 3
+        self._scroll_log_view(first)
+        return 'break'
+    
+    def on_console_search_changed(self):
+        """Search again once typing pauses"""
+        if self._console_search_job is not None:
+            self.root.after_cancel(self._console_search_job)
+        self._console_search_job = self.root.after(SEARCH_DELAY_MS, self._start_console_search)
+    
+    def _start_console_search(self):
+        """Search the shown output for the query of the search bar"""
+        self._console_search_job = None
+        run = self.console_tabs.get(self.active_console)
+        if run is None:
+            return
+        previous = run.search
+        for other in self.console_tabs.values():
+            other.search = None
+        self._search_position = None
+        
+        query = self.console_search_var.get()
+        search = None
+        if query:
             try:
-                process = self.running_processes[self.selected_file]
-                process.terminate()
-                self.console.insert(tk.END, f"\n⚠ Script interrupted by user: {os.path.basename(self.selected_file)}\n")
+                search = ConsoleSearch(query, self.console_regex_var.get(), self.console_case_var.get())
+            except re.error as e:
+                self.console_search_label.config(text=f"Invalid regex: {e}")
+        
+        if search is not None:
+            if previous is not None and previous.is_refined_by(search):
+                # Typing more of a plain query: only the previous matches can still match
+                search.refine(previous, lambda line: self._get_output_line(run, line))
+            elif run.output_log is None:
+                search.line = run.output.evicted_lines
+                search.scan(run.output.get_text())
+            # Otherwise the file-backed output is searched a few MB per refresh (see _pump_output)
+        run.search = search
+        self._redraw_console_search()
+    
+    @staticmethod
+    def _get_output_line(run, line):
+        """Text of a line of a run's output, None if no longer retained"""
+        if run.output_log is not None:
+            return run.output_log.get_lines(line, 1)
+        index = line - run.output.evicted_lines
+        return run.output.lines[index] if 0 <= index < len(run.output.lines) else None
+    
+    @staticmethod
+    def _is_search_match(search, line):
+        """True if a line is among the matches of a search"""
+        index = bisect.bisect_left(search.matches, line)
+        return index < len(search.matches) and search.matches[index] == line
+    
+    def _advance_log_search(self, run):
+        """Search the next part of a file-backed output, return True if anything was searched"""
+        search, log = run.search, run.output_log
+        if search is None or search.offset >= log.size:
+            return False
+        
+        # Stop at the start of a line, so no character is cut (unless a line exceeds the budget)
+        end = min(log.size, search.offset + SEARCH_SCAN_BYTES_PER_TICK)
+        line_start = log.line_offsets[bisect.bisect_right(log.line_offsets, end) - 1]
+        if line_start > search.offset:
+            end = line_start
+        search.scan(log.read(search.offset, end).decode('utf-8', errors='replace'))
+        search.offset = end
+        return True
+    
+    def _redraw_console_search(self):
+        """Draw the shown output again with the matches of the search highlighted, or only them"""
+        run = self.console_tabs.get(self.active_console)
+        if run is None:
+            return
+        if run.output_log is not None:
+            self._view_first_line = None
+            self._render_log_view()
+            return
+        
+        filtering = run.search is not None and self.console_filter_var.get()
+        if filtering:
+            self.console.delete(1.0, tk.END)
+            self._filtered_lines = []
+            self._search_shown = 0
+            self._append_filtered_lines(run)
+        else:
+            if self._filtered_lines is not None:
+                self.console.delete(1.0, tk.END)
+                self.console.insert(tk.END, run.output.get_text())
                 self.console.see(tk.END)
-                
+            self._filtered_lines = None
+            self.console.tag_remove('search_match', '1.0', tk.END)
+            self.console.tag_remove('search_current', '1.0', tk.END)
+            self._search_shown = 0
+            self._highlight_new_matches(run)
+        self._update_console_search_label(run)
+    
+    def _highlight_console_line(self, row, search, current=False):
+        """Highlight the matches of a search in a line of the console widget"""
+        text = self.console.get(f'{row}.0', f'{row}.end')
+        tag = 'search_current' if current else 'search_match'
+        for match in search.pattern.finditer(text):
+            if match.end() > match.start():
+                self.console.tag_add(tag, f'{row}.{match.start()}', f'{row}.{match.end()}')
+    
+    def _highlight_new_matches(self, run):
+        """Highlight the matches found since the last call in the console widget"""
+        search = run.search
+        if search is None:
+            return
+        for line in search.matches[self._search_shown:]:
+            row = line - run.output.evicted_lines + 1
+            if row >= 1:
+                self._highlight_console_line(row, search)
+        self._search_shown = len(search.matches)
+    
+    def _append_filtered_lines(self, run):
+        """List the matching lines found since the last call in a filtered console"""
+        search = run.search
+        new_lines = [line for line in search.matches[self._search_shown:] if line >= run.output.evicted_lines]
+        self._search_shown = len(search.matches)
+        if not new_lines:
+            return
+        row = len(self._filtered_lines) + 1
+        self.console.insert(tk.END, ''.join(self._get_output_line(run, line) for line in new_lines))
+        self._filtered_lines.extend(new_lines)
+        for offset in range(len(new_lines)):
+            self._highlight_console_line(row + offset, search)
+        
+        # Keep no more lines than the scrollback
+        excess = len(self._filtered_lines) - run.output.max_lines
+        if excess > 0:
+            self.console.delete('1.0', f'{excess + 1}.0')
+            del self._filtered_lines[:excess]
+        self.console.see(tk.END)
+    
+    def _update_console_search_label(self, run):
+        """Show the number of matching lines"""
+        search = run.search
+        if search is None:
+            if self.console_search_var.get() == '':
+                self.console_search_label.config(text="")
+            return
+        count = len(search.matches)
+        if run.output_log is None:
+            count -= bisect.bisect_left(search.matches, run.output.evicted_lines)
+        searching = run.output_log is not None and search.offset < run.output_log.size
+        self.console_search_label.config(text=f"{count} lines" + (" (searching...)" if searching else ""))
+    
+    def find_console_match(self, step):
+        """Scroll to the next (step 1) or previous (step -1) matching line"""
+        run = self.console_tabs.get(self.active_console)
+        if run is None or run.search is None:
+            return
+        search = run.search
+        if run.output_log is None:
+            # Lines no longer retained can't be shown
+            first = bisect.bisect_left(search.matches, run.output.evicted_lines)
+        else:
+            first = 0
+        if first >= len(search.matches):
+            return
+        if self._search_position is None or self._search_position < first:
+            position = first if step > 0 else len(search.matches) - 1
+        else:
+            position = first + (self._search_position - first + step) % (len(search.matches) - first)
+        self._search_position = position
+        line = search.matches[position]
+        
+        if run.output_log is not None:
+            filtering = self.console_filter_var.get()
+            self._scroll_log_view((position if filtering else line) - self._console_rows() // 2)
+            return
+        if self._filtered_lines is not None:
+            row = bisect.bisect_left(self._filtered_lines, line) + 1
+        else:
+            row = line - run.output.evicted_lines + 1
+        self.console.tag_remove('search_current', '1.0', tk.END)
+        self._highlight_console_line(row, search, current=True)
+        self.console.see(f'{row}.0')
+    
+    def go_to_console_line(self):
+        """Scroll the console to a line of the visible output"""
+        run = self.console_tabs.get(self.active_console)
+        if run is None:
+            return
+        if run.output_log is not None:
+            first_line, total = 1, run.output_log.line_count
+        else:
+            first_line = run.output.evicted_lines + 1
+            total = run.output.evicted_lines + len(run.output.lines)
+        line = simpledialog.askinteger("Go to Line", f"Line number ({first_line}-{total}):",
+                                       minvalue=first_line, maxvalue=max(first_line, total), parent=self.root)
+        if line is None:
+            return
+        if run.output_log is not None:
+            self._scroll_log_view(line - 1)
+        else:
+            self.console.yview(f"{line - run.output.evicted_lines}.0")
+    
+    def close_finished_tabs(self):
+        """Close the console tabs of scripts that are no longer running"""
+        for tab, script_path in list(self._console_tab_keys.items()):
+            if script_path is None or script_path in self.running_processes:
+                continue
+            self.console_notebook.forget(tab)
+            self.root.nametowidget(tab).destroy()
+            del self._console_tab_keys[tab]
+            run = self.console_tabs.pop(script_path)
+            if run.output_log is not None:
+                run.output_log.close()
+    
+    def stop_script(self):
+        """Stop the currently selected running script (or cancel it if still queued)"""
+        if not self.selected_file:
+            return
+        
+        if self.selected_file in self.running_processes:
+            run = self.running_processes[self.selected_file]
+            if run.status == 'queued':
+                self.cancel_queued_run(run)
+                self._update_selected_label()
+                self._refresh_run_queue()
+                return
+            if self.stop_run(run, f"\n⚠ Script interrupted by user: {os.path.basename(self.selected_file)}\n"):
                 # Update UI
                 self.stop_button.config(state=tk.DISABLED)
                 filename = os.path.basename(self.selected_file)
                 self.selected_label.config(text=f"Selected: {filename}", foreground='yellow')
-            except Exception as e:
-                self.console.insert(tk.END, f"\n❌ Error while stopping: {str(e)}\n")
-                self.console.see(tk.END)
         else:
             messagebox.showinfo("Not Running", 
                                f"This script is not currently running.\n{os.path.basename(self.selected_file)}")
     
+    def stop_run(self, run, message):
+        """Ask a running script and the processes it started to stop, and kill them if they are still
+        running after the grace period (checked later, the interface doesn't wait). Returns whether
+        the stop request was sent"""
+        try:
+            signal_process_tree(run.process)
+        except Exception as e:
+            self._write_console(f"\n❌ Error while stopping: {str(e)}\n", run)
+            return False
+        run.stopped = True
+        self._write_console(message, run)
+        self.root.after(self.stop_grace_period * 1000, self._force_stop, run)
+        return True
+    
+    def _force_stop(self, run):
+        """Kill what is left of a stopped script once its grace period is over"""
+        try:
+            if process_tree_alive(run.process):
+                signal_process_tree(run.process, force=True)
+                self._write_console(f"\n⚠ Killed: still running {self.stop_grace_period} s after being asked "
+                                    f"to stop\n", run)
+        except Exception as e:
+            self._write_console(f"\n❌ Error while stopping: {str(e)}\n", run)
+    
+    def stop_all_scripts(self):
+        """Stop every running script (all at once) and cancel the queued ones"""
+        for run in list(self.running_processes.values()):
+            if run.status == 'queued':
+                self.cancel_queued_run(run)
+            elif run.status == 'running' and run.process is not None:
+                self.stop_run(run, "\n⚠ Script interrupted by user (Stop All)\n")
+        self._update_selected_label()
+        self._refresh_run_queue()
+    
+    def show_run_queue(self):
+        """Open the window listing the queued runs"""
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.queue_window.lift()
+            return
+        
+        self.queue_window = tk.Toplevel(self.root)
+        self.queue_window.title("Run Queue")
+        self.queue_window.geometry("420x300")
+        
+        frame = ttk.Frame(self.queue_window, padding="5")
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.queue_status_label = ttk.Label(frame, text="", font=('Arial', 9))
+        self.queue_status_label.pack(anchor=tk.W)
+        
+        self.queue_listbox = tk.Listbox(frame, font=('Courier', 10), selectmode=tk.SINGLE)
+        self.queue_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        buttons = ttk.Frame(frame)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="▲ Up", command=lambda: self._on_queue_action(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="▼ Down", command=lambda: self._on_queue_action(1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="✕ Cancel", command=lambda: self._on_queue_action(None)).pack(side=tk.RIGHT, padx=2)
+        
+        self._refresh_run_queue()
+    
+    def _on_queue_action(self, offset):
+        """Move (offset) or cancel (offset None) the run selected in the queue window"""
+        selection = self.queue_listbox.curselection()
+        if not selection or selection[0] >= len(self.run_queue):
+            return
+        run = self.run_queue[selection[0]]
+        if offset is None:
+            self.cancel_queued_run(run)
+            if self.selected_file == run.script_path:
+                self._update_selected_label()
+        else:
+            self.move_queued_run(run, offset)
+            self.queue_listbox.selection_set(self.run_queue.index(run))
+        self._refresh_run_queue()
+    
+    def _refresh_run_queue(self):
+        """Update the queue window, if open"""
+        if self.queue_window is None or not self.queue_window.winfo_exists():
+            return
+        selection = self.queue_listbox.curselection()
+        self.queue_listbox.delete(0, tk.END)
+        for run in self.run_queue:
+            self.queue_listbox.insert(tk.END, f"[{run.priority:+d}] {os.path.basename(run.script_path)}")
+        if selection and selection[0] < len(self.run_queue):
+            self.queue_listbox.selection_set(selection[0])
+        
+        running = sum(1 for run in self.running_processes.values() if run.status == 'running')
+        self.queue_status_label.config(
+            text=f"Running: {running} / {self.max_concurrent_runs}    Queued: {len(self.run_queue)}")
+    
+    def show_run_history(self):
+        """Open the window listing the past runs"""
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
+            return
+        
+        self.history_window = tk.Toplevel(self.root)
+        self.history_window.title("Run History")
+        self.history_window.geometry("1100x400")
+        
+        frame = ttk.Frame(self.history_window, padding="5")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Filters: script path, start date, status
+        filters = ttk.Frame(frame)
+        filters.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filters, text="Script:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.history_script_var = tk.StringVar(value=self.selected_file or '')
+        script_entry = ttk.Entry(filters, textvariable=self.history_script_var, width=40)
+        script_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filters, text="Since (YYYY-MM-DD):", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.history_since_var = tk.StringVar()
+        since_entry = ttk.Entry(filters, textvariable=self.history_since_var, width=12)
+        since_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filters, text="Status:", font=('Arial', 9)).pack(side=tk.LEFT)
+        self.history_status_var = tk.StringVar(value='all')
+        ttk.Combobox(filters, textvariable=self.history_status_var, state='readonly', width=10,
+                     values=('all',) + RunHistory.STATUSES).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filters, text="Search", command=self._refresh_run_history).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filters, text="Show in Folder Tree", command=self.reveal_history_script).pack(side=tk.LEFT)
+        for entry in (script_entry, since_entry):
+            entry.bind('<Return>', lambda e: self._refresh_run_history())
+        self.history_status_var.trace_add('write', lambda *args: self._refresh_run_history())
+        
+        columns = ('started', 'script', 'status', 'code', 'time', 'cpu', 'memory', 'limit')
+        self.history_tree = ttk.Treeview(frame, columns=columns, show='headings')
+        for column, heading, width in (('started', "Started", 140), ('script', "Script", 320),
+                                       ('status', "Status", 80), ('code', "Exit Code", 70),
+                                       ('time', "Wall Time", 80), ('cpu', "CPU Time", 70),
+                                       ('memory', "Peak RSS", 80), ('limit', "Limit Exceeded", 200)):
+            self.history_tree.heading(column, text=heading)
+            self.history_tree.column(column, width=width, stretch=(column == 'script'))
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=scroll.set)
+        self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.history_tree.bind('<Double-Button-1>', lambda e: self.open_history_log())
+        
+        self.history_label = ttk.Label(self.history_window, text="", foreground='gray', font=('Arial', 9))
+        self.history_label.pack(anchor=tk.W, padx=5, pady=(0, 5))
+        
+        self._refresh_run_history()
+    
+    def _refresh_run_history(self):
+        """Query the run history with the window's filters"""
+        if self.history_window is None or not self.history_window.winfo_exists():
+            return
+        since = None
+        since_text = self.history_since_var.get().strip()
+        if since_text:
+            try:
+                since = datetime.strptime(since_text, '%Y-%m-%d').timestamp()
+            except ValueError:
+                self.history_label.config(text="Invalid date, expected YYYY-MM-DD")
+                return
+        status = self.history_status_var.get()
+        rows = self.history.query(self.history_script_var.get().strip(), since,
+                                  None if status == 'all' else status)
+        
+        self.history_tree.delete(*self.history_tree.get_children())
+        for (run_id, script_path, interpreter, start_time, status, exit_code, wall_time,
+             cpu_user, cpu_system, peak_rss, limit_exceeded) in rows:
+            self.history_tree.insert('', 'end', iid=str(run_id), values=(
+                datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'),
+                script_path,
+                status,
+                '' if exit_code is None else exit_code,
+                '' if wall_time is None else f"{wall_time:.2f} s",
+                '' if cpu_user is None else f"{cpu_user + cpu_system:.2f} s",
+                format_bytes(peak_rss) if peak_rss else '',
+                limit_exceeded or ''))
+        
+        more = " (most recent shown, refine the filters)" if len(rows) >= HISTORY_QUERY_LIMIT else ""
+        self.history_label.config(text=f"{len(rows)} runs{more} - double-click a run to open its output")
+    
+    def reveal_history_script(self):
+        """Show the script of the run selected in the history window in the folder tree"""
+        selection = self.history_tree.selection()
+        if selection:
+            self.reveal_path(self.history_tree.set(selection[0], 'script'))
+    
+    def open_history_log(self):
+        """Show the output log of the run selected in the history window (read in the background)"""
+        selection = self.history_tree.selection()
+        if not selection:
+            return
+        run_id = int(selection[0])
+        log_file = self.history.log_file(run_id)
+        script_path = self.history_tree.set(selection[0], 'script')
+        started = self.history_tree.set(selection[0], 'started')
+        
+        window = tk.Toplevel(self.history_window)
+        window.title(f"{os.path.basename(script_path)} - {started}")
+        window.geometry("800x450")
+        text = scrolledtext.ScrolledText(window, font=('Courier', 9), wrap=tk.WORD)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, "Loading...")
+        
+        def show(content):
+            if not text.winfo_exists():
+                return
+            text.delete('1.0', tk.END)
+            text.insert(tk.END, content)
+            text.see(tk.END)
+        
+        def load():
+            try:
+                self.history.wait_for_logs()
+                content, truncated = RunHistory.read_log(log_file)
+                if truncated:
+                    content = f"[... beginning of the output left out ...]\n{content}"
+            except (OSError, EOFError, TypeError) as e:
+                content = f"Output log not available: {e}"
+            self.call_in_ui(show, content)
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def edit_max_concurrent_runs(self):
+        """Menu option to set how many scripts may run at the same time"""
+        value = simpledialog.askinteger("Max Concurrent Scripts",
+                                        "Number of scripts allowed to run at the same time\n"
+                                        "(further launches wait in the run queue):",
+                                        initialvalue=self.max_concurrent_runs, minvalue=1, parent=self.root)
+        if value:
+            self.max_concurrent_runs = value
+            self.config.set('max_concurrent_runs', value)
+            self._dispatch_runs()
+    
+    def edit_script_settings(self):
+        """Menu option to edit the run options of the selected script"""
+        if not self.selected_file:
+            messagebox.showinfo("Run Options", "Select a script first.")
+            return
+        script_path = self.selected_file
+        settings = self.load_script_settings(script_path)
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"Run Options - {os.path.basename(script_path)}")
+        window.transient(self.root)
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        fields = [
+            ('priority', "Queue priority (higher runs first):", str(settings.get('priority', 0))),
+            ('nice', "CPU niceness (positive = lower priority):", str(settings.get('nice', 0))),
+            ('cpu_affinity', "CPU affinity (e.g. 0,1 - empty for all):",
+             ','.join(str(cpu) for cpu in settings.get('cpu_affinity') or [])),
+        ] + self._limit_fields(settings, " (empty: default, 0: none)")
+        variables = {}
+        for row, (key, label, value) in enumerate(fields):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            variables[key] = tk.StringVar(value=value)
+            ttk.Entry(frame, textvariable=variables[key], width=12).grid(row=row, column=1, padx=5, pady=2)
+        
+        def save():
+            try:
+                new_settings = dict(settings)
+                new_settings['priority'] = int(variables['priority'].get() or 0)
+                new_settings['nice'] = int(variables['nice'].get() or 0)
+                cpus = [int(cpu) for cpu in variables['cpu_affinity'].get().replace(' ', '').split(',') if cpu]
+                new_settings['cpu_affinity'] = cpus or None
+                new_settings.update(self._parse_limits(variables))
+            except ValueError:
+                messagebox.showerror("Invalid Value", "Priority, niceness, CPU numbers and limits must be integers.",
+                                     parent=window)
+                return
+            # Limits set to 0 are kept: no limit for this script, whatever the default limits
+            self.save_script_settings(script_path, {key: value for key, value in new_settings.items()
+                                                    if value is not None and (value or key in RESOURCE_LIMIT_KEYS)})
+            window.destroy()
+        
+        ttk.Button(frame, text="Save", command=save).grid(row=len(fields), column=1, sticky=tk.E, pady=(10, 0))
+    
+    @staticmethod
+    def _limit_fields(limits, suffix=""):
+        """Dialog fields (key, label, value) of the resource limits"""
+        labels = {
+            'memory_limit_mb': "Memory limit (MB):",
+            'cpu_time_limit': "CPU time limit (seconds):",
+            'open_files_limit': "Open files limit:",
+            'timeout': "Timeout (seconds of wall time):",
+        }
+        return [(key, labels[key][:-1] + suffix + ":", '' if limits.get(key) is None else str(limits[key]))
+                for key in RESOURCE_LIMIT_KEYS]
+    
+    @staticmethod
+    def _parse_limits(variables):
+        """Resource limits entered in a dialog (None when empty, 0 for none), raises ValueError if invalid"""
+        limits = {}
+        for key in RESOURCE_LIMIT_KEYS:
+            text = variables[key].get().strip()
+            limits[key] = int(text) if text else None
+            if text and limits[key] < 0:
+                raise ValueError(key)
+        return limits
+    
+    def edit_default_limits(self):
+        """Menu option to edit the resource limits of the scripts without limits of their own"""
+        window = tk.Toplevel(self.root)
+        window.title("Default Resource Limits")
+        window.transient(self.root)
+        frame = ttk.Frame(window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        fields = self._limit_fields(self.load_default_limits(), " (empty: none)")
+        variables = {}
+        for row, (key, label, value) in enumerate(fields):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+            variables[key] = tk.StringVar(value=value)
+            ttk.Entry(frame, textvariable=variables[key], width=12).grid(row=row, column=1, padx=5, pady=2)
+        
+        def save():
+            try:
+                limits = self._parse_limits(variables)
+            except ValueError:
+                messagebox.showerror("Invalid Value", "Limits must be positive integers.", parent=window)
+                return
+            self.save_default_limits({key: value for key, value in limits.items() if value})
+            window.destroy()
+        
+        ttk.Button(frame, text="Save", command=save).grid(row=len(fields), column=1, sticky=tk.E, pady=(10, 0))
+    
+    def load_output_settings(self):
+        """Load the console refresh settings from config (see load_run_settings for the others)"""
+        self.output_pump_interval = self.config_int('output_pump_interval_ms', OUTPUT_PUMP_INTERVAL_MS)
+        self.output_max_bytes_per_tick = self.config_int('output_max_bytes_per_tick', OUTPUT_MAX_BYTES_PER_TICK)
+        self.console_file_mode = bool(self.config.get('console_file_mode', False))
+    
+    def save_unbuffered_preference(self):
+        """Save the unbuffered output preference in configuration file"""
+        self.config.set('unbuffered_output', self.unbuffered_output)
+    
+    def toggle_unbuffered_output(self):
+        """Toggle running scripts with unbuffered stdout (-u)"""
+        self.unbuffered_output = self.unbuffered_var.get()
+        self.save_unbuffered_preference()
+        self.refill_warm_pool()
+    
+    def toggle_console_file_mode(self):
+        """Toggle keeping the whole output of the next runs in a file, drawing only the lines in view"""
+        self.console_file_mode = self.console_file_mode_var.get()
+        self.config.set('console_file_mode', self.console_file_mode)
+    
+    def toggle_warm_pool(self):
+        """Toggle running scripts in pre-started interpreters"""
+        self.warm_pool_enabled = self.warm_pool_var.get()
+        self.config.set('warm_pool_enabled', self.warm_pool_enabled)
+        self.refill_warm_pool()
+    
+    def edit_warm_pool_preload(self):
+        """Menu option to set the modules imported in advance by the warm interpreters"""
+        answer = simpledialog.askstring(
+            "Warm Pool Preload Modules",
+            "Modules imported by the pre-started interpreters, comma separated\n"
+            "(e.g. pandas, numpy). Scripts skip the import time of these modules.",
+            initialvalue=', '.join(self.warm_pool_preload),
+            parent=self.root
+        )
+        if answer is None:
+            return
+        self.warm_pool_preload = [name.strip() for name in answer.split(',') if name.strip()]
+        self.config.set('warm_pool_preload', self.warm_pool_preload)
+        self.refill_warm_pool()
+    
     def load_theme_preference(self):
         """Load the theme preference from configurtation file"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config.get('dark_mode', False)
-        except Exception:
-            pass
-        return False
+        return self.config.get('dark_mode', False)
     
     def save_theme_preference(self):
         """Save the theme preference in configurtation file"""
-        try:
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            
-            config['dark_mode'] = self.dark_mode
-            
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error while saving preferences: {e}")
+        self.config.set('dark_mode', self.dark_mode)
     
     def toggle_theme(self):
         """Toggle between light and dark theme"""
@@ -629,29 +2610,11 @@ class PythonScriptRunner:
     
     def save_last_folder(self, folder_path):
         """Save the last opened folder path"""
-        try:
-            config = {}
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            
-            config['last_folder'] = folder_path
-            
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error while saving last folder: {e}")
+        self.config.set('last_folder', folder_path)
     
     def load_last_folder(self):
         """Load the last opened folder path"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config.get('last_folder', None)
-        except Exception:
-            pass
-        return None
+        return self.config.get('last_folder')
     
     def apply_theme(self):
         """Apply theme to interface"""
@@ -694,6 +2657,13 @@ class PythonScriptRunner:
                      background=[('active', '#505050')],
                      foreground=[('active', '#ffffff')])
             
+            # Style for console tabs
+            style.configure("TNotebook", background=bg_color, borderwidth=0)
+            style.configure("TNotebook.Tab", background='#404040', foreground=fg_color)
+            style.map('TNotebook.Tab',
+                     background=[('selected', console_bg)],
+                     foreground=[('selected', console_fg)])
+            
             # Style for PanedWindow
             style.configure("TPanedwindow", background=bg_color)
             style.configure("Sash", sashthickness=5, background='#404040')
@@ -748,6 +2718,13 @@ class PythonScriptRunner:
                      background=[('active', '#d0d0d0')],
                      foreground=[('active', '#000000')])
             
+            # Style for console tabs
+            style.configure("TNotebook", background=bg_color, borderwidth=1)
+            style.configure("TNotebook.Tab", background='#e1e1e1', foreground=fg_color)
+            style.map('TNotebook.Tab',
+                     background=[('selected', console_bg)],
+                     foreground=[('selected', console_fg)])
+            
             # Style for PanedWindow
             style.configure("TPanedwindow", background=bg_color)
             style.configure("Sash", sashthickness=5, background='#d0d0d0')
@@ -767,10 +2744,16 @@ class PythonScriptRunner:
 
 
 def main():
+    startup = StartupProfile(enabled='--profile-startup' in sys.argv[1:])
+    startup.mark("imports")
     root = tk.Tk()
-    app = PythonScriptRunner(root)
+    startup.mark("Tk")
+    app = PythonScriptRunner(root, startup)
     root.mainloop()
+    
+    # Write pending setting changes, close the run logs and stop the idle warm interpreters
+    app.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
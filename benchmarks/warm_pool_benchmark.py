@@ -0,0 +1,69 @@
+"""Compare the time to run a script in a cold interpreter and in a warm pool interpreter.
+
+Usage: python benchmarks/warm_pool_benchmark.py [--runs N] [--preload module,module...]
+
+The benchmark script imports the preload modules and exits; the reported time goes from
+the start request to the end of the script.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from launcher_core import WarmInterpreterPool, make_script_environment
+
+
+def run_cold(script_path, options, env):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable] + options + [script_path], stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, cwd=os.path.dirname(script_path), env=env)
+    process.communicate()
+    return time.perf_counter() - start
+
+
+def run_warm(pool, script_path):
+    start = time.perf_counter()
+    process = pool.take(script_path, os.path.dirname(script_path))
+    output = process.stdout.read()
+    process.wait()
+    process.stdout.close()
+    if process.returncode != 0:
+        raise RuntimeError(output.decode('utf-8', 'replace'))
+    elapsed = time.perf_counter() - start
+    
+    # Let the pool start (and preload) the replacement interpreter before the next run
+    time.sleep(0.5)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--preload', default='asyncio,email.mime.multipart,http.server,decimal,json')
+    args = parser.parse_args()
+    preload = [name for name in args.preload.split(',') if name]
+    
+    with tempfile.TemporaryDirectory() as folder:
+        script_path = os.path.join(folder, 'bench_script.py')
+        with open(script_path, 'w') as f:
+            f.write(''.join(f"import {name}\n" for name in preload))
+        
+        options, env = make_script_environment(True)
+        cold = [run_cold(script_path, options, env) for _ in range(args.runs)]
+        
+        pool = WarmInterpreterPool()
+        pool.configure(sys.executable, True, preload, 1)
+        time.sleep(1)
+        warm = [run_warm(pool, script_path) for _ in range(args.runs)]
+        pool.shutdown()
+    
+    print(f"Preloaded modules: {', '.join(preload) or '(none)'}")
+    print(f"Cold start: {min(cold) * 1000:8.1f} ms best, {sum(cold) / len(cold) * 1000:8.1f} ms mean")
+    print(f"Warm pool:  {min(warm) * 1000:8.1f} ms best, {sum(warm) / len(warm) * 1000:8.1f} ms mean")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2095 @@
+"""Easy Python Launcher core: configuration, Python interpreters and script processes.
+
+Everything here works without a display and never imports tkinter, so it is shared by the
+graphical launcher (EasyPythonLauncher.py) and the headless mode (launcher_headless.py).
+"""
+
+import os
+import sys
+import subprocess
+import threading
+import json
+import shutil
+import signal
+import re
+import bisect
+import io
+import codecs
+import selectors
+import select
+import struct
+import ctypes
+import time
+import sqlite3
+import gzip
+import mmap
+import tempfile
+import queue
+import weakref
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: no memory/CPU/open files limits (the timeout still applies)
+
+
+# Delay before changed settings are written to the configuration file (seconds)
+CONFIG_SAVE_DELAY = 0.5
+
+# Python interpreter discovery
+PYTHON_PROBE_TIMEOUT = 5    # Max time to get the version of an interpreter (seconds)
+PYTHON_PROBE_WORKERS = 8    # Interpreters probed concurrently
+PYTHON_PROBE_CODE = "import sys; print(sys.implementation.name, '.'.join(map(str, sys.version_info[:3])))"
+
+# Warm pool: pre-started interpreters waiting for a script to run (see WarmInterpreterPool)
+WARM_POOL_SIZE = 2
+
+# Code run by a warm interpreter: import the preload modules, wait for a script on stdin, run it
+WARM_BOOTSTRAP = r'''
+import sys, os, json, runpy, importlib
+for _name in sys.argv[1:]:
+    try:
+        importlib.import_module(_name)
+    except Exception as _e:
+        # Shown at the top of the console of the script run by this interpreter
+        print('\u26a0 Could not preload module %s: %s: %s' % (_name, type(_e).__name__, _e),
+              file=sys.stderr, flush=True)
+_request = json.loads(sys.stdin.readline() or 'null')
+if not _request:
+    sys.exit(0)
+sys.stdin.close()
+sys.stdin = open(os.devnull)
+os.chdir(_request['cwd'])
+sys.argv = [_request['script']]
+sys.path[0] = _request['cwd']
+try:
+    runpy.run_path(_request['script'], run_name='__main__')
+except SystemExit:
+    raise
+except BaseException:
+    import traceback
+    _type, _value, _tb = sys.exc_info()
+    # Hide the frames of this bootstrap and of runpy
+    while _tb is not None and _tb.tb_frame.f_code.co_filename != _request['script']:
+        _tb = _tb.tb_next
+    traceback.print_exception(_type, _value, _tb)
+    sys.exit(1)
+'''
+
+# Size of the raw reads on a script's stdout pipe
+OUTPUT_READ_CHUNK_SIZE = 64 * 1024
+
+# Delay between two checks for the exit of scripts whose output is closed (seconds)
+REAP_POLL_INTERVAL = 0.05
+
+# Number of folder listings kept in the directory cache
+DIRECTORY_CACHE_SIZE = 512
+
+# Folder watching: changes are reported once no event came for WATCH_DEBOUNCE seconds (at most
+# WATCH_MAX_DELAY after the first one); without inotify, folders are polled every WATCH_POLL_INTERVAL
+WATCH_DEBOUNCE = 0.3
+WATCH_MAX_DELAY = 2.0
+WATCH_POLL_INTERVAL = 1.0
+
+# Max time to compile a changed script before rerunning it (seconds)
+SYNTAX_CHECK_TIMEOUT = 10
+SYNTAX_CHECK_CODE = r'''
+import sys
+try:
+    compile(open(sys.argv[1], 'rb').read(), sys.argv[1], 'exec')
+except Exception as e:
+    sys.exit('%s: %s' % (type(e).__name__, e))
+'''
+
+# inotify flags (see <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+# Script index: folders never indexed (besides hidden ones) and max number of search results
+INDEX_SKIP_DIRS = {'__pycache__', 'site-packages', 'node_modules', 'venv'}
+SEARCH_MAX_RESULTS = 200
+
+# Run history (see RunHistory)
+HISTORY_MAX_RUNS = 10000            # Older runs and their logs are deleted
+HISTORY_QUERY_LIMIT = 500           # Runs listed per history query
+HISTORY_LOG_COMPRESSION = 1         # gzip level of the output logs (fast, they are written live)
+HISTORY_LOG_VIEW_MAX_CHARS = 4 * 1024 * 1024  # End of a log shown by the history viewer
+
+# File-backed consoles (see OutputLog): output written to the log files per refresh,
+# and most bytes of a single line drawn at once
+OUTPUT_LOG_MAX_BYTES_PER_TICK = 1024 * 1024
+OUTPUT_LOG_MAX_LINE_BYTES = 1024 * 1024
+
+# Time a stopped script and the processes it started get to exit before being killed
+# (seconds, overridable in the configuration file)
+STOP_GRACE_PERIOD = 3
+STOP_POLL_INTERVAL = 0.05
+
+# Resource limits of a run (script run options, or 'default_limits' in the configuration file):
+# memory (address space, MB), CPU time (seconds), open files, wall-clock timeout (seconds)
+RESOURCE_LIMIT_KEYS = ('memory_limit_mb', 'cpu_time_limit', 'open_files_limit', 'timeout')
+LIMIT_CHECK_OUTPUT_CHARS = 4096  # End of the output searched for MemoryError / too many open files
+
+# Code run in a script's process before the script, to set what must be set before it starts (instead of a
+# preexec_fn, which may deadlock in a launcher with threads): python -I -S -c LAUNCH_BOOTSTRAP settings command...
+LAUNCH_BOOTSTRAP = r'''
+import os, sys, json
+settings = json.loads(sys.argv[1])
+try:
+    if settings.get('nice'):
+        os.nice(settings['nice'])
+    if settings.get('cpu_affinity'):
+        os.sched_setaffinity(0, settings['cpu_affinity'])
+except (OSError, ValueError) as e:
+    print('\u26a0 Could not apply priority/CPU affinity: %s' % e, file=sys.stderr, flush=True)
+try:
+    import resource
+    for name, soft, hard in settings.get('limits', []):
+        which = getattr(resource, name)
+        # A limit can't be raised above the launcher's own hard limit
+        current_hard = resource.getrlimit(which)[1]
+        if current_hard != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current_hard), min(hard, current_hard)
+        resource.setrlimit(which, (soft, hard))
+except (ImportError, OSError, ValueError) as e:
+    print('\u26a0 Could not apply the resource limits: %s' % e, file=sys.stderr, flush=True)
+os.execv(sys.argv[2], sys.argv[2:])
+'''
+
+# Profiling run modes: CPU (cProfile), memory (tracemalloc) and sampling (low overhead stack samples).
+# The raw profile is kept with this extension, the launcher reads the JSON summary written next to it.
+PROFILE_MODES = ('cpu', 'memory', 'sampling')
+PROFILE_EXTENSIONS = {'cpu': '.prof', 'memory': '.tracemalloc', 'sampling': '.folded'}
+PROFILE_MAX_ROWS = 500             # Functions / allocation sites kept in the summary, per sortable column
+PROFILE_SAMPLING_INTERVAL = 0.005  # Seconds between two stack samples
+
+# Code run around a profiled script: python -c PROFILE_BOOTSTRAP mode profile_file max_rows interval script
+PROFILE_BOOTSTRAP = r'''
+import sys, os, json, runpy, signal, threading, collections
+mode, profile_file, max_rows, interval, script = sys.argv[1:6]
+max_rows, interval = int(max_rows), float(interval)
+sys.argv = sys.argv[5:]
+sys.path[0] = os.path.dirname(script)
+
+def _stop(signum, frame):
+    raise SystemExit(128 + signum)
+
+# Stopping the script still saves its profile
+signal.signal(signal.SIGTERM, _stop)
+if hasattr(signal, 'SIGBREAK'):
+    signal.signal(signal.SIGBREAK, _stop)
+
+if mode == 'cpu':
+    import cProfile, pstats
+    _profiler = cProfile.Profile()
+elif mode == 'memory':
+    import tracemalloc
+    tracemalloc.start()
+else:
+    # Count the stacks of the main thread, outermost frame first
+    _samples = collections.Counter()
+    _main_thread = threading.get_ident()
+    _done = threading.Event()
+    def _sample():
+        while not _done.wait(interval):
+            frame = sys._current_frames().get(_main_thread)
+            stack = []
+            while frame is not None:
+                stack.append((frame.f_code.co_filename, frame.f_code.co_firstlineno, frame.f_code.co_name))
+                frame = frame.f_back
+            _samples[tuple(reversed(stack))] += 1
+    _sampler = threading.Thread(target=_sample, daemon=True)
+    _sampler.start()
+
+def _top_rows(rows):
+    # Keep the top rows by each number column, so that the viewer sorts them right by any column
+    kept = set()
+    for column in range(1, len(rows[0]) if rows else 0):
+        kept.update(sorted(range(len(rows)), key=lambda index: rows[index][column], reverse=True)[:max_rows])
+    return [rows[index] for index in sorted(kept)]
+
+def _save():
+    if mode == 'cpu':
+        _profiler.dump_stats(profile_file)
+        # Hide the frames of this bootstrap and of runpy
+        rows = [['%s:%d(%s)' % key, calls, self_time, total_time]
+                for key, (_, calls, self_time, total_time, _) in pstats.Stats(_profiler).stats.items()
+                if key[0] not in ('<string>', '<frozen runpy>', runpy.__file__)]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        summary = {'columns': ['Function', 'Calls', 'Self Time', 'Total Time'],
+                   'kinds': ['text', 'count', 'seconds', 'seconds'], 'sort_column': 2,
+                   'info': 'Total time: %.3f s' % sum(row[2] for row in rows)}
+    elif mode == 'memory':
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, '<frozen *>'),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, runpy.__file__),
+        ])
+        tracemalloc.stop()
+        snapshot.dump(profile_file)
+        rows = [['%s:%d' % (stat.traceback[0].filename, stat.traceback[0].lineno), stat.size, stat.count]
+                for stat in snapshot.statistics('lineno')]
+        summary = {'columns': ['Allocation Site', 'Size', 'Blocks'],
+                   'kinds': ['text', 'bytes', 'count'],
+                   'info': 'Memory still allocated at the end: %d bytes, peak: %d bytes' % (current, peak)}
+    else:
+        _done.set()
+        _sampler.join()
+        self_counts, total_counts = collections.Counter(), collections.Counter()
+        with open(profile_file, 'w', encoding='utf-8') as f:
+            for stack, count in _samples.items():
+                # Hide the frames of this bootstrap and of runpy
+                for i, frame in enumerate(stack):
+                    if frame[0] == script:
+                        stack = stack[i:]
+                        break
+                else:
+                    continue  # Sampled before the script started or while stopping
+                f.write('%s %d\n' % (';'.join('%s (%s:%d)' % (name, filename, line)
+                                               for filename, line, name in stack), count))
+                self_counts[stack[-1]] += count
+                for frame in set(stack):
+                    total_counts[frame] += count
+        total = sum(self_counts.values())
+        rows = [['%s:%d(%s)' % frame, self_counts[frame], count, 100.0 * count / total]
+                for frame, count in total_counts.items()]
+        rows.sort(key=lambda row: row[1], reverse=True)
+        summary = {'columns': ['Function', 'Self Samples', 'Total Samples', 'Total %'],
+                   'kinds': ['text', 'count', 'count', 'percent'],
+                   'info': '%d samples, one every %g ms at most' % (total, interval * 1000)}
+    summary['mode'] = mode
+    summary['rows'] = _top_rows(rows)
+    with open(profile_file + '.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+
+_exit_code = 0
+if mode == 'cpu':
+    _profiler.enable()
+try:
+    # Keep the script's globals alive for the memory snapshot
+    _globals = runpy.run_path(script, run_name='__main__')
+except SystemExit:
+    raise
+except BaseException:
+    import traceback
+    _type, _value, _tb = sys.exc_info()
+    # Hide the frames of this bootstrap and of runpy
+    while _tb is not None and _tb.tb_frame.f_code.co_filename != script:
+        _tb = _tb.tb_next
+    traceback.print_exception(_type, _value, _tb)
+    _exit_code = 1
+finally:
+    if mode == 'cpu':
+        _profiler.disable()
+    try:
+        _save()
+    except Exception as e:
+        print('Could not save the profile: %s' % e, file=sys.stderr)
+sys.exit(_exit_code)
+'''
+
+# Scripts run in a process group of their own, so that stopping one also stops its children
+NEW_PROCESS_GROUP_FLAGS = getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)  # Windows
+START_NEW_SESSION = sys.platform != 'win32'
+
+# Scrollback retained for each console tab (overridable in the configuration file)
+CONSOLE_MAX_LINES = 5000
+CONSOLE_MAX_BYTES = 2 * 1024 * 1024
+
+
+class ConfigStore:
+    """Configuration loaded once and kept in memory (thread-safe).
+    
+    Changes are written by a background thread, after CONFIG_SAVE_DELAY so that a burst
+    of changes results in a single write. The file is written to a temporary file first
+    then renamed, so a crash can't leave a truncated configuration.
+    """
+    
+    def __init__(self, config_file, save_delay=CONFIG_SAVE_DELAY):
+        self.config_file = config_file
+        self.save_delay = save_delay
+        self._values = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._changed = threading.Event()
+        self._writer = None
+        
+        try:
+            if os.path.exists(config_file):
+                with open(config_file, 'r') as f:
+                    self._values = json.load(f)
+        except Exception as e:
+            print(f"Error while loading configuration: {e}")
+    
+    def get(self, key, default=None):
+        """Return a setting"""
+        with self._lock:
+            return self._values.get(key, default)
+    
+    def set(self, key, value):
+        """Change a setting, the file is saved shortly after"""
+        with self._lock:
+            if key in self._values and self._values[key] == value:
+                return
+            self._values[key] = value
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_changes, daemon=True)
+                self._writer.start()
+        self._changed.set()
+    
+    def _write_changes(self):
+        """Writer thread: save the file once changes stop coming for save_delay"""
+        while True:
+            self._changed.wait()
+            time.sleep(self.save_delay)
+            self.flush()
+    
+    def flush(self):
+        """Write pending changes to the configuration file now"""
+        with self._write_lock:
+            if not self._changed.is_set():
+                return
+            self._changed.clear()
+            with self._lock:
+                data = json.dumps(self._values)
+            try:
+                tmp_file = self.config_file + '.tmp'
+                with open(tmp_file, 'w') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.config_file)
+            except Exception as e:
+                print(f"Error while saving configuration: {e}")
+
+
+def get_python_candidates():
+    """Return the possible locations of a Python interpreter, most preferred first"""
+    # Try pythonw first (no console window), fallback to python, then python3 on Linux/Mac
+    candidates = [shutil.which(name) for name in ('pythonw', 'python', 'python3')]
+    
+    if sys.platform == 'win32':
+        # Try common Windows locations (pythonw.exe preferred)
+        for exe in ('pythonw.exe', 'python.exe'):
+            for version in ('313', '312', '311', '310', '39'):
+                candidates.append(rf'C:\Python{version}\{exe}')
+                candidates.append(rf'C:\Program Files\Python{version}\{exe}')
+                candidates.append(os.path.expandvars(rf'%LOCALAPPDATA%\Programs\Python\Python{version}\{exe}'))
+    else:
+        candidates += ['/usr/local/bin/python3', '/opt/homebrew/bin/python3', '/usr/bin/python3']
+    
+    # Remove duplicates, keeping the order
+    unique = []
+    seen = set()
+    for path in candidates:
+        if path and os.path.normcase(path) not in seen:
+            seen.add(os.path.normcase(path))
+            unique.append(path)
+    return unique
+
+
+class InterpreterInfo:
+    """A probed Python interpreter, valid as long as its executable file doesn't change"""
+    
+    def __init__(self, path, implementation, version, file_id):
+        self.path = path
+        self.implementation = implementation
+        self.version = version
+        self.file_id = file_id  # [mtime, inode, size] of the executable when probed
+    
+    @property
+    def description(self):
+        name = 'Python' if self.implementation == 'cpython' else self.implementation
+        return f"{name} {self.version}"
+    
+    def to_dict(self):
+        return {'implementation': self.implementation, 'version': self.version, 'file_id': self.file_id}
+
+
+class InterpreterRegistry:
+    """Known Python interpreters with their version, saved in the configuration (thread-safe).
+    
+    An entry is revalidated with a single stat of the executable; the interpreter is only
+    run again (to get its version) when the executable file changed.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=PYTHON_PROBE_WORKERS)
+        self._interpreters = {}  # Dictionary: {path: InterpreterInfo}
+        for path, data in (config.get('interpreters') or {}).items():
+            try:
+                self._interpreters[path] = InterpreterInfo(
+                    path, data['implementation'], data['version'], list(data['file_id']))
+            except (KeyError, TypeError):
+                continue
+    
+    @staticmethod
+    def _file_id(path):
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_ino, stat.st_size]
+    
+    def get(self, path):
+        """Return the InterpreterInfo of an executable (None if it isn't a Python interpreter)"""
+        try:
+            file_id = self._file_id(path)
+        except OSError:
+            self._forget(path)
+            return None
+        
+        with self._lock:
+            info = self._interpreters.get(path)
+        if info is not None and info.file_id == file_id:
+            return info
+        return self._probe(path, file_id)
+    
+    def get_async(self, path):
+        """Same as get, in a worker thread: returns a Future"""
+        return self._executor.submit(self.get, path)
+    
+    def _probe(self, path, file_id):
+        """Run an interpreter to get its implementation and version"""
+        info = None
+        try:
+            result = subprocess.run([path, '-c', PYTHON_PROBE_CODE], capture_output=True,
+                                    text=True, timeout=PYTHON_PROBE_TIMEOUT)
+            fields = result.stdout.split()
+            if result.returncode == 0 and len(fields) == 2:
+                info = InterpreterInfo(path, fields[0], fields[1], file_id)
+            else:
+                # Interpreters without sys.implementation: fall back to --version
+                result = subprocess.run([path, '--version'], capture_output=True,
+                                        text=True, timeout=PYTHON_PROBE_TIMEOUT)
+                output = (result.stdout.strip() or result.stderr.strip()).split()
+                if len(output) == 2 and output[0] == 'Python':
+                    info = InterpreterInfo(path, 'cpython', output[1], file_id)
+        except (OSError, subprocess.SubprocessError):
+            pass
+        
+        if info is None:
+            self._forget(path)
+            return None
+        with self._lock:
+            self._interpreters[path] = info
+        self._save()
+        return info
+    
+    def _forget(self, path):
+        with self._lock:
+            if self._interpreters.pop(path, None) is None:
+                return
+        self._save()
+    
+    def _save(self):
+        with self._lock:
+            data = {path: info.to_dict() for path, info in self._interpreters.items()}
+        self.config.set('interpreters', data)
+    
+    def discover(self):
+        """Probe all candidate locations concurrently, return the interpreters found (preferred first)"""
+        futures = [self.get_async(path) for path in get_python_candidates() if os.path.exists(path)]
+        return [info for info in (future.result() for future in futures) if info is not None]
+    
+    def refresh(self):
+        """Revalidate the known interpreters, discover them if none is known yet"""
+        with self._lock:
+            known = list(self._interpreters)
+        for future in [self.get_async(path) for path in known]:
+            future.result()
+        if not self.interpreters():
+            self.discover()
+    
+    def interpreters(self):
+        """Return the known interpreters"""
+        with self._lock:
+            return list(self._interpreters.values())
+    
+    def best(self):
+        """Return the path of the preferred known interpreter that still exists, or None"""
+        with self._lock:
+            known = dict(self._interpreters)
+        ordered = [path for path in get_python_candidates() if path in known]
+        ordered += [path for path in known if path not in ordered]
+        for path in ordered:
+            if os.path.exists(path):
+                return path
+        return None
+
+
+def make_script_environment(unbuffered):
+    """Return the interpreter options and the environment used to run scripts"""
+    options = []
+    env = os.environ.copy()
+    env.setdefault('PYTHONIOENCODING', 'utf-8')
+    
+    # Unbuffered mode makes output (even without newline) show up as soon as it is printed
+    if unbuffered:
+        options.append('-u')
+        env['PYTHONUNBUFFERED'] = '1'
+    return options, env
+
+
+class WarmInterpreterPool:
+    """Interpreters started in advance, with optional modules already imported (thread-safe).
+    
+    Each warm interpreter runs one script: it waits for the script path on its stdin, then
+    runs it with runpy in the script's folder. Taking one hands over a process that is
+    already booted, and a replacement is started in the background. Interpreters are
+    single-use rather than forked from a server, as Windows has no fork().
+    """
+    
+    def __init__(self):
+        self._idle = []
+        self._settings = None  # (python_exec, unbuffered, preload modules, size) of the idle interpreters
+        self._lock = threading.Lock()
+        self._filling = False
+    
+    def configure(self, python_exec, unbuffered, preload, size):
+        """Set the interpreter and options of the warm interpreters, and start them"""
+        settings = (python_exec, unbuffered, tuple(preload), size)
+        with self._lock:
+            if settings != self._settings:
+                # Interpreter or options changed: the idle interpreters are useless
+                stale, self._idle = self._idle, []
+                self._settings = settings
+            else:
+                stale = []
+        for process in stale:
+            self._discard(process)
+        self.fill()
+    
+    def take(self, script_path, cwd):
+        """Start a script in a warm interpreter, return its process (None if none is ready)"""
+        process = None
+        while process is None:
+            with self._lock:
+                if not self._idle:
+                    break
+                candidate = self._idle.pop(0)
+            try:
+                candidate.stdin.write((json.dumps({'script': script_path, 'cwd': cwd}) + '\n').encode('utf-8'))
+                candidate.stdin.close()
+                process = candidate
+            except OSError:
+                # That one died while waiting
+                self._discard(candidate)
+        
+        self.fill()
+        return process
+    
+    def fill(self):
+        """Start interpreters in the background until the pool is full"""
+        with self._lock:
+            if self._filling or self._settings is None:
+                return
+            self._filling = True
+        threading.Thread(target=self._fill, daemon=True).start()
+    
+    def _fill(self):
+        try:
+            while True:
+                with self._lock:
+                    settings = self._settings
+                    if settings is None or len(self._idle) >= settings[3]:
+                        return
+                process = self._start(*settings[:3])
+                with self._lock:
+                    if settings == self._settings:
+                        self._idle.append(process)
+                        process = None
+                if process is not None:
+                    self._discard(process)
+        except Exception as e:
+            print(f"Error while starting a warm interpreter: {e}")
+        finally:
+            with self._lock:
+                self._filling = False
+    
+    def _start(self, python_exec, unbuffered, preload):
+        options, env = make_script_environment(unbuffered)
+        process = subprocess.Popen(
+            [python_exec] + options + ['-c', WARM_BOOTSTRAP] + list(preload),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            start_new_session=START_NEW_SESSION,
+            creationflags=NEW_PROCESS_GROUP_FLAGS
+        )
+        track_process_tree(process)
+        return process
+    
+    @staticmethod
+    def _discard(process):
+        try:
+            process.kill()
+            process.wait()
+            process.stdout.close()
+        except OSError:
+            pass
+    
+    def shutdown(self):
+        """Stop all idle interpreters"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._settings = None
+        for process in idle:
+            self._discard(process)
+
+
+class OutputBuffer:
+    """Bounded scrollback: keeps the most recent lines, evicting the oldest first"""
+    
+    def __init__(self, max_lines=CONSOLE_MAX_LINES, max_bytes=CONSOLE_MAX_BYTES):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.lines = deque()  # Last line may be partial (no trailing newline yet)
+        self.size = 0
+        self.evicted_lines = 0
+    
+    def append(self, text):
+        """Add output, then drop the oldest lines beyond the line/size limits"""
+        if not text:
+            return
+        
+        # A chunk larger than the whole budget replaces everything: skip to its last lines
+        if len(text) > self.max_bytes:
+            cut = text.find('\n', len(text) - self.max_bytes - 1) + 1
+            if 0 < cut < len(text):
+                self.evicted_lines += len(self.lines) + text.count('\n', 0, cut)
+                if self.lines and not self.lines[-1].endswith('\n'):
+                    self.evicted_lines -= 1  # Its end is in the chunk
+                self.lines.clear()
+                self.size = 0
+                text = text[cut:]
+        
+        # Lines end with '\n' only, like in the console (str.splitlines also splits on \r, \x0c, \u2028...)
+        pieces = text.split('\n')
+        parts = [piece + '\n' for piece in pieces[:-1]]
+        if pieces[-1]:
+            parts.append(pieces[-1])
+        
+        # Same when the chunk has more lines than kept
+        excess = len(parts) - self.max_lines
+        if excess > 0:
+            self.evicted_lines += len(self.lines) + excess
+            if self.lines and not self.lines[-1].endswith('\n'):
+                self.evicted_lines -= 1
+            self.lines.clear()
+            self.size = 0
+            parts = parts[excess:]
+        
+        # Continue a partial last line
+        if self.lines and not self.lines[-1].endswith('\n'):
+            last = self.lines.pop()
+            self.size -= len(last)
+            parts[0] = last + parts[0]
+        
+        for part in parts:
+            self.lines.append(part)
+            self.size += len(part)
+        
+        while len(self.lines) > self.max_lines or (self.size > self.max_bytes and len(self.lines) > 1):
+            self.size -= len(self.lines.popleft())
+            self.evicted_lines += 1
+        
+        # A single line larger than the whole budget keeps only its tail
+        if self.size > self.max_bytes:
+            line = self.lines.pop()
+            self.lines.append(line[-self.max_bytes:])
+            self.size = self.max_bytes
+    
+    def clear(self):
+        """Forget all retained output"""
+        self.lines.clear()
+        self.size = 0
+        self.evicted_lines = 0
+    
+    def get_text(self):
+        """Return the retained output as a single string"""
+        return ''.join(self.lines)
+
+
+class OutputLog:
+    """A run's whole output in an append-only temporary file, read back by lines through mmap.
+    
+    The offset of every line is indexed as the output arrives, so any range of lines is
+    found in constant time whatever the size of the output.
+    """
+    
+    NEWLINE = re.compile(b'\n')
+    
+    def __init__(self):
+        self.file = tempfile.TemporaryFile(buffering=0)
+        self.size = 0
+        self.line_offsets = array('q', [0])  # Byte offset where each line starts
+        self._map = None
+    
+    def append(self, text):
+        """Write output at the end of the file and index its lines"""
+        data = text.encode('utf-8')
+        if not data:
+            return
+        self.file.write(data)
+        base = self.size
+        self.line_offsets.extend(base + match.end() for match in self.NEWLINE.finditer(data))
+        self.size += len(data)
+    
+    @property
+    def line_count(self):
+        """Number of lines (an empty line after the final newline doesn't count)"""
+        if len(self.line_offsets) > 1 and self.line_offsets[-1] == self.size:
+            return len(self.line_offsets) - 1
+        return len(self.line_offsets)
+    
+    def get_lines(self, first, count, max_line_bytes=OUTPUT_LOG_MAX_LINE_BYTES):
+        """Return the text of count lines from line number first (0-based), without the last newline"""
+        last = min(first + count, self.line_count)
+        if first >= last or self.size == 0:
+            return ''
+        
+        self._map_to(self.line_offsets[last] if last < len(self.line_offsets) else self.size)
+        
+        # Huge lines (e.g. progress bars without newlines) only show their end
+        lines = []
+        for line in range(first, last):
+            start = self.line_offsets[line]
+            stop = self.line_offsets[line + 1] if line + 1 < len(self.line_offsets) else self.size
+            lines.append(self._map[max(start, stop - max_line_bytes):stop])
+        text = b''.join(lines).decode('utf-8', errors='replace')
+        return text[:-1] if text.endswith('\n') else text
+    
+    def read(self, start, end):
+        """Return the bytes between two offsets"""
+        if start >= end:
+            return b''
+        self._map_to(end)
+        return self._map[start:end]
+    
+    def _map_to(self, end):
+        """Map the file again once it has grown past the mapped part"""
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def close(self):
+        """Delete the file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.file.close()
+
+
+def scan_directory(path, cancelled=None):
+    """List a folder once: return (subdirectories, .py files), both sorted.
+    
+    Subdirectories are (name, path) tuples, hidden ones excluded. Uses os.scandir so the
+    entry type usually comes from the directory listing itself instead of one stat per entry.
+    Returns None if the cancelled event gets set.
+    """
+    subdirs = []
+    py_files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if cancelled is not None and cancelled.is_set():
+                return None
+            try:
+                if entry.name.endswith('.py') and entry.is_file():
+                    py_files.append(entry.name)
+                elif not entry.name.startswith('.') and entry.is_dir():
+                    subdirs.append((entry.name, entry.path))
+            except OSError:
+                continue
+    
+    # Sort by name
+    subdirs.sort(key=lambda x: x[0].lower())
+    py_files.sort(key=lambda x: x.lower())
+    return subdirs, py_files
+
+
+class DirectoryListing:
+    """Cached content of a folder, valid as long as the folder's mtime doesn't change"""
+    
+    def __init__(self, mtime, subdirs, py_files):
+        self.mtime = mtime
+        self.subdirs = subdirs
+        self.py_files = py_files
+
+
+class DirectoryCache:
+    """LRU cache of folder listings shared by the folder tree and the .py file list (thread-safe).
+    
+    A cached listing is revalidated with a single stat of the folder: adding, removing
+    or renaming an entry updates the folder's mtime and triggers a rescan.
+    """
+    
+    def __init__(self, max_size=DIRECTORY_CACHE_SIZE):
+        self.max_size = max_size
+        self._listings = OrderedDict()  # {path: DirectoryListing}, least recently used first
+        self._lock = threading.Lock()
+    
+    def get(self, path, cancelled=None):
+        """Return the DirectoryListing of a folder (None if cancelled), raises OSError if unreadable"""
+        mtime = os.stat(path).st_mtime_ns
+        listing = self._lookup(path, mtime)
+        if listing is not None:
+            return listing
+        
+        result = scan_directory(path, cancelled)
+        if result is None:
+            return None
+        listing = DirectoryListing(mtime, *result)
+        
+        with self._lock:
+            self._listings[path] = listing
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_size:
+                self._listings.popitem(last=False)
+        return listing
+    
+    def get_cached(self, path):
+        """Return the cached DirectoryListing of a folder if it is still valid, else None (never lists
+        the folder: a single stat, cheap enough for the Tk main loop)"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return self._lookup(path, mtime)
+    
+    def _lookup(self, path, mtime):
+        """Cached listing of a folder if it was listed at this mtime"""
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is None or listing.mtime != mtime:
+                return None
+            self._listings.move_to_end(path)
+            return listing
+    
+    def invalidate(self, path):
+        """Forget the listing of a folder"""
+        with self._lock:
+            self._listings.pop(path, None)
+
+
+# Process-wide folder listing cache
+directory_cache = DirectoryCache()
+
+
+def python_files_signature(folder):
+    """(name, mtime, size) of the .py files of a folder: changes when one is added, removed or saved"""
+    signature = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith('.py') and entry.is_file():
+                    stat = entry.stat()
+                    signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+    signature.sort()
+    return signature
+
+
+def check_script_syntax(python_exec, script_path):
+    """Compile a script with an interpreter without running it: return the error, or None if it compiles
+    (or the check couldn't run)"""
+    try:
+        result = subprocess.run([python_exec, '-c', SYNTAX_CHECK_CODE, script_path], capture_output=True,
+                                text=True, timeout=SYNTAX_CHECK_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode == 0:
+        return None
+    return result.stderr.strip() or f"exit code {result.returncode}"
+
+
+def load_inotify():
+    """Return the C library if it provides inotify (Linux), else None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FolderWatcher:
+    """Background watcher of a set of folders, reporting the ones whose entries were added, removed or renamed.
+    
+    Uses inotify on Linux and polls the folders' mtime elsewhere (and for folders inotify
+    refuses, e.g. past the watch limit). Bursts of events are coalesced: on_change(folders)
+    is called from the watcher thread with all the folders changed since the previous call.
+    With contents=True, saving a .py file of a folder also counts as a change.
+    """
+    
+    INOTIFY_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    
+    def __init__(self, on_change, contents=False):
+        self.on_change = on_change
+        self.contents = contents
+        self._lock = threading.Lock()
+        self._folders = set()
+        self._watches = {}  # Dictionary: {folder: inotify watch descriptor}
+        self._watched_folders = {}  # Dictionary: {watch descriptor: folder}
+        self._mtimes = {}  # Dictionary: {polled folder: mtime (or .py files signature)}
+        self._changed = set()
+        self._first_change = None
+        self._last_change = None
+        self._thread = None
+        self._closed = False
+        
+        self._libc = load_inotify()
+        self._fd = -1
+        if self._libc is not None:
+            self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    
+    def watch(self, folders):
+        """Set the folders to watch (replaces the previous ones)"""
+        folders = set(folders)
+        with self._lock:
+            added = folders - self._folders
+            removed = self._folders - folders
+            self._folders = folders
+            
+            for folder in removed:
+                self._mtimes.pop(folder, None)
+                wd = self._watches.pop(folder, None)
+                if wd is not None:
+                    self._watched_folders.pop(wd, None)
+                    self._libc.inotify_rm_watch(self._fd, wd)
+            for folder in added:
+                wd = -1
+                if self._fd >= 0:
+                    mask = self.INOTIFY_MASK | (IN_CLOSE_WRITE if self.contents else 0)
+                    wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask)
+                if wd >= 0:
+                    self._watches[folder] = wd
+                    self._watched_folders[wd] = folder
+                else:
+                    self._mtimes[folder] = self._folder_state(folder)
+            
+            if self._thread is None and folders:
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+    
+    def close(self):
+        """Stop watching (the thread exits within WATCH_POLL_INTERVAL)"""
+        self._closed = True
+        if self._thread is None and self._fd >= 0:
+            os.close(self._fd)
+    
+    def _loop(self):
+        """Watcher thread: wait for inotify events or the next poll, report the changes once settled"""
+        next_poll = 0
+        while not self._closed:
+            timeout = WATCH_POLL_INTERVAL
+            with self._lock:
+                if self._changed:
+                    timeout = min(timeout, self._report_time() - time.monotonic())
+            
+            if self._fd >= 0:
+                ready, _, _ = select.select([self._fd], [], [], max(0, timeout))
+                if ready:
+                    self._read_events()
+            else:
+                time.sleep(max(0, timeout))
+            
+            if time.monotonic() >= next_poll:
+                self._poll()
+                next_poll = time.monotonic() + WATCH_POLL_INTERVAL
+            
+            with self._lock:
+                if not self._changed or time.monotonic() < self._report_time():
+                    continue
+                changed = self._changed & self._folders
+                self._changed = set()
+                self._first_change = None
+            if changed:
+                try:
+                    self.on_change(changed)
+                except Exception as e:
+                    print(f"Error while reporting folder changes: {e}")
+        
+        if self._fd >= 0:
+            os.close(self._fd)
+    
+    def _report_time(self):
+        """When the pending changes are reported (lock held)"""
+        return min(self._last_change + WATCH_DEBOUNCE, self._first_change + WATCH_MAX_DELAY)
+    
+    def _add_changes(self, folders):
+        """Record changed folders (lock held)"""
+        if not folders:
+            return
+        now = time.monotonic()
+        self._changed.update(folders)
+        if self._first_change is None:
+            self._first_change = now
+        self._last_change = now
+    
+    def _read_events(self):
+        """Read the pending inotify events"""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        changed = set()
+        offset = 0
+        with self._lock:
+            while offset + INOTIFY_EVENT.size <= len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self._folders)  # Events were lost
+                    continue
+                folder = self._watched_folders.get(wd)
+                if folder is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # Folder removed: the watch is gone, poll it so that its recreation is noticed
+                    del self._watched_folders[wd]
+                    self._watches.pop(folder, None)
+                    self._mtimes[folder] = self._folder_state(folder)
+                changed.add(folder)
+            self._add_changes(changed)
+    
+    def _folder_state(self, folder):
+        """What polling compares: the mtime of a folder, or its .py files signature with contents=True"""
+        try:
+            return python_files_signature(folder) if self.contents else os.stat(folder).st_mtime_ns
+        except OSError:
+            return -1  # Removed or unreachable
+    
+    def _poll(self):
+        """Compare the mtime (or .py files) of the polled folders with the previous poll"""
+        with self._lock:
+            folders = list(self._mtimes)
+        changed = set()
+        for folder in folders:
+            mtime = self._folder_state(folder)
+            with self._lock:
+                if folder not in self._mtimes:
+                    continue
+                previous = self._mtimes[folder]
+                self._mtimes[folder] = mtime
+            if previous != mtime:
+                changed.add(folder)
+        with self._lock:
+            self._add_changes(changed)
+
+
+class ScriptIndex:
+    """Index of every .py script under the configured root folders, persisted between sessions.
+    
+    For each folder the index stores its mtime, its scripts (name, mtime, size) and its
+    subfolders. An update only rescans the folders whose mtime changed since the last one.
+    """
+    
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self._folders = {}  # {folder path: {'mtime': ns, 'files': [[name, mtime, size]], 'subdirs': [names]}}
+        self._update_lock = threading.Lock()
+        
+        # Search data: sorted lowercase script names (as a list and as one string, one
+        # name per line) and the matching paths
+        self._name_list = []
+        self._names = ''
+        self._line_starts = []
+        self._paths = []
+    
+    def __len__(self):
+        return len(self._paths)
+    
+    def load(self):
+        """Load the index saved by a previous session"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    self._folders = json.load(f).get('folders', {})
+                self._build_search_data()
+        except Exception as e:
+            print(f"Error while loading script index: {e}")
+    
+    def save(self):
+        """Save the index (written to a temporary file first so a crash can't truncate it). Saves and
+        updates take turns, so overlapping saves can't write an older index over a newer one."""
+        with self._update_lock:
+            tmp_file = None
+            try:
+                fd, tmp_file = tempfile.mkstemp(prefix=os.path.basename(self.index_file) + '.',
+                                                suffix='.tmp', dir=os.path.dirname(self.index_file) or '.')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({'folders': self._folders}, f)
+                os.replace(tmp_file, self.index_file)
+            except Exception as e:
+                print(f"Error while saving script index: {e}")
+                if tmp_file is not None and os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+    
+    def update(self, roots):
+        """Walk the root folders, rescanning only the folders whose mtime changed.
+        
+        Returns the number of folders rescanned.
+        """
+        with self._update_lock:
+            folders = {}
+            rescanned = 0
+            stack = [os.path.normpath(root) for root in roots]
+            while stack:
+                folder = stack.pop()
+                if folder in folders:
+                    continue
+                try:
+                    mtime = os.stat(folder).st_mtime_ns
+                    entry = self._folders.get(folder)
+                    if entry is None or entry['mtime'] != mtime:
+                        entry = self._scan_folder(folder, mtime)
+                        rescanned += 1
+                except OSError:
+                    continue
+                folders[folder] = entry
+                stack.extend(os.path.join(folder, name) for name in entry['subdirs'])
+            
+            self._folders = folders
+            self._build_search_data()
+            return rescanned
+    
+    def _scan_folder(self, folder, mtime):
+        """List the scripts and subfolders of a folder (symlinked folders are not followed)"""
+        files = []
+        subdirs = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.endswith('.py') and entry.is_file():
+                        stat = entry.stat()
+                        files.append([entry.name, stat.st_mtime_ns, stat.st_size])
+                    elif (entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+                          and entry.name not in INDEX_SKIP_DIRS):
+                        subdirs.append(entry.name)
+                except OSError:
+                    continue
+        return {'mtime': mtime, 'files': files, 'subdirs': subdirs}
+    
+    def _build_search_data(self):
+        """Rebuild the search structures from the folder entries"""
+        paths = []
+        for folder, entry in self._folders.items():
+            for name, _, _ in entry['files']:
+                paths.append(os.path.join(folder, name))
+        paths.sort(key=lambda x: os.path.basename(x).lower())
+        
+        name_list = [os.path.basename(path).lower() for path in paths]
+        line_starts = []
+        offset = 0
+        for name in name_list:
+            line_starts.append(offset)
+            offset += len(name) + 1
+        
+        # Swapped in one go so searches from the Tk main loop always see consistent data
+        self._name_list, self._names, self._line_starts, self._paths = (
+            name_list, '\n'.join(name_list), line_starts, paths)
+    
+    def search(self, query, limit=SEARCH_MAX_RESULTS):
+        """Return the paths of the scripts whose name matches the query.
+        
+        Prefix matches come first (a bisect in the sorted names), then substring matches,
+        then fuzzy matches (the query's characters in order), each group sorted by name.
+        The substring and fuzzy scans over all names are done by the regex engine.
+        """
+        query = query.strip().lower()
+        name_list, names, line_starts, paths = self._name_list, self._names, self._line_starts, self._paths
+        if not query or not paths:
+            return []
+        
+        found = []
+        seen = set()
+        
+        # Prefix matches are contiguous in the sorted names
+        index = bisect.bisect_left(name_list, query)
+        while index < len(name_list) and name_list[index].startswith(query) and len(found) < limit:
+            found.append(index)
+            seen.add(index)
+            index += 1
+        
+        fuzzy = '[^\\n]*?'.join(re.escape(char) for char in query)
+        for pattern in (re.escape(query), fuzzy):
+            matches = []
+            for match in re.finditer(pattern, names):
+                if len(found) + len(matches) >= limit:
+                    break
+                index = bisect.bisect_right(line_starts, match.start()) - 1
+                if index not in seen:
+                    seen.add(index)
+                    matches.append(index)
+            found.extend(matches)
+        
+        return [paths[index] for index in found[:limit]]
+
+
+class ScriptRun:
+    """A script execution: its process and its own console output"""
+    
+    def __init__(self, script_path, max_lines=CONSOLE_MAX_LINES, max_bytes=CONSOLE_MAX_BYTES):
+        self.script_path = script_path
+        self.process = None
+        self.return_code = None
+        self.status = 'queued'  # 'queued', 'running' or 'finished'
+        self.output = OutputBuffer(max_lines, max_bytes)
+        self.output_log = None  # OutputLog with the whole output (file-backed console), or None
+        self.log_file = None  # File the output is written to (headless mode with --log-dir), or None
+        self.search = None  # ConsoleSearch of the console search bar, while this run is shown
+        
+        # Scheduling options (see PythonScriptRunner.load_script_settings)
+        self.priority = 0
+        self.nice = 0
+        self.cpu_affinity = None  # List of CPU numbers, None for all
+        
+        # Resource limits (see RESOURCE_LIMIT_KEYS), None for no limit
+        self.memory_limit_mb = None
+        self.cpu_time_limit = None
+        self.open_files_limit = None
+        self.timeout = None
+        self.limit_exceeded = None  # What happened once a limit tripped, e.g. "killed: exceeded 2.0 GB of memory"
+        self.stopped = False  # Stopped by the user (or by a rerun), recorded as interrupted
+        
+        # Profiling run mode (see PROFILE_MODES), None for a normal run
+        self.profile_mode = None
+        self.profile_file = None  # Raw profile, its summary is in profile_file + '.json'
+        
+        self.batch = None  # ScriptBatch this run belongs to
+        self.start_time = None
+        self.end_time = None
+        self.started_at = None  # Wall clock start time (for the run history)
+        self.interpreter = None
+        self.history_id = None
+        
+        # Resource usage: totals once reaped (POSIX), live samples while running (Linux)
+        self.cpu_user = None
+        self.cpu_system = None
+        self.peak_rss = None  # Bytes
+        self.live_cpu_percent = None
+        self.live_rss = None
+        self._last_sample = None  # (time, CPU seconds)
+    
+    def has_rlimits(self):
+        """Check if the run has limits applied in its process (all but the timeout)"""
+        return bool(self.memory_limit_mb or self.cpu_time_limit or self.open_files_limit)
+    
+    def check_limits(self):
+        """Set limit_exceeded if the finished run was stopped by one of its limits"""
+        if self.limit_exceeded:
+            return  # Already known (timeout)
+        code = self.return_code
+        sigxcpu = getattr(signal, 'SIGXCPU', None)
+        cpu_time = (self.cpu_user or 0) + (self.cpu_system or 0)
+        if self.cpu_time_limit and code is not None and sigxcpu is not None and (
+                code == -sigxcpu or (code == -signal.SIGKILL and cpu_time >= self.cpu_time_limit)):
+            self.limit_exceeded = f"killed: exceeded {self.cpu_time_limit} s of CPU time"
+            return
+        if not code or not (self.memory_limit_mb or self.open_files_limit):
+            return
+        tail = self.output.get_text()[-LIMIT_CHECK_OUTPUT_CHARS:]
+        if self.memory_limit_mb and 'MemoryError' in tail:
+            self.limit_exceeded = f"stopped: exceeded {format_bytes(self.memory_limit_mb * 1024 * 1024)} of memory"
+        elif self.open_files_limit and 'Too many open files' in tail:
+            self.limit_exceeded = f"failed: exceeded {self.open_files_limit} open files"
+    
+    def record_usage(self, usage):
+        """Store the resource usage of the reaped process (a resource.struct_rusage)"""
+        if usage is None:
+            return
+        self.cpu_user = usage.ru_utime
+        self.cpu_system = usage.ru_stime
+        # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+        self.peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    
+    def sample_usage(self):
+        """Update the live CPU% and memory from /proc (Linux only)"""
+        if self.process is None:
+            return
+        sample = read_proc_usage(self.process.pid)
+        if sample is None:
+            return
+        now = time.monotonic()
+        cpu_seconds, self.live_rss = sample
+        if self._last_sample is not None and now > self._last_sample[0]:
+            self.live_cpu_percent = 100 * (cpu_seconds - self._last_sample[1]) / (now - self._last_sample[0])
+        self._last_sample = (now, cpu_seconds)
+        self.peak_rss = max(self.peak_rss or 0, self.live_rss)
+    
+    def usage_summary(self):
+        """One line summary of the resources used, e.g. for the console footer"""
+        parts = []
+        if self.wall_time is not None:
+            parts.append(f"wall {self.wall_time:.2f} s")
+        if self.cpu_user is not None:
+            parts.append(f"CPU {self.cpu_user:.2f} s user + {self.cpu_system:.2f} s sys")
+        if self.peak_rss:
+            parts.append(f"peak RSS {format_bytes(self.peak_rss)}")
+        return ', '.join(parts)
+    
+    @property
+    def wall_time(self):
+        """Duration of the run in seconds (so far if still running), None if not started"""
+        if self.start_time is None:
+            return None
+        return (self.end_time or time.monotonic()) - self.start_time
+
+
+# Line reporting the exception in a traceback, e.g. "ValueError: invalid literal"
+ERROR_LINE_PATTERN = re.compile(r'^[\w.]*(Error|Exception|Exit|Interrupt|Warning)\b')
+
+
+def first_error_line(text):
+    """Return the first line of script output that looks like an error, or the last non-empty line"""
+    lines = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith('===')]
+    for line in lines:
+        if ERROR_LINE_PATTERN.match(line):
+            return line
+    return lines[-1] if lines else ''
+
+
+class RunHistory:
+    """Past runs in a SQLite database, the full output of each in a gzip-compressed log file"""
+    
+    STATUSES = ('success', 'failed', 'error', 'interrupted', 'running')
+    
+    def __init__(self, db_file, log_dir, max_runs=HISTORY_MAX_RUNS):
+        self.log_dir = log_dir
+        self.max_runs = max_runs
+        self._logs = {}  # Dictionary: {run id: open log file}
+        # Output is compressed and written by a thread of its own, off the thread reporting it
+        self._log_queue = queue.SimpleQueue()  # (log file, text or None to close it), (None, event) to sync
+        self._log_writer = None
+        self.db = None
+        try:
+            self.db = sqlite3.connect(db_file)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    script_path TEXT NOT NULL,
+                    interpreter TEXT,
+                    start_time REAL NOT NULL,
+                    end_time REAL,
+                    status TEXT NOT NULL,
+                    exit_code INTEGER,
+                    wall_time REAL,
+                    cpu_user REAL,
+                    cpu_system REAL,
+                    peak_rss INTEGER,
+                    log_file TEXT,
+                    limit_exceeded TEXT
+                );
+                CREATE INDEX IF NOT EXISTS runs_script ON runs (script_path, start_time);
+                CREATE INDEX IF NOT EXISTS runs_start ON runs (start_time);
+                CREATE INDEX IF NOT EXISTS runs_status ON runs (status, start_time);
+            """)
+            # Histories created before resource limits existed
+            columns = [row[1] for row in self.db.execute("PRAGMA table_info(runs)")]
+            if 'limit_exceeded' not in columns:
+                self.db.execute("ALTER TABLE runs ADD COLUMN limit_exceeded TEXT")
+            # Runs still marked as running were cut short by the launcher closing
+            self.db.execute("UPDATE runs SET status = 'interrupted' WHERE status = 'running'")
+            self.db.commit()
+        except sqlite3.Error as e:
+            print(f"Error opening run history: {e}")
+            self.db = None
+    
+    def start(self, run):
+        """Record a run that has just started and open its output log"""
+        if self.db is None:
+            return
+        try:
+            cursor = self.db.execute(
+                "INSERT INTO runs (script_path, start_time, status) VALUES (?, ?, 'running')",
+                (run.script_path, run.started_at))
+            run.history_id = cursor.lastrowid
+            log_file = os.path.join(self.log_dir, f"{run.history_id}.log.gz")
+            os.makedirs(self.log_dir, exist_ok=True)
+            if self._log_writer is None:
+                self._log_writer = threading.Thread(target=self._write_logs, daemon=True)
+                self._log_writer.start()
+            self._logs[run.history_id] = gzip.open(log_file, 'wt', encoding='utf-8',
+                                                   compresslevel=HISTORY_LOG_COMPRESSION)
+            self.db.execute("UPDATE runs SET log_file = ? WHERE id = ?", (log_file, run.history_id))
+            self.db.commit()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error recording run: {e}")
+    
+    def write(self, run, text):
+        """Append output to a run's log (written in the background)"""
+        log = self._logs.get(run.history_id)
+        if log is not None:
+            self._log_queue.put((log, text))
+    
+    def _write_logs(self):
+        """Write the queued output to the logs (runs in the log writer thread)"""
+        while True:
+            log, text = self._log_queue.get()
+            if log is None:
+                if text is None:
+                    return
+                text.set()  # Everything queued before is written
+                continue
+            try:
+                if text is None:
+                    log.close()
+                else:
+                    log.write(text)
+            except (OSError, ValueError) as e:
+                print(f"Error writing run log: {e}")
+    
+    def wait_for_logs(self):
+        """Wait until the output reported so far is in the log files"""
+        if self._log_writer is not None:
+            written = threading.Event()
+            self._log_queue.put((None, written))
+            written.wait()
+    
+    def finish(self, run):
+        """Close a run's log and record its outcome and resource usage"""
+        log = self._logs.pop(run.history_id, None)
+        if log is not None:
+            self._log_queue.put((log, None))
+        if self.db is None or run.history_id is None:
+            return
+        if run.return_code is None:
+            status = 'error'
+        elif run.stopped and not run.limit_exceeded:
+            status = 'interrupted'
+        else:
+            status = 'success' if run.return_code == 0 else 'failed'
+        try:
+            self.db.execute(
+                "UPDATE runs SET interpreter = ?, end_time = ?, status = ?, exit_code = ?, wall_time = ?, "
+                "cpu_user = ?, cpu_system = ?, peak_rss = ?, limit_exceeded = ? WHERE id = ?",
+                (run.interpreter, time.time(), status, run.return_code, run.wall_time,
+                 run.cpu_user, run.cpu_system, run.peak_rss, run.limit_exceeded, run.history_id))
+            self.db.commit()
+        except sqlite3.Error as e:
+            print(f"Error recording run: {e}")
+    
+    def query(self, script=None, since=None, status=None, limit=HISTORY_QUERY_LIMIT):
+        """Most recent runs matching a script path substring, a start time and a status"""
+        if self.db is None:
+            return []
+        conditions, params = [], []
+        if script:
+            conditions.append("script_path LIKE ? ESCAPE '\\'")
+            params.append('%' + re.sub(r'([%_\\])', r'\\\1', script) + '%')
+        if since is not None:
+            conditions.append("start_time >= ?")
+            params.append(since)
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        try:
+            return self.db.execute(
+                "SELECT id, script_path, interpreter, start_time, status, exit_code, wall_time, "
+                f"cpu_user, cpu_system, peak_rss, limit_exceeded FROM runs {where} ORDER BY start_time DESC LIMIT ?",
+                params + [limit]).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading run history: {e}")
+            return []
+    
+    def log_file(self, run_id):
+        """Path of a run's output log, None if unknown"""
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT log_file FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def read_log(log_file, max_chars=HISTORY_LOG_VIEW_MAX_CHARS):
+        """Return the end of a log (at most max_chars) and whether the beginning was left out"""
+        tail = deque()
+        size = 0
+        truncated = False
+        with gzip.open(log_file, 'rt', encoding='utf-8', errors='replace') as f:
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                tail.append(chunk)
+                size += len(chunk)
+                while size - len(tail[0]) >= max_chars:
+                    size -= len(tail.popleft())
+                    truncated = True
+        text = ''.join(tail)
+        if len(text) > max_chars:
+            text = text[-max_chars:]
+            truncated = True
+        return text, truncated
+    
+    def prune(self):
+        """Delete the oldest runs and their logs beyond max_runs"""
+        rows = self.db.execute("SELECT id, log_file FROM runs ORDER BY start_time DESC LIMIT -1 OFFSET ?",
+                               (self.max_runs,)).fetchall()
+        for run_id, log_file in rows:
+            if log_file:
+                try:
+                    os.remove(log_file)
+                except OSError:
+                    pass
+        self.db.executemany("DELETE FROM runs WHERE id = ?", [(row[0],) for row in rows])
+        self.db.commit()
+    
+    def close(self):
+        """Close the open logs (the runs stay marked as running until the next start) and delete
+        the oldest runs (done at exit rather than at startup, which it would slow down)"""
+        for log in self._logs.values():
+            self._log_queue.put((log, None))
+        self._logs.clear()
+        if self._log_writer is not None:
+            self._log_queue.put((None, None))
+            self._log_writer.join()
+            self._log_writer = None
+        if self.db is not None:
+            try:
+                self.prune()
+            except sqlite3.Error as e:
+                print(f"Error pruning run history: {e}")
+            self.db.close()
+
+
+def windows_priority_flags(nice):
+    """Return the Windows creation flags matching a nice value"""
+    if sys.platform != 'win32' or not nice:
+        return 0
+    if nice >= 10:
+        return subprocess.IDLE_PRIORITY_CLASS
+    if nice > 0:
+        return subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    return subprocess.ABOVE_NORMAL_PRIORITY_CLASS
+
+
+def make_launch_settings(run):
+    """Settings of LAUNCH_BOOTSTRAP for a run, None if the script can start directly.
+    
+    nice, cpu_affinity: set before the script starts, so that the processes it starts get them too (POSIX
+    only, see windows_priority_flags for Windows); limits: resource limits as (RLIMIT name, soft limit,
+    hard limit), POSIX only.
+    """
+    settings = {}
+    if run.nice and sys.platform != 'win32' and hasattr(os, 'nice'):
+        settings['nice'] = run.nice
+    if run.cpu_affinity and hasattr(os, 'sched_setaffinity'):
+        settings['cpu_affinity'] = run.cpu_affinity
+    limits = []
+    if resource is not None:
+        if run.memory_limit_mb:
+            size = run.memory_limit_mb * 1024 * 1024
+            limits.append(('RLIMIT_AS', size, size))
+        if run.cpu_time_limit:
+            # SIGXCPU at the limit, SIGKILL a second later if it is ignored
+            limits.append(('RLIMIT_CPU', run.cpu_time_limit, run.cpu_time_limit + 1))
+        if run.open_files_limit:
+            limits.append(('RLIMIT_NOFILE', run.open_files_limit, run.open_files_limit))
+    if limits:
+        settings['limits'] = limits
+    return settings or None
+
+
+class JobAccountingInfo(ctypes.Structure):
+    """JOBOBJECT_BASIC_ACCOUNTING_INFORMATION (Windows)"""
+    _fields_ = [('total_user_time', ctypes.c_int64), ('total_kernel_time', ctypes.c_int64),
+                ('period_user_time', ctypes.c_int64), ('period_kernel_time', ctypes.c_int64),
+                ('page_faults', ctypes.c_uint32), ('total_processes', ctypes.c_uint32),
+                ('active_processes', ctypes.c_uint32), ('terminated_processes', ctypes.c_uint32)]
+
+
+JOB_OBJECT_BASIC_ACCOUNTING_INFORMATION = 1
+
+
+def load_kernel32():
+    """Return kernel32 with the job object functions (Windows), else None"""
+    if sys.platform != 'win32':
+        return None
+    try:
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateJobObjectW.restype = ctypes.c_void_p
+        kernel32.CreateJobObjectW.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p]
+        kernel32.AssignProcessToJobObject.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        kernel32.TerminateJobObject.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+        kernel32.QueryInformationJobObject.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p,
+                                                       ctypes.c_uint32, ctypes.c_void_p]
+        kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+        return kernel32
+    except (OSError, AttributeError):
+        return None
+
+
+kernel32 = load_kernel32()
+
+
+def track_process_tree(process):
+    """Put a started script in a job object of its own (Windows), so that the processes it starts can
+    still be found and killed once it has exited. Elsewhere its process group does that."""
+    if kernel32 is None:
+        return
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return
+    if not kernel32.AssignProcessToJobObject(job, int(process._handle)):
+        kernel32.CloseHandle(job)
+        return
+    process.job = job
+    weakref.finalize(process, kernel32.CloseHandle, job)
+
+
+def signal_process_tree(process, force=False):
+    """Ask a script and the processes it started to stop (SIGTERM to its process group), or kill them
+    with force. On Windows, CTRL_BREAK is sent to the group, and the job object (or taskkill /T) kills
+    the tree"""
+    if sys.platform == 'win32':
+        if not force:
+            try:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+                return
+            except OSError:
+                pass  # No console shared with the script: kill it right away
+        job = getattr(process, 'job', None)
+        if job is not None:
+            kernel32.TerminateJobObject(job, 1)
+        # "Not found" once the script itself is gone
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], capture_output=True)
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except ProcessLookupError:
+        pass  # All gone
+
+
+def process_tree_alive(process):
+    """Check if a script or one of the processes it started is still running (never blocks).
+    On Windows, without a job object to look at, the tree counts as running, so that it gets killed."""
+    if sys.platform == 'win32':
+        job = getattr(process, 'job', None)
+        if job is None:
+            return True
+        # Children surviving the script are still in its job
+        info = JobAccountingInfo()
+        if not kernel32.QueryInformationJobObject(job, JOB_OBJECT_BASIC_ACCOUNTING_INFORMATION,
+                                                  ctypes.byref(info), ctypes.sizeof(info), None):
+            return True
+        return info.active_processes > 0
+    try:
+        os.killpg(process.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def stop_process_trees(processes, grace_period=STOP_GRACE_PERIOD):
+    """Stop scripts and their children: ask them all at once, then kill the ones still running
+    after grace_period (blocks until then)"""
+    for process in processes:
+        signal_process_tree(process)
+    deadline = time.monotonic() + grace_period
+    alive = list(processes)
+    while alive and time.monotonic() < deadline:
+        time.sleep(STOP_POLL_INTERVAL)
+        alive = [process for process in alive if process_tree_alive(process)]
+    for process in alive:
+        signal_process_tree(process, force=True)
+
+
+def reap_process(process):
+    """Check without blocking if a process has exited.
+    
+    Returns None while it runs, else (return_code, rusage). The resource usage (CPU times,
+    peak memory) comes from os.wait4 and is only available on POSIX systems (None elsewhere).
+    There the caller owns the process: nothing else may wait for it (Popen.poll, wait or
+    send_signal), or its exit status could be taken first.
+    """
+    if not hasattr(os, 'wait4'):
+        return_code = process.poll()
+        return None if return_code is None else (return_code, None)
+    
+    if process.returncode is not None:
+        return process.returncode, None
+    try:
+        pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+    except ChildProcessError:
+        return None, None  # Reaped elsewhere (e.g. SIGCHLD ignored): the exit status is lost
+    if pid == 0:
+        return None
+    
+    # Tell Popen the process is gone, so it doesn't try to wait for it again
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
+    else:
+        process.returncode = os.WEXITSTATUS(status)
+    return process.returncode, usage
+
+
+def read_proc_usage(pid):
+    """Return (CPU seconds, resident memory in bytes) of a running process from /proc, or None"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            fields = f.read().rsplit(b')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # Fields after the process name: state is the first, utime/stime the 12th/13th, rss the 22nd
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    return cpu_seconds, int(fields[21]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def format_bytes(size):
+    """Human readable size, e.g. 45.2 MB"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_profile_value(value, kind):
+    """Text of a value of a profile summary, by kind: 'text', 'count', 'seconds', 'bytes' or 'percent'"""
+    if kind == 'seconds':
+        return f"{value:.4f} s"
+    if kind == 'bytes':
+        return format_bytes(value)
+    if kind == 'percent':
+        return f"{value:.1f} %"
+    return str(value)
+
+
+def make_output_decoder():
+    """Incremental UTF-8 decoder for script output (copes with sequences and \\r\\n split across reads)"""
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True)
+
+
+def utf8_size(text):
+    """Size of a text in bytes once written (UTF-8)"""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def split_utf8(text, max_bytes):
+    """Split a text at max_bytes of its UTF-8 encoding, between two characters (the first part keeps
+    at least one): return (first part, its size in bytes, rest)"""
+    data = text.encode('utf-8')
+    end = max_bytes
+    while 0 < end < len(data) and data[end] & 0xC0 == 0x80:
+        end -= 1  # Continuation byte: back to the start of the character
+    head = data[:end].decode('utf-8') or text[0]
+    return head, utf8_size(head), text[len(head):]
+
+
+class WatchedProcess:
+    """A process followed by the I/O engine, with its output and exit callbacks.
+    
+    on_exit receives the return code and the resource usage (see reap_process).
+    """
+    
+    def __init__(self, process, on_output, on_exit):
+        self.process = process
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.decoder = make_output_decoder()
+    
+    def feed(self, data):
+        """Decode a raw chunk and pass it to the output callback (empty data means end of output)"""
+        text = self.decoder.decode(data, final=not data)
+        if text:
+            self.on_output(text)
+
+
+class ProcessIOEngine:
+    """Single background thread reading the output of every running script and reaping their exits.
+    
+    Callbacks are invoked from the engine thread. Windows can't select() on pipes,
+    so there each process falls back to a reader thread of its own. The engine reaps
+    the processes it watches: nothing else may wait for them (see reap_process).
+    """
+    
+    def __init__(self):
+        self.use_threads = sys.platform == 'win32'
+        self._lock = threading.Lock()
+        self._new = []  # Processes waiting to be registered by the engine thread
+        self._closed = []  # Processes whose output is closed, waiting to be reaped
+        self._thread = None
+        if not self.use_threads:
+            self._selector = selectors.DefaultSelector()
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+    
+    def watch(self, process, on_output, on_exit):
+        """Follow a process started with stdout=PIPE until it exits"""
+        watched = WatchedProcess(process, on_output, on_exit)
+        if self.use_threads:
+            threading.Thread(target=self._read_in_thread, args=(watched,), daemon=True).start()
+            return
+        
+        with self._lock:
+            self._new.append(watched)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+        os.write(self._wakeup_w, b'\0')
+    
+    def _read_in_thread(self, watched):
+        """Fallback reader: block on a single process pipe (one thread per process)"""
+        fd = watched.process.stdout.fileno()
+        while True:
+            data = os.read(fd, OUTPUT_READ_CHUNK_SIZE)
+            watched.feed(data)
+            if not data:
+                break
+        watched.process.stdout.close()
+        watched.on_exit(watched.process.wait(), None)
+    
+    def _loop(self):
+        """Engine thread: multiplex all pipes, then reap processes whose output is closed"""
+        while True:
+            timeout = REAP_POLL_INTERVAL if self._closed else None
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    os.read(self._wakeup_r, 4096)
+                else:
+                    self._read(key.fileobj, key.data)
+            
+            with self._lock:
+                new, self._new = self._new, []
+            for watched in new:
+                self._selector.register(watched.process.stdout, selectors.EVENT_READ, watched)
+            
+            for watched in list(self._closed):
+                result = reap_process(watched.process)
+                if result is not None:
+                    self._closed.remove(watched)
+                    watched.on_exit(*result)
+    
+    def _read(self, pipe, watched):
+        """Read the available output of a process"""
+        try:
+            data = os.read(pipe.fileno(), OUTPUT_READ_CHUNK_SIZE)
+        except OSError:
+            data = b''
+        watched.feed(data)
+        if not data:
+            self._selector.unregister(pipe)
+            pipe.close()
+            self._closed.append(watched)
+
+
+def load_profile_summary(profile_file):
+    """Summary written by PROFILE_BOOTSTRAP next to a raw profile, None if there is none
+    (e.g. the script was killed): {'mode', 'columns', 'kinds', 'info', 'rows'[, 'sort_column']}"""
+    try:
+        with open(profile_file + '.json', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_app_dir():
+    """Directory of the executable (frozen with PyInstaller) or of the scripts, where the settings are stored"""
+    if getattr(sys, 'frozen', False):
+        # Running as compiled executable
+        return os.path.dirname(sys.executable)
+    # Running as script
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+class ScriptLauncher:
+    """Settings, interpreter resolution and script processes, without any user interface"""
+    
+    def __init__(self, app_dir=None):
+        app_dir = app_dir or get_app_dir()
+        self.app_dir = app_dir
+        self.config_file = os.path.join(app_dir, 'EasyPythonLauncher.config.json')
+        self.config = ConfigStore(self.config_file)
+        self.interpreters = InterpreterRegistry(self.config)
+        self.history = RunHistory(os.path.join(app_dir, 'EasyPythonLauncher.history.sqlite3'),
+                                  os.path.join(app_dir, 'EasyPythonLauncher.logs'))
+        self.profiles_dir = os.path.join(app_dir, 'EasyPythonLauncher.profiles')
+        self.warm_pool = WarmInterpreterPool()
+        self.io_engine = ProcessIOEngine()
+        self.load_run_settings()
+    
+    def config_int(self, key, default):
+        """Positive integer setting from config (default if missing or invalid)"""
+        try:
+            return max(1, int(self.config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+    
+    def load_run_settings(self):
+        """Load the script execution and scrollback settings from config"""
+        self.console_max_lines = self.config_int('console_max_lines', CONSOLE_MAX_LINES)
+        self.console_max_bytes = self.config_int('console_max_bytes', CONSOLE_MAX_BYTES)
+        self.unbuffered_output = bool(self.config.get('unbuffered_output', True))
+        self.warm_pool_enabled = bool(self.config.get('warm_pool_enabled', False))
+        self.warm_pool_size = self.config_int('warm_pool_size', WARM_POOL_SIZE)
+        self.warm_pool_preload = [str(name) for name in self.config.get('warm_pool_preload', [])]
+        self.max_concurrent_runs = self.config_int('max_concurrent_runs', os.cpu_count() or 1)
+        self.stop_grace_period = self.config_int('stop_grace_period', STOP_GRACE_PERIOD)
+    
+    def save_python_path(self, python_path):
+        """Save the Python executable path to config"""
+        self.config.set('python_path', python_path)
+    
+    def load_python_path(self):
+        """Load the saved Python executable path from config"""
+        return self.config.get('python_path')
+    
+    def find_python_executable(self, discover=True):
+        """Get the Python executable to run scripts with (even when frozen with PyInstaller), None if not found.
+        
+        With discover False, never blocks: returns None instead of probing all the candidate locations
+        when no interpreter is known yet.
+        """
+        # First, check if we have a saved Python path in config
+        saved_python = self.load_python_path()
+        if saved_python and os.path.exists(saved_python):
+            return saved_python
+        
+        # Check if running as a PyInstaller bundle
+        if getattr(sys, 'frozen', False):
+            # Running as compiled executable - use the interpreters discovered in the background
+            python_exec = self.interpreters.best()
+            if not python_exec and discover:
+                # Nothing known yet (first run): probe all candidate locations now
+                self.interpreters.discover()
+                python_exec = self.interpreters.best()
+        else:
+            # Running as a normal Python script
+            python_exec = sys.executable
+        
+        # Save the found Python path for future use
+        if python_exec:
+            self.save_python_path(python_exec)
+        return python_exec
+    
+    def load_default_limits(self):
+        """Load the resource limits of scripts without limits of their own from config"""
+        return dict(self.config.get('default_limits') or {})
+    
+    def save_default_limits(self, limits):
+        """Save the default resource limits to config"""
+        self.config.set('default_limits', limits)
+    
+    def load_script_settings(self, script_path):
+        """Load the run options of a script (priority, nice, cpu_affinity, resource limits) from config"""
+        return dict((self.config.get('script_settings') or {}).get(script_path, {}))
+    
+    def save_script_settings(self, script_path, settings):
+        """Save the run options of a script to config"""
+        all_settings = dict(self.config.get('script_settings') or {})
+        if settings:
+            all_settings[script_path] = settings
+        else:
+            all_settings.pop(script_path, None)
+        self.config.set('script_settings', all_settings)
+    
+    def new_run(self, script_path):
+        """Create the ScriptRun of a script with its saved run options"""
+        run = ScriptRun(script_path, self.console_max_lines, self.console_max_bytes)
+        settings = self.load_script_settings(script_path)
+        run.priority = settings.get('priority', 0)
+        run.nice = settings.get('nice', 0)
+        run.cpu_affinity = settings.get('cpu_affinity')
+        default_limits = self.load_default_limits()
+        for key in RESOURCE_LIMIT_KEYS:
+            # A script's own 0 means no limit, a missing one the default limit
+            setattr(run, key, (settings[key] if key in settings else default_limits.get(key)) or None)
+        return run
+    
+    def start_process(self, run, python_exec):
+        """Start the process of a run (raw binary stdout pipe, stderr merged into it).
+        
+        Returns a warning if the resource limits are not supported on this system, else None
+        (priority and CPU affinity errors are reported in the script's output).
+        """
+        run.interpreter = python_exec
+        script_dir = os.path.dirname(run.script_path)
+        warning = None
+        if run.has_rlimits() and resource is None:
+            warning = "Memory, CPU time and open files limits are not supported on this system"
+        
+        # Use a pre-started interpreter if available (priority, CPU affinity and limits are set
+        # before the script starts, by a cold start, and profilers wrap the script)
+        launch_settings = make_launch_settings(run)
+        if (self.warm_pool_enabled and not windows_priority_flags(run.nice) and not launch_settings
+                and not run.profile_mode):
+            self.warm_pool.configure(python_exec, self.unbuffered_output, self.warm_pool_preload,
+                                     self.warm_pool_size)
+            run.process = self.warm_pool.take(run.script_path, script_dir)
+        
+        # Otherwise start the process
+        if run.process is None:
+            options, env = make_script_environment(self.unbuffered_output)
+            command = [run.script_path]
+            if run.profile_mode:
+                run.profile_file = self.new_profile_path(run)
+                command = ['-c', PROFILE_BOOTSTRAP, run.profile_mode, run.profile_file, str(PROFILE_MAX_ROWS),
+                           str(PROFILE_SAMPLING_INTERVAL), run.script_path]
+            command = [python_exec] + options + command
+            if launch_settings:
+                command = [python_exec, '-I', '-S', '-c', LAUNCH_BOOTSTRAP, json.dumps(launch_settings)] + command
+            run.process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=script_dir,
+                env=env,
+                start_new_session=START_NEW_SESSION,
+                creationflags=windows_priority_flags(run.nice) | NEW_PROCESS_GROUP_FLAGS
+            )
+            track_process_tree(run.process)
+        return warning
+    
+    def new_profile_path(self, run):
+        """Create the raw profile file of a profiled run: <profiles folder>/<script>-<date>-<mode>-<unique>.<ext>
+        (same-named scripts may be profiled in the same second)"""
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(run.script_path))[0]
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(run.started_at))
+        fd, path = tempfile.mkstemp(prefix=f"{name}-{stamp}-{run.profile_mode}-",
+                                    suffix=PROFILE_EXTENSIONS[run.profile_mode], dir=self.profiles_dir)
+        os.close(fd)
+        return path
+    
+    def refill_warm_pool(self):
+        """Restart the warm interpreters with the current settings (in the background)"""
+        if not self.warm_pool_enabled:
+            self.warm_pool.shutdown()
+            return
+        
+        # Only use an already known interpreter here, never ask for one
+        python_exec = self.load_python_path()
+        if not python_exec and not getattr(sys, 'frozen', False):
+            python_exec = sys.executable
+        if python_exec and os.path.exists(python_exec):
+            self.warm_pool.configure(python_exec, self.unbuffered_output, self.warm_pool_preload,
+                                     self.warm_pool_size)
+    
+    def close(self):
+        """Write pending setting changes, close the run logs and stop the idle warm interpreters"""
+        self.config.flush()
+        self.history.close()
+        self.warm_pool.shutdown()
@@ -0,0 +1,265 @@
+"""Headless mode: run scripts with the launcher's settings, without any window.
+
+Usage: python EasyPythonLauncher.py --headless script.py [script.py ...] [options]
+
+Uses the same configuration, interpreter and run history as the graphical launcher, but
+never imports tkinter, so it starts in milliseconds and works on servers without a display.
+"""
+
+import os
+import sys
+import argparse
+import json
+import queue
+import time
+
+from launcher_core import (
+    ScriptLauncher, first_error_line, signal_process_tree, process_tree_alive, stop_process_trees,
+    PROFILE_MODES,
+)
+
+
+def parse_args(argv):
+    """Parse the command line of the headless mode"""
+    parser = argparse.ArgumentParser(
+        prog='EasyPythonLauncher --headless',
+        description="Run Python scripts without the graphical interface and print a JSON summary.")
+    parser.add_argument('scripts', nargs='+', help="scripts to run")
+    parser.add_argument('--python', help="Python interpreter (default: the one configured in the launcher)")
+    parser.add_argument('-j', '--jobs', type=int,
+                        help="scripts run at once (default: the launcher's Max Concurrent Scripts)")
+    parser.add_argument('--fail-fast', action='store_true', help="don't start more scripts after a failure")
+    parser.add_argument('--log-dir', help="write the output of each script to DIR/<script>.log instead of stdout")
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                        help="run the scripts under a profiler, the raw profiles are listed in the summary")
+    parser.add_argument('--summary', default='-', metavar='FILE',
+                        help="where to write the JSON summary (default: stdout, after the output)")
+    return parser.parse_args(argv)
+
+
+class HeadlessRunner:
+    """Runs scripts through a ScriptLauncher, streaming their output to stdout or log files"""
+    
+    def __init__(self, launcher, python_exec, jobs, fail_fast=False, log_dir=None, profile_mode=None):
+        self.launcher = launcher
+        self.python_exec = python_exec
+        self.jobs = max(1, jobs)
+        self.fail_fast = fail_fast
+        self.log_dir = log_dir
+        self.profile_mode = profile_mode
+        self.events = queue.SimpleQueue()  # (run, text) from the I/O engine, text None once finished
+        self._outputs = {}  # Dictionary: {run: log file or None for stdout}
+        self._partial = {}  # Dictionary: {run: incomplete last line} when prefixing stdout lines
+        self._prefix = False
+        self._deadlines = []  # [(time, run, 'timeout' or 'kill')] for runs with a timeout
+    
+    def run(self, script_paths):
+        """Run the scripts, return their ScriptRuns (never started ones have no start_time)"""
+        runs = [self.launcher.new_run(os.path.abspath(path)) for path in script_paths]
+        for run in runs:
+            run.profile_mode = self.profile_mode
+        pending = list(runs)
+        running = 0
+        failed = False
+        self._prefix = self.log_dir is None and len(runs) > 1
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+            for run, name in zip(runs, unique_log_names(script_paths)):
+                run.log_file = os.path.abspath(os.path.join(self.log_dir, name))
+        
+        try:
+            while pending or running:
+                while pending and running < self.jobs and not (failed and self.fail_fast):
+                    self._start(pending.pop(0))
+                    running += 1
+                if not running:
+                    break
+                
+                run, text = self._next_event()
+                if text is not None:
+                    self._write(run, text)
+                    continue
+                running -= 1
+                self._finish(run)
+                failed = failed or run.return_code != 0
+        except KeyboardInterrupt:
+            # Scripts run in their own process group, so Ctrl+C doesn't reach them
+            stop_process_trees([run.process for run in runs if run.status == 'running' and run.process is not None],
+                               self.launcher.stop_grace_period)
+            raise
+        return runs
+    
+    def _next_event(self):
+        """Wait for the next output or exit, stopping the runs past their timeout meanwhile"""
+        while True:
+            timeout = None
+            if self._deadlines:
+                timeout = max(0, min(deadline for deadline, _, _ in self._deadlines) - time.monotonic())
+            try:
+                return self.events.get(timeout=timeout)
+            except queue.Empty:
+                self._check_deadlines()
+    
+    def _check_deadlines(self):
+        """Stop the runs past their timeout, kill the ones still running after the grace period"""
+        now = time.monotonic()
+        expired = [entry for entry in self._deadlines if entry[0] <= now]
+        self._deadlines = [entry for entry in self._deadlines if entry[0] > now]
+        for _, run, action in expired:
+            if run.status != 'running' and action == 'timeout':
+                continue
+            if action == 'timeout':
+                run.limit_exceeded = f"killed: exceeded the {run.timeout} s timeout"
+                self._write(run, f"\n⚠ Timeout: still running after {run.timeout} s, stopping\n")
+                signal_process_tree(run.process)
+                self._deadlines.append((now + self.launcher.stop_grace_period, run, 'kill'))
+            elif process_tree_alive(run.process):
+                signal_process_tree(run.process, force=True)
+    
+    def _start(self, run):
+        """Start a run, its output and exit are reported through self.events"""
+        run.status = 'running'
+        run.start_time = time.monotonic()
+        run.started_at = time.time()
+        if run.log_file:
+            self._outputs[run] = open(run.log_file, 'w', encoding='utf-8')
+        self.launcher.history.start(run)
+        
+        try:
+            warning = self.launcher.start_process(run, self.python_exec)
+            if warning:
+                self._write(run, f"⚠ {warning}\n")
+        except Exception as e:
+            self._write(run, f"Error: {e}\n")
+            self._on_exit(run, None)
+            return
+        self.launcher.io_engine.watch(run.process,
+                                      lambda text: self.events.put((run, text)),
+                                      lambda return_code, usage: self._on_exit(run, return_code, usage))
+        if run.timeout:
+            self._deadlines.append((time.monotonic() + run.timeout, run, 'timeout'))
+    
+    def _on_exit(self, run, return_code, usage=None):
+        """Record the end of a run (called from the I/O engine)"""
+        run.return_code = return_code
+        run.status = 'finished'
+        run.end_time = time.monotonic()
+        run.record_usage(usage)
+        self.events.put((run, None))
+    
+    def _write(self, run, text):
+        """Send output to the run's log file or to stdout (prefixed by the script name if several run)"""
+        run.output.append(text)
+        self.launcher.history.write(run, text)
+        log = self._outputs.get(run)
+        if log is not None:
+            log.write(text)
+            return
+        if self._prefix:
+            text = self._partial.pop(run, '') + text
+            lines = text.split('\n')
+            if lines[-1]:
+                self._partial[run] = lines[-1]
+            prefix = f"[{os.path.basename(run.script_path)}] "
+            text = ''.join(prefix + line + '\n' for line in lines[:-1])
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    def _finish(self, run):
+        """Flush and close the output of a finished run and record it in the history"""
+        if run in self._partial:
+            self._write(run, '\n')
+        run.check_limits()
+        if run.limit_exceeded:
+            self._write(run, f"⚠ {run.limit_exceeded}\n")
+        log = self._outputs.pop(run, None)
+        if log is not None:
+            log.close()
+        self.launcher.history.finish(run)
+
+
+def unique_log_names(script_paths):
+    """Log file name of each script: <script>.log, or <script>-2.log, -3... for scripts sharing a name"""
+    names = []
+    used = set()
+    for path in script_paths:
+        base = os.path.splitext(os.path.basename(path))[0]
+        name = base
+        number = 1
+        while name.lower() in used:  # Case-insensitive file systems
+            number += 1
+            name = f"{base}-{number}"
+        used.add(name.lower())
+        names.append(f"{name}.log")
+    return names
+
+
+def run_summary(runs):
+    """JSON-friendly description of the runs"""
+    entries = []
+    for run in runs:
+        if run.start_time is None:
+            status = 'skipped'
+        elif run.return_code is None:
+            status = 'error'
+        else:
+            status = 'success' if run.return_code == 0 else 'failed'
+        entry = {
+            'script': run.script_path,
+            'status': status,
+            'exit_code': run.return_code,
+            'wall_time': run.wall_time,
+            'cpu_user': run.cpu_user,
+            'cpu_system': run.cpu_system,
+            'peak_rss': run.peak_rss,
+            'error': first_error_line(run.output.get_text()) if status in ('failed', 'error') else None,
+            'limit_exceeded': run.limit_exceeded,
+        }
+        if run.log_file and run.start_time is not None:
+            entry['log_file'] = run.log_file
+        if run.profile_file:
+            entry['profile_file'] = run.profile_file
+        entries.append(entry)
+    return entries
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    launcher = ScriptLauncher()
+    launcher.warm_pool_enabled = False  # One-off runs: starting the pool would cost more than it saves
+    try:
+        python_exec = args.python or launcher.find_python_executable()
+        if not python_exec or not os.path.exists(python_exec):
+            print("Python interpreter not found: set it with --python or in the launcher's settings",
+                  file=sys.stderr)
+            return 2
+        
+        start = time.monotonic()
+        runner = HeadlessRunner(launcher, python_exec, args.jobs or launcher.max_concurrent_runs,
+                                args.fail_fast, args.log_dir, args.profile)
+        runs = runner.run(args.scripts)
+        entries = run_summary(runs)
+        summary = {
+            'python': python_exec,
+            'total_time': time.monotonic() - start,
+            'succeeded': sum(entry['status'] == 'success' for entry in entries),
+            'failed': sum(entry['status'] in ('failed', 'error') for entry in entries),
+            'skipped': sum(entry['status'] == 'skipped' for entry in entries),
+            'runs': entries,
+        }
+        
+        if args.summary == '-':
+            json.dump(summary, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        else:
+            with open(args.summary, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+        return 0 if summary['succeeded'] == len(entries) else 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        launcher.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""Helpers shared by the tests"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from launcher_core import ScriptRun
+
+
+def finished_run(return_code, output='', script_path='script.py', **attributes):
+    """A run whose process has exited with return_code after printing output, with any other run
+    attributes set (e.g. stopped, limit_exceeded, memory_limit_mb)"""
+    run = ScriptRun(script_path)
+    run.start_time, run.end_time = 10.0, 12.5
+    run.status = 'finished'
+    run.return_code = return_code
+    run.output.append(output)
+    for name, value in attributes.items():
+        setattr(run, name, value)
+    return run
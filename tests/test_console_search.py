@@ -0,0 +1,67 @@
+"""Tests of the console search bar matching (ConsoleSearch)"""
+
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EasyPythonLauncher import ConsoleSearch
+
+
+class ConsoleSearchTest(unittest.TestCase):
+    
+    def test_matching_lines_as_output_arrives(self):
+        search = ConsoleSearch('error')
+        for chunk in ('ok\nError one, ', 'error two\nfine\nlast err', 'or\n'):
+            search.scan(chunk)
+        self.assertEqual(list(search.matches), [1, 3])
+        self.assertEqual(search.line, 4)
+        self.assertEqual(search.partial, '')
+    
+    def test_incomplete_line_waits(self):
+        search = ConsoleSearch('done')
+        search.scan('working... do')
+        self.assertEqual(list(search.matches), [])
+        search.scan('ne\n')
+        self.assertEqual(list(search.matches), [0])
+    
+    def test_regex_and_case(self):
+        search = ConsoleSearch(r'^\d+ items$', regex=True)
+        search.scan('3 items\nabout 4 items\n12 items\n')
+        self.assertEqual(list(search.matches), [0, 2])
+        
+        search = ConsoleSearch('Error', match_case=True)
+        search.scan('error\nError\n')
+        self.assertEqual(list(search.matches), [1])
+        
+        with self.assertRaises(re.error):
+            ConsoleSearch('(', regex=True)
+    
+    def test_refine_checks_previous_matches_only(self):
+        lines = ['warn: disk', 'warn: network', 'info', 'warn: disk full']
+        previous = ConsoleSearch('warn')
+        previous.scan('\n'.join(lines) + '\n')
+        
+        search = ConsoleSearch('warn: disk')
+        self.assertTrue(previous.is_refined_by(search))
+        checked = []
+        
+        def get_line(line):
+            checked.append(line)
+            return lines[line]
+        
+        search.refine(previous, get_line)
+        self.assertEqual(list(search.matches), [0, 3])
+        self.assertEqual(checked, [0, 1, 3])
+        self.assertEqual(search.line, 4)
+    
+    def test_not_refined_by(self):
+        self.assertFalse(ConsoleSearch('warn').is_refined_by(ConsoleSearch('error')))
+        self.assertFalse(ConsoleSearch('warn').is_refined_by(ConsoleSearch('warn.*', regex=True)))
+        self.assertFalse(ConsoleSearch('warn').is_refined_by(ConsoleSearch('warning', match_case=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,569 @@
+"""Tests of the tkinter-free launcher core (launcher_core.py)"""
+
+import json
+import os
+import sys
+import subprocess
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import launcher_core
+from launcher_core import (ScriptLauncher, RunHistory, OutputBuffer, PROFILE_BOOTSTRAP, load_profile_summary,
+                           reap_process, ProcessIOEngine, WarmInterpreterPool, FolderWatcher, utf8_size, split_utf8,
+                           ConfigStore, DirectoryCache, ScriptIndex, python_files_signature, first_error_line)
+from helpers import finished_run
+
+
+class OutputBufferTest(unittest.TestCase):
+    
+    def test_lines_end_with_newline_only(self):
+        buffer = OutputBuffer()
+        buffer.append('form\x0cfeed\u2028sep\x85\rprogress\r\n')
+        buffer.append('next')
+        self.assertEqual(list(buffer.lines), ['form\x0cfeed\u2028sep\x85\rprogress\r\n', 'next'])
+    
+    def test_partial_line_continues(self):
+        buffer = OutputBuffer()
+        for chunk in ('ab', 'c\nd', 'e\n'):
+            buffer.append(chunk)
+        self.assertEqual(list(buffer.lines), ['abc\n', 'de\n'])
+        self.assertEqual(buffer.size, 7)
+    
+    def test_line_limit_evicts_oldest(self):
+        buffer = OutputBuffer(max_lines=3)
+        for n in range(5):
+            buffer.append(f'line {n}\n')
+        self.assertEqual(buffer.get_text(), 'line 2\nline 3\nline 4\n')
+        self.assertEqual(buffer.evicted_lines, 2)
+        
+        # A chunk with more lines than kept
+        buffer.append(''.join(f'chunk {n}\n' for n in range(10)))
+        self.assertEqual(buffer.get_text(), 'chunk 7\nchunk 8\nchunk 9\n')
+        self.assertEqual(buffer.evicted_lines, 12)
+    
+    def test_size_limit(self):
+        buffer = OutputBuffer(max_bytes=10)
+        buffer.append('12345\n')
+        buffer.append('6789\n')
+        buffer.append('abc\n')
+        self.assertEqual(buffer.get_text(), '6789\nabc\n')
+        self.assertEqual(buffer.evicted_lines, 1)
+        
+        # A chunk larger than the budget skips to its last lines, a huge line keeps its tail
+        buffer.append('x' * 30 + '\nlast\n')
+        self.assertEqual(buffer.get_text(), 'last\n')
+        self.assertEqual(buffer.evicted_lines, 4)
+        buffer.append('y' * 30)
+        self.assertEqual(buffer.get_text(), 'y' * 10)
+
+
+class SplitUtf8Test(unittest.TestCase):
+    
+    def test_size_in_bytes(self):
+        self.assertEqual(utf8_size('abc'), 3)
+        self.assertEqual(utf8_size('é€'), 5)
+    
+    def test_split_between_characters(self):
+        self.assertEqual(split_utf8('abcdef', 4), ('abcd', 4, 'ef'))
+        self.assertEqual(split_utf8('aé€b', 4), ('aé', 3, '€b'))
+        self.assertEqual(split_utf8('aé€b', 6), ('aé€', 6, 'b'))
+    
+    def test_first_character_always_taken(self):
+        self.assertEqual(split_utf8('€€', 2), ('€', 3, '€'))
+        self.assertEqual(split_utf8('€', 0), ('€', 3, ''))
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Gives each test a temporary folder"""
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+    
+    def touch(self, relative_path, content=''):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+class ConfigStoreTest(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.config_file = os.path.join(self.root, 'config.json')
+    
+    def saved(self):
+        with open(self.config_file) as f:
+            return json.load(f)
+    
+    def test_burst_of_changes_is_saved_once(self):
+        store = ConfigStore(self.config_file, save_delay=0.2)
+        with mock.patch('launcher_core.os.replace', wraps=os.replace) as replace:
+            for n in range(10):
+                store.set('count', n)
+            time.sleep(0.5)
+        self.assertEqual(replace.call_count, 1)
+        self.assertEqual(self.saved(), {'count': 9})
+        self.assertEqual(ConfigStore(self.config_file).get('count'), 9)
+    
+    def test_flush_replaces_the_file(self):
+        with open(self.config_file, 'w') as f:
+            json.dump({'kept': True, 'changed': 1}, f)
+        store = ConfigStore(self.config_file, save_delay=60)
+        store.set('changed', 2)
+        store.set('kept', True)  # Unchanged
+        store.flush()
+        self.assertEqual(self.saved(), {'kept': True, 'changed': 2})
+        self.assertEqual(os.listdir(self.root), ['config.json'])  # No temporary file left
+    
+    def test_unreadable_file_gives_defaults(self):
+        with open(self.config_file, 'w') as f:
+            f.write('{truncated')
+        with mock.patch('builtins.print'):
+            store = ConfigStore(self.config_file)
+        self.assertEqual(store.get('missing', 'default'), 'default')
+
+
+class DirectoryCacheTest(TempDirTestCase):
+    
+    def test_listing_revalidated_by_folder_mtime(self):
+        self.touch('a.py')
+        os.mkdir(os.path.join(self.root, 'sub'))
+        cache = DirectoryCache()
+        listing = cache.get(self.root)
+        self.assertEqual([name for name, _ in listing.subdirs], ['sub'])
+        self.assertIs(cache.get(self.root), listing)
+        
+        self.touch('b.py')
+        os.utime(self.root, ns=(0, os.stat(self.root).st_mtime_ns + 10 ** 9))
+        self.assertIsNot(cache.get(self.root), listing)
+    
+    def test_least_recently_used_evicted(self):
+        folders = [os.path.join(self.root, name) for name in ('a', 'b', 'c')]
+        for folder in folders:
+            os.mkdir(folder)
+        cache = DirectoryCache(max_size=2)
+        first = cache.get(folders[0])
+        cache.get(folders[1])
+        cache.get(folders[0])
+        cache.get(folders[2])  # Evicts b
+        self.assertIs(cache.get(folders[0]), first)
+        self.assertEqual(list(cache._listings), [folders[2], folders[0]])
+    
+    def test_cached_listing_never_lists(self):
+        cache = DirectoryCache()
+        self.assertIsNone(cache.get_cached(self.root))
+        listing = cache.get(self.root)
+        with mock.patch('launcher_core.scan_directory') as scan:
+            self.assertIs(cache.get_cached(self.root), listing)
+            os.utime(self.root, ns=(0, os.stat(self.root).st_mtime_ns + 10 ** 9))
+            self.assertIsNone(cache.get_cached(self.root))
+            self.assertIsNone(cache.get_cached(os.path.join(self.root, 'missing')))
+        scan.assert_not_called()
+    
+    def test_invalidate(self):
+        cache = DirectoryCache()
+        listing = cache.get(self.root)
+        cache.invalidate(self.root)
+        self.assertIsNot(cache.get(self.root), listing)
+    
+    def test_missing_folder(self):
+        with self.assertRaises(OSError):
+            DirectoryCache().get(os.path.join(self.root, 'missing'))
+
+
+class PythonFilesSignatureTest(TempDirTestCase):
+    
+    def test_changes_with_python_files_only(self):
+        script = self.touch('a.py', 'x = 1\n')
+        self.touch('notes.txt')
+        signature = python_files_signature(self.root)
+        self.assertEqual([name for name, _, _ in signature], ['a.py'])
+        
+        self.touch('notes.txt', 'more')
+        self.assertEqual(python_files_signature(self.root), signature)
+        
+        with open(script, 'a') as f:
+            f.write('y = 2\n')
+        self.assertNotEqual(python_files_signature(self.root), signature)
+
+
+class ScriptIndexTest(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        for path in ('tools/build.py', 'tools/rebuild_all.py', 'app/main.py', 'app/b_u_i_l_d.py',
+                     'app/__pycache__/build.py', 'app/.hidden/build.py', 'app/readme.txt'):
+            self.touch(os.path.join('scripts', path))
+        self.index = ScriptIndex(os.path.join(self.root, 'index.json'))
+        self.index.update([os.path.join(self.root, 'scripts')])
+    
+    def names(self, query, **options):
+        return [os.path.basename(path) for path in self.index.search(query, **options)]
+    
+    def test_prefix_then_substring_then_fuzzy(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.names('BUILD'), ['build.py', 'rebuild_all.py', 'b_u_i_l_d.py'])
+        self.assertEqual(self.names('build', limit=2), ['build.py', 'rebuild_all.py'])
+        self.assertEqual(self.names('  '), [])
+        self.assertEqual(self.names('zzz'), [])
+    
+    def test_update_rescans_changed_folders_only(self):
+        self.assertEqual(self.index.update([os.path.join(self.root, 'scripts')]), 0)
+        self.touch('scripts/app/new.py')
+        os.utime(os.path.join(self.root, 'scripts', 'app'), ns=(0, 10 ** 9))
+        self.assertEqual(self.index.update([os.path.join(self.root, 'scripts')]), 1)
+        self.assertEqual(self.names('new'), ['new.py'])
+    
+    def test_saved_between_sessions(self):
+        self.index.save()
+        index = ScriptIndex(self.index.index_file)
+        index.load()
+        self.assertEqual(index.search('main'), self.index.search('main'))
+    
+    def test_overlapping_saves(self):
+        roots = [os.path.join(self.root, 'scripts')]
+        threads = [threading.Thread(target=self.index.save) for _ in range(8)]
+        threads += [threading.Thread(target=self.index.update, args=(roots,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        index = ScriptIndex(self.index.index_file)
+        index.load()
+        self.assertEqual(len(index), 4)
+        self.assertEqual(sorted(os.listdir(self.root)), ['index.json', 'scripts'])  # No temporary file left
+
+
+class FirstErrorLineTest(unittest.TestCase):
+    
+    def test_exception_line(self):
+        output = ('starting\nTraceback (most recent call last):\n  File "x.py", line 1, in <module>\n'
+                  'ValueError: invalid literal\n')
+        self.assertEqual(first_error_line(output), 'ValueError: invalid literal')
+    
+    def test_last_line_otherwise(self):
+        self.assertEqual(first_error_line('one\ntwo\n\n=== Finished ===\n'), 'two')
+        self.assertEqual(first_error_line(''), '')
+
+
+class CheckLimitsTest(unittest.TestCase):
+    
+    def limit_exceeded(self, return_code, output='', **limits):
+        run = finished_run(return_code, output, **limits)
+        run.check_limits()
+        return run.limit_exceeded
+    
+    @unittest.skipUnless(hasattr(signal, 'SIGXCPU'), "SIGXCPU is POSIX only")
+    def test_cpu_time(self):
+        self.assertEqual(self.limit_exceeded(-signal.SIGXCPU, cpu_time_limit=2), "killed: exceeded 2 s of CPU time")
+        self.assertEqual(self.limit_exceeded(-signal.SIGKILL, cpu_time_limit=2, cpu_user=1.5, cpu_system=0.5),
+                         "killed: exceeded 2 s of CPU time")
+        self.assertIsNone(self.limit_exceeded(-signal.SIGKILL, cpu_time_limit=2, cpu_user=0.1, cpu_system=0.1))
+    
+    def test_memory_and_open_files(self):
+        self.assertEqual(self.limit_exceeded(1, 'MemoryError\n', memory_limit_mb=512),
+                         "stopped: exceeded 512.0 MB of memory")
+        self.assertEqual(self.limit_exceeded(1, "OSError: [Errno 24] Too many open files\n", open_files_limit=64),
+                         "failed: exceeded 64 open files")
+        self.assertIsNone(self.limit_exceeded(1, 'MemoryError\n'))  # No limit set
+        self.assertIsNone(self.limit_exceeded(0, 'MemoryError\n', memory_limit_mb=512))
+    
+    def test_timeout_kept(self):
+        self.assertEqual(self.limit_exceeded(-15, limit_exceeded="killed: exceeded the 5 s timeout", cpu_time_limit=1),
+                         "killed: exceeded the 5 s timeout")
+
+
+class LauncherTestCase(unittest.TestCase):
+    """Gives each test a launcher with its own application folder"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        app_dir = os.path.join(self.temp_dir.name, 'app')
+        os.makedirs(app_dir)
+        self.launcher = ScriptLauncher(app_dir)
+        self.launcher.warm_pool_enabled = False
+        self.addCleanup(self.launcher.close)
+    
+    def make_script(self, relative_path, code):
+        path = os.path.join(self.temp_dir.name, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return path
+    
+    def run_script(self, code, **options):
+        """Run a script with some run options, return its finished ScriptRun"""
+        run = self.launcher.new_run(self.make_script('script.py', code))
+        for name, value in options.items():
+            setattr(run, name, value)
+        warning = self.launcher.start_process(run, sys.executable)
+        self.assertIsNone(warning)
+        output, _ = run.process.communicate(timeout=30)
+        run.output.append(output.decode('utf-8', errors='replace'))
+        run.return_code = run.process.returncode
+        run.check_limits()
+        return run
+
+
+
+class WarmInterpreterPoolTest(unittest.TestCase):
+    
+    def test_failed_preload_is_reported_in_the_script_output(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, True)
+        script = os.path.join(folder, 'script.py')
+        with open(script, 'w') as f:
+            f.write("import sys\nprint('json' in sys.modules)\n")
+        
+        pool = WarmInterpreterPool()
+        self.addCleanup(pool.shutdown)
+        pool.configure(sys.executable, True, ['json', 'no_such_module'], 1)
+        deadline = time.monotonic() + 10
+        process = pool.take(script, folder)
+        while process is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            process = pool.take(script, folder)
+        self.assertIsNotNone(process)
+        
+        output = process.stdout.read().decode()
+        process.stdout.close()
+        self.assertEqual(process.wait(), 0)
+        self.assertIn("Could not preload module no_such_module: ModuleNotFoundError", output)
+        self.assertTrue(output.endswith('True\n'))
+
+
+class RunSettingsTest(LauncherTestCase):
+    
+    def test_script_limits_override_the_default_ones(self):
+        self.launcher.save_default_limits({'timeout': 60, 'memory_limit_mb': 512})
+        script = os.path.join(self.temp_dir.name, 'server.py')
+        run = self.launcher.new_run(script)
+        self.assertEqual((run.timeout, run.memory_limit_mb, run.cpu_time_limit), (60, 512, None))
+        
+        # 0: no limit for this script, missing: the default one
+        self.launcher.save_script_settings(script, {'timeout': 0, 'cpu_time_limit': 5})
+        run = self.launcher.new_run(script)
+        self.assertEqual((run.timeout, run.memory_limit_mb, run.cpu_time_limit), (None, 512, 5))
+        self.assertTrue(run.has_rlimits())
+
+
+@unittest.skipIf(sys.platform == 'win32', "priority classes are set by the creation flags on Windows")
+class PriorityTest(LauncherTestCase):
+    
+    CHILD_PRIORITY = ("import os, subprocess, sys\n"
+                      "print(os.getpriority(os.PRIO_PROCESS, 0))\n"
+                      "subprocess.run([sys.executable, '-c', 'import os; print(os.getpriority(os.PRIO_PROCESS, 0))'])\n")
+    
+    def test_nice_applies_to_the_script_and_its_children(self):
+        base = os.getpriority(os.PRIO_PROCESS, 0)
+        run = self.run_script(self.CHILD_PRIORITY, nice=5)
+        self.assertEqual(run.output.get_text().split(), [str(min(base + 5, 19))] * 2)
+    
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "CPU affinity is Linux only")
+    def test_cpu_affinity(self):
+        cpu = min(os.sched_getaffinity(0))
+        run = self.run_script("import os\nprint(sorted(os.sched_getaffinity(0)))\n", cpu_affinity=[cpu])
+        self.assertEqual(run.output.get_text().strip(), f"[{cpu}]")
+
+
+@unittest.skipIf(resource is None, "resource limits are POSIX only")
+class ResourceLimitsTest(LauncherTestCase):
+    
+    def test_memory_limit(self):
+        run = self.run_script("data = bytearray(512 * 1024 * 1024)\n", memory_limit_mb=256)
+        self.assertEqual(run.return_code, 1)
+        self.assertEqual(run.limit_exceeded, "stopped: exceeded 256.0 MB of memory")
+    
+    def test_open_files_limit(self):
+        run = self.run_script("files = [open(__file__) for _ in range(100)]\n", open_files_limit=20)
+        self.assertEqual(run.limit_exceeded, "failed: exceeded 20 open files")
+    
+    def test_cpu_time_limit(self):
+        run = self.run_script("while True:\n    pass\n", cpu_time_limit=1)
+        self.assertEqual(run.limit_exceeded, "killed: exceeded 1 s of CPU time")
+    
+    def test_limits_apply_to_the_script_process_itself(self):
+        code = "import os, resource\nprint(os.getpid(), resource.getrlimit(resource.RLIMIT_NOFILE)[0])\n"
+        run = self.run_script(code, open_files_limit=50)
+        self.assertEqual(run.output.get_text().split(), [str(run.process.pid), '50'])
+        self.assertIsNone(run.limit_exceeded)
+
+
+class RunHistoryTest(LauncherTestCase):
+    
+    def recorded_run(self, return_code, output='', **attributes):
+        """A finished run recorded in the history, its output written to its log"""
+        run = finished_run(return_code, output, os.path.join(self.temp_dir.name, 'script.py'), **attributes)
+        run.started_at = 1700000000
+        self.launcher.history.start(run)
+        for line in output.splitlines(True):
+            self.launcher.history.write(run, line)
+        self.launcher.history.finish(run)
+        return run
+    
+    def status(self, run):
+        rows = self.launcher.history.query()
+        return {row[0]: row[4] for row in rows}[run.history_id]
+    
+    def test_log(self):
+        run = self.recorded_run(0, ''.join(f'line {n}\n' for n in range(1000)))
+        self.launcher.history.wait_for_logs()
+        text, truncated = RunHistory.read_log(self.launcher.history.log_file(run.history_id))
+        self.assertFalse(truncated)
+        self.assertEqual(text.count('\n'), 1000)
+        self.assertTrue(text.endswith('line 999\n'))
+        
+        text, truncated = RunHistory.read_log(self.launcher.history.log_file(run.history_id), max_chars=9)
+        self.assertEqual((text, truncated), ('line 999\n', True))
+    
+    def test_statuses(self):
+        self.assertEqual(self.status(self.recorded_run(0)), 'success')
+        self.assertEqual(self.status(self.recorded_run(1)), 'failed')
+        self.assertEqual(self.status(self.recorded_run(None)), 'error')
+        self.assertEqual(self.status(self.recorded_run(-15, stopped=True)), 'interrupted')
+        self.assertEqual(self.status(self.recorded_run(-15, stopped=True, limit_exceeded="killed: timeout")), 'failed')
+
+
+@unittest.skipUnless(hasattr(os, 'wait4'), "os.wait4 is POSIX only")
+class ReapProcessTest(unittest.TestCase):
+    
+    def start(self, code):
+        return subprocess.Popen([sys.executable, '-c', code])
+    
+    def reap(self, process):
+        result = reap_process(process)
+        while result is None:
+            time.sleep(0.001)
+            result = reap_process(process)
+        return result
+    
+    def test_exit_status_and_usage(self):
+        process = self.start('raise SystemExit(3)')
+        result = self.reap(process)
+        self.assertEqual(result[0], 3)
+        self.assertIsNotNone(result[1])
+        self.assertEqual(process.poll(), 3)
+    
+    def test_engine_reports_exit_status_and_usage(self):
+        engine = ProcessIOEngine()
+        process = subprocess.Popen([sys.executable, '-c', 'print("out"); raise SystemExit(5)'],
+                                   stdout=subprocess.PIPE)
+        output = []
+        exits = []
+        exited = threading.Event()
+        
+        def on_exit(return_code, usage):
+            exits.append((return_code, usage))
+            exited.set()
+        
+        engine.watch(process, output.append, on_exit)
+        self.assertTrue(exited.wait(10))
+        self.assertEqual(''.join(output), 'out\n')
+        self.assertEqual(exits[0][0], 5)
+        self.assertIsNotNone(exits[0][1])
+        self.assertEqual(process.returncode, 5)
+
+
+@mock.patch.multiple(launcher_core, WATCH_DEBOUNCE=0.05, WATCH_MAX_DELAY=0.5, WATCH_POLL_INTERVAL=0.1)
+class FolderWatcherTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.folder = os.path.join(self.root, 'scripts')
+        os.mkdir(self.folder)
+        self.changes = []
+        self.changed = threading.Event()
+    
+    def on_change(self, folders):
+        self.changes.append(folders)
+        self.changed.set()
+    
+    def start(self, inotify=True):
+        watcher = FolderWatcher(self.on_change)
+        if not inotify:
+            watcher._fd = -1
+        self.addCleanup(watcher.close)
+        watcher.watch([self.folder])
+        return watcher
+    
+    def wait_for_change(self):
+        self.assertTrue(self.changed.wait(5), "no change reported")
+        self.changed.clear()
+        self.assertEqual(self.changes.pop(), {self.folder})
+    
+    def test_change_before_the_first_poll(self):
+        self.start(inotify=False)
+        time.sleep(0.01)  # Make sure the mtime differs
+        open(os.path.join(self.folder, 'new.py'), 'w').close()
+        self.wait_for_change()
+    
+    @unittest.skipUnless(launcher_core.load_inotify(), "inotify is Linux only")
+    def test_recreated_folder_is_still_watched(self):
+        self.start()
+        os.rmdir(self.folder)
+        self.wait_for_change()
+        os.mkdir(self.folder)
+        self.wait_for_change()
+        open(os.path.join(self.folder, 'new.py'), 'w').close()
+        self.wait_for_change()
+
+
+class ProfilePathTest(LauncherTestCase):
+    
+    def test_same_named_scripts_profiled_at_once(self):
+        paths = set()
+        for folder in ('a', 'b'):
+            run = self.launcher.new_run(os.path.join(self.temp_dir.name, folder, 'main.py'))
+            run.started_at = 1700000000
+            run.profile_mode = 'sampling'
+            paths.add(self.launcher.new_profile_path(run))
+        self.assertEqual(len(paths), 2)
+        for path in paths:
+            self.assertTrue(os.path.basename(path).startswith('main-'))
+            self.assertTrue(path.endswith('.folded'))
+
+
+class ProfileBootstrapTest(LauncherTestCase):
+    
+    def profile(self, mode, code, max_rows=3):
+        script = self.make_script('profiled.py', code)
+        profile_file = os.path.join(self.temp_dir.name, 'profile')
+        subprocess.run([sys.executable, '-c', PROFILE_BOOTSTRAP, mode, profile_file, str(max_rows), '0.001', script],
+                       cwd=self.temp_dir.name, check=False, capture_output=True)
+        return load_profile_summary(profile_file)
+    
+    def test_top_rows_by_every_column(self):
+        # main() costs little itself but holds the whole run: it must survive the cut by self time
+        code = "".join(f"def work{n}():\n    return sum(range({n + 1} * 20000))\n" for n in range(10))
+        code += "def main():\n" + "".join(f"    work{n}()\n" for n in range(10)) + "main()\n"
+        summary = self.profile('cpu', code)
+        functions = [row[0] for row in summary['rows']]
+        self.assertTrue(any(function.endswith('(main)') for function in functions))
+        self.assertIn('~:0(<built-in method builtins.sum>)', functions)
+        self.assertLessEqual(len(functions), 3 * 3)
+    
+    def test_error_still_saves_the_profile(self):
+        for mode in ('cpu', 'memory', 'sampling'):
+            summary = self.profile(mode, "data = [bytearray(100) for _ in range(1000)]\nraise ValueError('boom')\n")
+            self.assertEqual(summary['mode'], mode)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests of the headless mode (launcher_headless.py)"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from launcher_core import ScriptLauncher, ScriptRun, load_profile_summary
+from launcher_headless import HeadlessRunner, run_summary, unique_log_names
+from helpers import finished_run
+
+
+class UniqueLogNamesTest(unittest.TestCase):
+    
+    def test_names(self):
+        self.assertEqual(unique_log_names(['/a/main.py', '/b/main.py', '/c/Main.py', '/d/main-2.py', '/e/tool.py']),
+                         ['main.log', 'main-2.log', 'Main-3.log', 'main-2-2.log', 'tool.log'])
+
+
+class RunSummaryTest(unittest.TestCase):
+    
+    def test_statuses(self):
+        runs = [finished_run(0, 'done\n'), finished_run(1, 'KeyError: 3\n'), finished_run(None), ScriptRun('later.py')]
+        summary = run_summary(runs)
+        self.assertEqual([entry['status'] for entry in summary], ['success', 'failed', 'error', 'skipped'])
+        self.assertEqual([entry['error'] for entry in summary], [None, 'KeyError: 3', '', None])
+        self.assertEqual(summary[0]['wall_time'], 2.5)
+        self.assertNotIn('log_file', summary[0])
+    
+    def test_log_file_of_started_runs(self):
+        run, skipped = finished_run(0), ScriptRun('later.py')
+        run.log_file = skipped.log_file = '/logs/main.log'
+        summary = run_summary([run, skipped])
+        self.assertEqual(summary[0]['log_file'], '/logs/main.log')
+        self.assertNotIn('log_file', summary[1])
+
+
+class HeadlessRunnerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        app_dir = os.path.join(self.temp_dir.name, 'app')
+        os.makedirs(app_dir)
+        self.launcher = ScriptLauncher(app_dir)
+        self.launcher.warm_pool_enabled = False
+        self.addCleanup(self.launcher.close)
+    
+    def make_script(self, relative_path, code):
+        path = os.path.join(self.temp_dir.name, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return path
+    
+    def test_same_named_scripts_get_their_own_log(self):
+        scripts = [self.make_script('a/main.py', "print('from a')\n"),
+                   self.make_script('b/main.py', "import sys\nprint('from b')\nsys.exit(3)\n")]
+        log_dir = os.path.join(self.temp_dir.name, 'logs')
+        runs = HeadlessRunner(self.launcher, sys.executable, 2, log_dir=log_dir).run(scripts)
+        entries = run_summary(runs)
+        
+        self.assertEqual([entry['status'] for entry in entries], ['success', 'failed'])
+        self.assertEqual(entries[1]['exit_code'], 3)
+        self.assertNotEqual(entries[0]['log_file'], entries[1]['log_file'])
+        for entry, expected in zip(entries, ('from a', 'from b')):
+            with open(entry['log_file'], encoding='utf-8') as f:
+                self.assertEqual(f.read().strip(), expected)
+    
+    def test_same_named_scripts_get_their_own_profile(self):
+        code = "import time\nend = time.time() + 0.2\nwhile time.time() < end:\n    pass\n"
+        scripts = [self.make_script('a/main.py', code), self.make_script('b/main.py', code)]
+        runs = HeadlessRunner(self.launcher, sys.executable, 2, log_dir=os.path.join(self.temp_dir.name, 'logs'),
+                              profile_mode='sampling').run(scripts)
+        profiles = [entry['profile_file'] for entry in run_summary(runs)]
+        
+        self.assertNotEqual(profiles[0], profiles[1])
+        for profile in profiles:
+            self.assertIsNotNone(load_profile_summary(profile))
+    
+    def test_fail_fast_skips_the_rest(self):
+        scripts = [self.make_script('fail.py', "raise ValueError('boom')\n"),
+                   self.make_script('never.py', "print('never')\n")]
+        log_dir = os.path.join(self.temp_dir.name, 'logs')
+        runs = HeadlessRunner(self.launcher, sys.executable, 1, fail_fast=True, log_dir=log_dir).run(scripts)
+        entries = run_summary(runs)
+        
+        self.assertEqual([entry['status'] for entry in entries], ['failed', 'skipped'])
+        self.assertEqual(entries[0]['error'], "ValueError: boom")
+        self.assertNotIn('log_file', entries[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
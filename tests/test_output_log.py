@@ -0,0 +1,42 @@
+"""Tests of the file-backed console output (OutputLog)"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from launcher_core import OutputLog
+
+
+class OutputLogTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.log = OutputLog()
+        self.addCleanup(self.log.close)
+    
+    def test_empty_log(self):
+        self.assertEqual(self.log.line_count, 1)
+        self.assertEqual(self.log.get_lines(0, 10), '')
+    
+    def test_read_after_each_append(self):
+        self.log.append('')
+        self.assertEqual(self.log.get_lines(0, 10), '')
+        self.log.append('first')
+        self.assertEqual(self.log.get_lines(0, 10), 'first')
+        self.log.append(' line\nsecond\n')
+        self.assertEqual(self.log.line_count, 2)
+        self.assertEqual(self.log.get_lines(0, 10), 'first line\nsecond')
+        self.log.append('third')
+        self.assertEqual(self.log.line_count, 3)
+        self.assertEqual(self.log.get_lines(1, 10), 'second\nthird')
+        self.assertEqual(self.log.get_lines(2, 1), 'third')
+        self.assertEqual(self.log.get_lines(3, 1), '')
+    
+    def test_huge_line_shows_its_end(self):
+        self.log.append('x' * 100 + 'end\n')
+        self.assertEqual(self.log.get_lines(0, 1, max_line_bytes=6), 'xxend')
+
+
+if __name__ == '__main__':
+    unittest.main()